@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Inventory audit query benchmark.
+
+Answers "all <reason> adjustments at <location> in one week" over an event
+log spanning 90 days, by scanning the whole log and through the
+AdjustmentAuditIndex, and times building the index from the log and
+reloading it from its sidecar file.
+
+Usage:
+    python3 scripts/benchmarks/audit_queries.py [--events 1000000] [--adjust-share 0.05]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.audit import AdjustmentAuditIndex, AdjustmentAuditQuery  # noqa: E402
+from inventory.events import StockAdjusted, StockReceived, StockReserved  # noqa: E402
+from inventory.eventstore import EventStore  # noqa: E402
+
+DAY = 86400.0
+REASONS = ["shrink", "damage", "count", "expired", "found"]
+LOCATIONS = [f"store-{i:02d}" for i in range(30)]
+
+
+def _events(count: int, adjust_share: float, start: float) -> Iterator[object]:
+    rng = random.Random(17)
+    step = 90 * DAY / count
+    for i in range(count):
+        now = start + i * step
+        sku = f"sku-{rng.randrange(20_000):05d}"
+        location = rng.choice(LOCATIONS)
+        roll = rng.random()
+        if roll < adjust_share:
+            yield StockAdjusted(f"adj-{i:09d}", -1, rng.choice(REASONS), sku, location, now)
+        elif roll < 0.5:
+            yield StockReceived(sku, 10, location, occurred_at=now)
+        else:
+            yield StockReserved(sku, 1, f"res-{i:09d}", location, occurred_at=now)
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--adjust-share", type=float, default=0.05)
+    args = parser.parse_args(argv)
+    start = 1_700_000_000.0
+    week = AdjustmentAuditQuery("shrink", "store-07", start + 40 * DAY, start + 47 * DAY)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventStore(Path(tmp) / "log")
+        batch: List[object] = []
+        for event in _events(args.events, args.adjust_share, start):
+            batch.append(event)
+            if len(batch) == 10_000:
+                store.append(batch)
+                batch = []
+        store.append(batch)
+
+        def scan() -> List[object]:
+            return [
+                event
+                for event in store.replay()
+                if type(event) is StockAdjusted
+                and event.reason == week.reason
+                and event.location_id == week.location_id
+                and week.start <= event.occurred_at < week.end
+            ]
+
+        expected, scanned = _timed(scan)
+        sidecar = Path(tmp) / "audit.idx"
+        index, built = _timed(lambda: AdjustmentAuditIndex(store, sidecar))
+        index.save()
+        _, loaded = _timed(lambda: AdjustmentAuditIndex(store, sidecar))
+        matches, queried = _timed(lambda: index.query(week))
+        assert matches == expected
+        store.close()
+
+    print(f"{args.events:,} events over 90 days, {args.adjust_share:.0%} adjustments; {len(expected)} matches")
+    print(f"{'operation':<32}{'ms':>10}")
+    print(f"{'full log scan per query':<32}{scanned * 1e3:>10.1f}")
+    print(f"{'index build from log':<32}{built * 1e3:>10.1f}")
+    print(f"{'index load from sidecar':<32}{loaded * 1e3:>10.1f}")
+    print(f"{'indexed query':<32}{queried * 1e3:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Inventory availability query benchmark.
+
+Times available-to-promise lookups by product x location, by product and
+by location against the AvailabilityProjection, directly and through the
+InventoryQueryHandler, next to the aggregation over ledger stock levels
+the projection replaces.
+
+Usage:
+    python3 scripts/benchmarks/availability_queries.py [--products 20000] [--locations 20]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.queries import (  # noqa: E402
+    AvailabilityProjection,
+    AvailabilityQuery,
+    InventoryQueryHandler,
+    ProductAvailabilityQuery,
+)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    projection = AvailabilityProjection()
+    handler = InventoryCommandHandler(listeners=[projection])
+    locations = [f"store-{i:02d}" for i in range(args.locations)]
+    handler.handle_batch(
+        AddStockCommand(f"sku-{p:06d}", 10, location)
+        for p in range(args.products)
+        for location in locations
+    )
+    queries = InventoryQueryHandler(projection)
+    ledger = handler.ledger
+    product, location = "sku-000042", locations[-1]
+    by_key = AvailabilityQuery(product, location)
+    by_product = ProductAvailabilityQuery(product)
+
+    cases = [
+        ("projection.available", lambda: projection.available(product, location)),
+        ("projection.available_for_product", lambda: projection.available_for_product(product)),
+        ("query handler, product x location", lambda: queries.handle(by_key)),
+        ("query handler, product", lambda: queries.handle(by_product)),
+        ("ledger aggregation, product", lambda: sum(ledger.available((product, loc)) for loc in locations)),
+    ]
+    print(f"{args.products:,} products x {args.locations} locations")
+    print(f"{'lookup':<36}{'ns/query':>10}")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        print(f"{name:<36}{best * 1e9:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
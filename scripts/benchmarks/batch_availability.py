@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Inventory batch availability benchmark.
+
+Checks whether every line of a cart can be promised, once with one
+AvailabilityQuery per line through the InventoryQueryHandler and once with
+a single BatchAvailabilityQuery, for several cart sizes.
+
+Usage:
+    python3 scripts/benchmarks/batch_availability.py [--lines 10 40 80] [--carts 500]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.queries import (  # noqa: E402
+    AvailabilityProjection,
+    AvailabilityQuery,
+    BatchAvailabilityQuery,
+    InventoryQueryHandler,
+)
+
+Cart = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[int, ...]]
+
+
+def per_line(queries: InventoryQueryHandler, carts: List[Cart]) -> float:
+    started = time.perf_counter()
+    for product_ids, location_ids, quantities in carts:
+        ok = True
+        for product_id, location_id, quantity in zip(product_ids, location_ids, quantities):
+            if queries.handle(AvailabilityQuery(product_id, location_id)) < quantity:
+                ok = False
+    return time.perf_counter() - started
+
+
+def batch(queries: InventoryQueryHandler, carts: List[Cart]) -> float:
+    started = time.perf_counter()
+    for cart in carts:
+        queries.handle(BatchAvailabilityQuery(*cart)).all_promisable
+    return time.perf_counter() - started
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 40, 80])
+    parser.add_argument("--carts", type=int, default=500)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--locations", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    projection = AvailabilityProjection()
+    handler = InventoryCommandHandler(listeners=[projection])
+    locations = [f"store-{i:02d}" for i in range(args.locations)]
+    handler.handle_batch(
+        AddStockCommand(f"sku-{p:06d}", 10, location)
+        for p in range(args.products)
+        for location in locations
+    )
+    queries = InventoryQueryHandler(projection)
+    rng = random.Random(11)
+
+    print(f"{args.carts} carts per run, {args.products:,} products x {args.locations} locations")
+    print(f"{'lines/cart':>10}{'per line (us/cart)':>20}{'batch (us/cart)':>16}")
+    for lines in args.lines:
+        carts = []
+        for _ in range(args.carts):
+            location = rng.choice(locations)
+            carts.append((
+                tuple(f"sku-{rng.randrange(args.products):06d}" for _ in range(lines)),
+                (location,) * lines,
+                tuple(rng.randrange(1, 4) for _ in range(lines)),
+            ))
+        naive = min(per_line(queries, carts) for _ in range(5))
+        batched = min(batch(queries, carts) for _ in range(5))
+        print(f"{lines:>10}{naive / args.carts * 1e6:>20.1f}{batched / args.carts * 1e6:>16.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Inventory batch command benchmark.
+
+Feeds a truckload of AddStockCommands followed by a cycle count of
+AdjustStockCommands through an InventoryCommandHandler whose events are
+persisted by an EventStore listener, once command by command and once in
+handle_batch() batches.
+
+Usage:
+    python3 scripts/benchmarks/batch_commands.py [--commands 100000] [--batch 1000] [--fsync]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand, AdjustStockCommand  # noqa: E402
+from inventory.eventstore import EventStore  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+
+
+def _commands(count: int) -> List[object]:
+    half = count // 2
+    received = [AddStockCommand(f"sku-{i:06d}", 50, "dc-01") for i in range(half)]
+    counted = [
+        AdjustStockCommand((f"sku-{i:06d}", "dc-01"), -1 if i % 3 else 2, "cycle-count")
+        for i in range(count - half)
+    ]
+    return received + counted
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--fsync", action="store_true", help="fsync the event store on every append")
+    args = parser.parse_args(argv)
+
+    commands = _commands(args.commands)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("single", "batch"):
+            with EventStore(Path(tmp) / name, fsync=args.fsync) as store:
+                handler = InventoryCommandHandler(listeners=[store.append])
+                started = time.perf_counter()
+                if name == "single":
+                    for command in commands:
+                        handler.handle(command)
+                else:
+                    for start in range(0, len(commands), args.batch):
+                        handler.handle_batch(commands[start:start + args.batch])
+                elapsed = time.perf_counter() - started
+            results.append((name, elapsed))
+
+    print(f"{len(commands):,} commands, batch size {args.batch}, fsync={args.fsync}")
+    print(f"{'mode':<10}{'total (s)':>12}{'commands/s':>14}")
+    for name, elapsed in results:
+        print(f"{name:<10}{elapsed:>12.2f}{len(commands) / elapsed:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Inventory cold-start benchmark.
+
+For growing event log sizes, times rebuilding the StockLedger by replaying
+the whole log versus loading the latest snapshot and replaying only the
+events appended after it.
+
+Usage:
+    python3 scripts/benchmarks/cold_start.py [--sizes 100000 300000 1000000] [--tail 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from eventstore_replay import synthetic_events  # noqa: E402
+from inventory.eventstore import EventStore  # noqa: E402
+from inventory.ledger import StockLedger  # noqa: E402
+from inventory.snapshots import SnapshotStore, recover_ledger  # noqa: E402
+
+
+def _timed(fn: Callable[[], object]) -> Tuple[object, float]:
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 300_000, 1_000_000])
+    parser.add_argument("--tail", type=int, default=10_000, help="events appended after the snapshot")
+    args = parser.parse_args(argv)
+
+    print(f"{'log events':>12}{'full replay (s)':>18}{'snapshot+tail (s)':>20}{'speedup':>10}")
+    for size in args.sizes:
+        events = list(synthetic_events(size))
+        cut = max(len(events) - args.tail, 0)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EventStore(Path(tmp) / "log")
+            snapshots = SnapshotStore(Path(tmp) / "snapshots")
+            ledger = StockLedger()
+            for start in range(0, cut, 1000):
+                batch = events[start:min(start + 1000, cut)]
+                store.append(batch)
+                for event in batch:
+                    ledger.apply(event)
+            snapshots.save(ledger, store.next_offset)
+            store.append(events[cut:])
+            store.close()
+
+            # Cold start = opening the log (tail segment scan) plus recovery.
+            def cold_start(snapshot_store):
+                with EventStore(Path(tmp) / "log") as reopened:
+                    return recover_ledger(reopened, snapshot_store)
+
+            _, full = _timed(lambda: cold_start(None))
+            _, incremental = _timed(lambda: cold_start(snapshots))
+        print(f"{len(events):>12,}{full:>18.2f}{incremental:>20.2f}{full / incremental:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Inventory columnar snapshot benchmark.
+
+Builds a table of every stock position and totals available stock per
+location, once from the ledger's StockLevel objects in Python and once from
+a ColumnarStockProjection snapshot with NumPy. Also reports the per-event
+cost of keeping the columnar projection up to date.
+
+Usage:
+    python3 scripts/benchmarks/columnar_snapshot.py [--products 25000] [--locations 20]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory import columnar  # noqa: E402
+from inventory.columnar import ColumnarStockProjection  # noqa: E402
+from inventory.events import StockReceived, StockReserved  # noqa: E402
+from inventory.ledger import StockLedger  # noqa: E402
+
+
+def python_table(ledger: StockLedger) -> Dict[str, int]:
+    rows = [
+        {
+            "product_id": product_id,
+            "location_id": location_id,
+            "on_hand": level.on_hand,
+            "reserved": level.reserved,
+            "available": level.available,
+        }
+        for (product_id, location_id), level in ledger.levels()
+    ]
+    totals: Dict[str, int] = {}
+    for row in rows:
+        totals[row["location_id"]] = totals.get(row["location_id"], 0) + row["available"]
+    return totals
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=25_000)
+    parser.add_argument("--locations", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    locations = [f"store-{i:02d}" for i in range(args.locations)]
+    events = [
+        StockReceived(f"sku-{p:06d}", 100, location, occurred_at=0.0)
+        for p in range(args.products)
+        for location in locations
+    ]
+    events += [
+        StockReserved(event.product_id, 3, f"res-{i:07d}", event.location_id, occurred_at=0.0)
+        for i, event in enumerate(events)
+    ]
+    ledger = StockLedger()
+    for event in events:
+        ledger.apply(event)
+    projection = ColumnarStockProjection()
+    started = time.perf_counter()
+    projection(events)
+    per_event = (time.perf_counter() - started) / len(events)
+
+    print(f"{len(projection):,} stock positions ({args.products:,} products x {args.locations} locations)")
+    print(f"columnar projection update: {per_event * 1e6:.2f} us/event")
+    started = time.perf_counter()
+    expected = python_table(ledger)
+    print(f"{'python objects':<28}{time.perf_counter() - started:>10.3f} s")
+
+    if columnar.np is None:
+        print("numpy is not installed; skipping the columnar snapshot")
+        return 0
+    started = time.perf_counter()
+    snapshot = projection.snapshot()
+    copied = time.perf_counter() - started
+    totals = snapshot.totals_by_location()
+    elapsed = time.perf_counter() - started
+    assert dict(zip(snapshot.location_ids, totals.tolist())) == expected
+    print(f"{'columnar snapshot':<28}{copied:>10.3f} s")
+    print(f"{'  + totals by location':<28}{elapsed:>10.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Inventory event bus throughput benchmark.
+
+Publishes StockReserved and ReservationReleased events through the asyncio
+EventBus in batches and reports events per second until every subscriber
+has handled every event, for several subscriber counts. Half of the
+subscribers take StockReserved only; the rest take both types.
+
+Usage:
+    python3 scripts/benchmarks/event_bus.py [--subscribers 1 10 100] [--events 200000] [--batch 100]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.bus import EventBus  # noqa: E402
+from inventory.events import ReservationReleased, StockReserved  # noqa: E402
+
+
+def _batches(count: int, size: int) -> List[List[object]]:
+    events: List[object] = []
+    for i in range(count):
+        if i % 4 == 3:
+            events.append(ReservationReleased(f"res-{i - 1:07d}", "sku-00001", "store-01", 1, 0.0))
+        else:
+            events.append(StockReserved("sku-00001", 1, f"res-{i:07d}", "store-01", occurred_at=0.0))
+    return [events[i:i + size] for i in range(0, len(events), size)]
+
+
+async def _run(subscribers: int, batches: List[List[object]], maxsize: int) -> float:
+    bus = EventBus()
+    seen = [0]
+
+    def count(event: object) -> None:
+        seen[0] += 1
+
+    for i in range(subscribers):
+        if i % 2:
+            bus.subscribe(count, StockReserved, ReservationReleased, maxsize=maxsize, block=True)
+        else:
+            bus.subscribe(count, StockReserved, maxsize=maxsize, block=True)
+    started = time.perf_counter()
+    for batch in batches:
+        await bus.publish(batch)
+    await bus.drain()
+    elapsed = time.perf_counter() - started
+    assert not any(subscription.dropped for subscription in bus.subscriptions)
+    await bus.close()
+    return elapsed
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=100, help="events per publish call")
+    parser.add_argument("--maxsize", type=int, default=10_000, help="per-subscriber queue bound")
+    args = parser.parse_args(argv)
+    batches = _batches(args.events, args.batch)
+
+    print(f"{args.events:,} events in batches of {args.batch}")
+    print(f"{'subscribers':>12}{'seconds':>10}{'events/s':>14}{'deliveries/s':>16}")
+    for subscribers in args.subscribers:
+        elapsed = asyncio.run(_run(subscribers, batches, args.maxsize))
+        # Releases (a quarter of the events) reach only half of the subscribers.
+        deliveries = args.events * subscribers - (args.events // 4) * (subscribers // 2)
+        print(
+            f"{subscribers:>12}{elapsed:>10.2f}{args.events / elapsed:>14,.0f}"
+            f"{deliveries / elapsed:>16,.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
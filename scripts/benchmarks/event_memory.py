@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Inventory event memory benchmark.
+
+Measures the bytes each in-memory StockReserved/StockAdjusted event costs,
+comparing the slotted value types in src/inventory/events.py with the
+plain __dict__-backed classes they replaced.
+
+Usage:
+    python3 scripts/benchmarks/event_memory.py [--count 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.events import StockAdjusted, StockReserved  # noqa: E402
+
+
+class DictStockReserved:
+    """Previous StockReserved shape: a plain class with a per-instance __dict__."""
+
+    def __init__(self, product_id, quantity, reservation_id, location_id, occurred_at):
+        self.product_id = product_id
+        self.quantity = quantity
+        self.reservation_id = reservation_id
+        self.location_id = location_id
+        self.occurred_at = occurred_at
+
+
+class DictStockAdjusted:
+    """Previous StockAdjusted shape: a plain class with a per-instance __dict__."""
+
+    def __init__(self, adjustment_id, quantity_change, reason, product_id, location_id, occurred_at):
+        self.adjustment_id = adjustment_id
+        self.quantity_change = quantity_change
+        self.reason = reason
+        self.product_id = product_id
+        self.location_id = location_id
+        self.occurred_at = occurred_at
+
+
+def _bytes_per_event(factory: Callable[[int], object], count: int) -> float:
+    # Identifier strings and timestamps are shared across both variants and
+    # created up front, so only per-instance overhead is measured.
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    events: List[object] = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the events is not part of the per-event cost.
+    list_bytes = sys.getsizeof(events)
+    del events
+    return (after - before - list_bytes) / count
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    count = args.count
+    product_ids = [f"sku-{i % 5000:05d}" for i in range(count)]
+    reservation_ids = [f"res-{i:08d}" for i in range(count)]
+    adjustment_ids = [f"adj-{i:08d}" for i in range(count)]
+    now = time.time()
+
+    cases = [
+        (
+            "StockReserved",
+            lambda i: DictStockReserved(product_ids[i], 2, reservation_ids[i], "store-01", now),
+            lambda i: StockReserved(product_ids[i], 2, reservation_ids[i], "store-01", occurred_at=now),
+        ),
+        (
+            "StockAdjusted",
+            lambda i: DictStockAdjusted(adjustment_ids[i], -1, "shrink", product_ids[i], "store-01", now),
+            lambda i: StockAdjusted(adjustment_ids[i], -1, "shrink", product_ids[i], "store-01", now),
+        ),
+    ]
+
+    print(f"{'event':<16}{'before (B/event)':>18}{'after (B/event)':>18}{'saved':>10}")
+    for name, before_factory, after_factory in cases:
+        before = _bytes_per_event(before_factory, count)
+        after = _bytes_per_event(after_factory, count)
+        saved = 1 - after / before
+        print(f"{name:<16}{before:>18.1f}{after:>18.1f}{saved:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Inventory event log replay benchmark.
+
+Writes the same synthetic event stream to a JSON-lines file and to the
+segmented binary EventStore, then times a full replay of each into a
+StockLedger.
+
+Usage:
+    python3 scripts/benchmarks/eventstore_replay.py [--events 500000]
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.events import (  # noqa: E402
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+from inventory.eventstore import EventStore  # noqa: E402
+from inventory.ledger import StockLedger  # noqa: E402
+
+EVENT_TYPES = {
+    cls.__name__: cls
+    for cls in (StockReceived, StockReserved, ReservationReleased, StockDispatched, StockAdjusted)
+}
+
+
+def synthetic_events(count: int, skus: int = 5000, seed: int = 7) -> Iterator[object]:
+    """Yield a replayable event stream: receive, then reserve and release/dispatch."""
+    rng = random.Random(seed)
+    now = time.time()
+    for sku in range(skus):
+        yield StockReceived(f"sku-{sku:05d}", 1_000_000, "store-01", occurred_at=now)
+    emitted = skus
+    reservation = 0
+    while emitted < count:
+        sku = f"sku-{rng.randrange(skus):05d}"
+        rid = f"res-{reservation:09d}"
+        reservation += 1
+        yield StockReserved(sku, 2, rid, "store-01", occurred_at=now)
+        if rng.random() < 0.6:
+            yield StockDispatched(f"dsp-{reservation:09d}", rid, sku, "store-01", 2, "customer", now)
+        else:
+            yield ReservationReleased(rid, sku, "store-01", 2, now)
+        emitted += 2
+        if rng.random() < 0.05:
+            yield StockAdjusted(f"adj-{reservation:09d}", -1, "shrink", sku, "store-01", now)
+            emitted += 1
+
+
+def replay_json(path: Path) -> StockLedger:
+    ledger = StockLedger()
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            record = json.loads(line)
+            cls = EVENT_TYPES[record.pop("type")]
+            ledger.apply(cls(**record))
+    return ledger
+
+
+def replay_store(directory: Path) -> StockLedger:
+    ledger = StockLedger()
+    with EventStore(directory) as store:
+        for event in store.replay():
+            ledger.apply(event)
+    return ledger
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=500_000)
+    args = parser.parse_args(argv)
+
+    events = list(synthetic_events(args.events))
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "events.jsonl"
+        with open(json_path, "w", encoding="utf-8") as handle:
+            for event in events:
+                record = dataclasses.asdict(event)
+                record["type"] = type(event).__name__
+                handle.write(json.dumps(record) + "\n")
+
+        store_dir = Path(tmp) / "store"
+        with EventStore(store_dir) as store:
+            for start in range(0, len(events), 1000):
+                store.append(events[start:start + 1000])
+
+        results = []
+        for name, run, target in (
+            ("json-lines", replay_json, json_path),
+            ("event store", replay_store, store_dir),
+        ):
+            started = time.perf_counter()
+            run(target)
+            elapsed = time.perf_counter() - started
+            size = sum(p.stat().st_size for p in ([target] if target.is_file() else target.iterdir()))
+            results.append((name, elapsed, size))
+
+    print(f"{len(events):,} events")
+    print(f"{'format':<14}{'size (MB)':>12}{'replay (s)':>12}{'events/s':>14}")
+    for name, elapsed, size in results:
+        print(f"{name:<14}{size / 1e6:>12.1f}{elapsed:>12.2f}{len(events) / elapsed:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Inventory FEFO allocation benchmark.
+
+Allocates reservations first-expired-first-out from one SKU holding many
+batches, using the heap-ordered BatchIndex and, for comparison, by sorting
+the batch list on every reservation.
+
+Usage:
+    python3 scripts/benchmarks/fefo_allocation.py [--batches 100 1000 10000] [--reservations 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.batches import BatchIndex  # noqa: E402
+
+
+def _batches(count: int) -> List[Tuple[str, float, int]]:
+    rng = random.Random(5)
+    return [(f"lot-{i:06d}", rng.uniform(0, 30 * 86400), rng.randrange(20, 200)) for i in range(count)]
+
+
+def sort_per_reservation(batches: List[Tuple[str, float, int]], quantities: List[int]) -> float:
+    stock = [[expires, batch, quantity] for batch, expires, quantity in batches]
+    started = time.perf_counter()
+    for quantity in quantities:
+        stock.sort()
+        i = 0
+        while quantity > 0:
+            take = min(stock[i][2], quantity)
+            stock[i][2] -= take
+            quantity -= take
+            i += 1
+        stock = [entry for entry in stock if entry[2]]
+    return time.perf_counter() - started
+
+
+def batch_index(batches: List[Tuple[str, float, int]], quantities: List[int]) -> float:
+    index = BatchIndex()
+    for batch, expires, quantity in batches:
+        index.add(batch, quantity, expires)
+    started = time.perf_counter()
+    for quantity in quantities:
+        index.allocate(quantity)
+    return time.perf_counter() - started
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--reservations", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(9)
+    print(f"{args.reservations:,} reservations of 1-12 units")
+    print(f"{'batches':>10}{'sort (us/res)':>16}{'index (us/res)':>17}")
+    for count in args.batches:
+        batches = _batches(count)
+        total = sum(quantity for _, _, quantity in batches)
+        quantities = []
+        while len(quantities) < args.reservations and total > 12:
+            quantities.append(rng.randrange(1, 13))
+            total -= quantities[-1]
+        naive = sort_per_reservation(batches, quantities)
+        indexed = batch_index(batches, quantities)
+        print(f"{count:>10,}{naive / len(quantities) * 1e6:>16.2f}{indexed / len(quantities) * 1e6:>17.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
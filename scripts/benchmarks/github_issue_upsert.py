@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+GitHub issue upsert concurrency benchmark.
+
+Upserts the issues in scripts/planning/issues.json against a local stand-in
+for the GitHub API that answers each call after a fixed delay, standing in
+for the round trip to api.github.com. Half of the issues already exist with
+an outdated body and are updated, the rest are created. Runs the upsert
+sequentially with the fixed 0.2 s sleep bootstrap_github.py used to make
+after each issue, then through upsert_issues() with several worker counts.
+Requires the requests library.
+
+Usage:
+    python3 scripts/benchmarks/github_issue_upsert.py [--latency-ms 300] [--workers 1 4 8 16]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "planning"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bootstrap_github import (  # noqa: E402
+    DEFAULT_POOL_SIZE,
+    ISSUES_PATH,
+    GitHubRESTClient,
+    create_session,
+    upsert_issue,
+    upsert_issues,
+)
+from github_session_pooling import StubGitHub  # noqa: E402
+
+
+class SlowGitHub(StubGitHub):
+    """Creates and updates issues, answering each call after `latency` seconds."""
+
+    latency = 0.3
+    numbers = itertools.count(1000)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        number = next(self.numbers)
+        self._reply(json.dumps({"number": number, "node_id": f"I_{number}"}).encode())
+
+    def do_PATCH(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        self._reply(b"{}")
+
+
+def existing_issues(issues: List[Dict]) -> Dict[str, Dict]:
+    """Every other issue, as if created earlier and since edited in issues.json."""
+    return {
+        issue["title"]: {"number": n, "node_id": f"I_{n}", "body": "outdated", "labels": [], "milestone": None}
+        for n, issue in enumerate(issues[::2], start=1)
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args(argv)
+
+    SlowGitHub.latency = args.latency_ms / 1e3
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    issues = json.loads(ISSUES_PATH.read_text(encoding="utf-8"))
+    existing = existing_issues(issues)
+
+    print(f"{len(issues)} issues ({len(existing)} to update), {args.latency_ms:.0f} ms per call")
+    print(f"{'mode':<28}{'seconds':>9}{'errors':>8}")
+    client = GitHubRESTClient("stub", "owner", "repo", create_session(), base_url=base_url)
+    started = time.perf_counter()
+    errors = 0
+    for issue in issues:
+        try:
+            upsert_issue(client, issue, existing.get(issue["title"]), None)
+        except Exception:
+            errors += 1
+        time.sleep(0.2)
+    print(f"{'sequential, fixed sleeps':<28}{time.perf_counter() - started:>9.2f}{errors:>8}")
+
+    for workers in args.workers:
+        client = GitHubRESTClient(
+            "stub", "owner", "repo", create_session(max(DEFAULT_POOL_SIZE, workers)), base_url=base_url
+        )
+        started = time.perf_counter()
+        results = list(upsert_issues(client, issues, existing, {}, workers))
+        elapsed = time.perf_counter() - started
+        errors = sum(error is not None for _, _, _, error in results)
+        assert [issue for issue, _, _, _ in results] == issues
+        print(f"{f'upsert_issues, {workers} workers':<28}{elapsed:>9.2f}{errors:>8}")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
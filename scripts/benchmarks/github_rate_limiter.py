@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+GitHub client rate limiter benchmark.
+
+Issues REST GETs against a local stand-in for the GitHub API that enforces a
+primary quota through X-RateLimit-* headers and a secondary limit that
+answers bursts with 403 and Retry-After. Each scenario runs once with fixed
+sleeps between plain session calls, as bootstrap_github.py used to pace
+itself, and once through a GitHubRESTClient with a RateLimiter, and reports
+wall-clock time and how many calls ended rate limited. Requires the
+requests library.
+
+Usage:
+    python3 scripts/benchmarks/github_rate_limiter.py [--calls 100]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from collections import deque
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "planning"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bootstrap_github import GitHubRESTClient, RateLimiter, create_session  # noqa: E402
+from github_session_pooling import ISSUES, StubGitHub  # noqa: E402
+
+
+class LimitedGitHub(StubGitHub):
+    """
+    Stub with a quota of `quota` calls per `window` seconds, and a secondary
+    limit of `burst` calls in any one second.
+    """
+
+    quota = 5000
+    window = 3600.0
+    burst = 1000
+    lock = threading.Lock()
+    used = 0
+    reset_at = 0.0
+    recent: deque = deque()
+
+    @classmethod
+    def configure(cls, quota: int, window: float, burst: int) -> None:
+        cls.quota, cls.window, cls.burst = quota, window, burst
+        cls.used = 0
+        cls.reset_at = time.time() + window
+        cls.recent = deque()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            now = time.time()
+            if now >= cls.reset_at:
+                cls.used, cls.reset_at = 0, now + cls.window
+            while cls.recent and cls.recent[0] <= now - 1.0:
+                cls.recent.popleft()
+            limited = None
+            if cls.used >= cls.quota:
+                limited = (403, {}, b'{"message": "API rate limit exceeded"}')
+            elif len(cls.recent) >= cls.burst:
+                limited = (403, {"Retry-After": "1"}, b'{"message": "You have exceeded a secondary rate limit"}')
+            else:
+                cls.used += 1
+                cls.recent.append(now)
+            headers = {
+                "X-RateLimit-Limit": str(cls.quota),
+                "X-RateLimit-Remaining": str(cls.quota - cls.used),
+                "X-RateLimit-Reset": str(int(cls.reset_at) + 1),
+                "X-RateLimit-Resource": "core",
+            }
+        if limited is None:
+            self._reply(ISSUES, headers)
+        else:
+            status, extra, body = limited
+            self._reply(body, {**headers, **extra}, status)
+
+    def _reply(self, body: bytes, headers=None, status: int = 200):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+SCENARIOS = [
+    # name, quota, window (s), burst (calls/s)
+    ("plenty of quota", 5000, 3600.0, 1000),
+    ("secondary limit 4/s", 5000, 3600.0, 4),
+    ("quota 40 per 5 s", 40, 5.0, 1000),
+]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LimitedGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    path = "/repos/owner/repo/issues"
+
+    print(f"{args.calls} REST GETs per run against a local rate-limited stub")
+    print(f"{'scenario':<22}{'pacing':<16}{'seconds':>9}{'limited':>9}")
+    for name, quota, window, burst in SCENARIOS:
+        LimitedGitHub.configure(quota, window, burst)
+        session = create_session()
+        limited = 0
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            response = session.get(f"{base_url}{path}", timeout=30)
+            limited += response.status_code == 403
+            time.sleep(0.1)
+        fixed = time.perf_counter() - started
+        print(f"{name:<22}{'fixed sleeps':<16}{fixed:>9.2f}{limited:>9}")
+
+        LimitedGitHub.configure(quota, window, burst)
+        # The default reserve is sized for GitHub's quota of 5,000, not the stub's
+        limiter = RateLimiter(reserve=0)
+        client = GitHubRESTClient("stub", "owner", "repo", create_session(), base_url=base_url, limiter=limiter)
+        limited = 0
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            try:
+                client.get(path)
+            except Exception:
+                limited += 1
+        adaptive = time.perf_counter() - started
+        print(f"{name:<22}{'RateLimiter':<16}{adaptive:>9.2f}{limited:>9}")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+GitHub client connection pooling benchmark.
+
+Makes the same REST and GraphQL calls against a local stand-in for the GitHub
+API, once with module-level requests calls as the planning clients used to
+make them, opening a new connection per call, and once through the clients
+in scripts/planning/bootstrap_github.py sharing one pooled keep-alive
+session. Requires the requests library.
+
+Usage:
+    python3 scripts/benchmarks/github_session_pooling.py [--calls 500]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, List
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "planning"))
+
+from bootstrap_github import GitHubGraphQLClient, GitHubRESTClient, create_session  # noqa: E402
+
+# A page of issues of roughly the size GitHub returns for the REST calls.
+ISSUES = json.dumps([
+    {"number": n, "node_id": f"I_{n:08d}", "title": f"Issue {n}", "body": "x" * 400, "labels": []}
+    for n in range(20)
+]).encode()
+GRAPHQL = json.dumps({"data": {"repository": {"id": "R_0001"}}}).encode()
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """Answers any GET with a page of issues and any POST with a GraphQL result."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, a kept-alive
+    # connection waits on the client's delayed ACK before each response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply(ISSUES)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(GRAPHQL)
+
+    def _reply(self, body: bytes):
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def latencies_ms(call: Callable[[], object], calls: int) -> List[float]:
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1e3)
+    return samples
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    headers = {"Authorization": "Bearer stub", "Content-Type": "application/json"}
+    session = create_session()
+    rest = GitHubRESTClient("stub", "owner", "repo", session, base_url=base_url)
+    graphql = GitHubGraphQLClient("stub", session, base_url=base_url)
+    variables = {"owner": "owner", "name": "repo"}
+
+    runs = [
+        ("REST GET", "per call", lambda: requests.get(f"{base_url}/repos/owner/repo/issues", headers=headers).json()),
+        ("REST GET", "pooled", lambda: rest.get("/repos/owner/repo/issues")),
+        ("GraphQL", "per call", lambda: requests.post(
+            f"{base_url}/graphql", headers=headers, json={"query": "{}", "variables": variables}
+        ).json()),
+        ("GraphQL", "pooled", lambda: graphql.query("{}", variables)),
+    ]
+    print(f"{args.calls} calls each against a local stub server")
+    print(f"{'call':<10}{'connection':<12}{'mean (ms)':>11}{'p50 (ms)':>10}{'p99 (ms)':>10}{'total (s)':>11}")
+    for call, mode, fn in runs:
+        fn()  # warm up
+        samples = latencies_ms(fn, args.calls)
+        ordered = sorted(samples)
+        print(
+            f"{call:<10}{mode:<12}{statistics.fmean(samples):>11.3f}{ordered[len(ordered) // 2]:>10.3f}"
+            f"{ordered[int(len(ordered) * 0.99)]:>10.3f}{sum(samples) / 1e3:>11.2f}"
+        )
+    session.close()
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Inventory idempotency benchmark.
+
+Times ReserveStockCommands through an InventoryCommandHandler with an
+IdempotencyCache: commands without a key, first attempts with a key, and
+retries of keys already applied. Also times rebuilding the cache from the
+event log, as after a restart.
+
+Usage:
+    python3 scripts/benchmarks/idempotency.py [--commands 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand, ReserveStockCommand  # noqa: E402
+from inventory.eventstore import EventStore  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.idempotency import IdempotencyCache  # noqa: E402
+
+
+def _time(handler: InventoryCommandHandler, commands: List[object]) -> float:
+    started = time.perf_counter()
+    for command in commands:
+        handler.handle(command)
+    return time.perf_counter() - started
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    count = args.commands
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventStore(tmp)
+        cache = IdempotencyCache(maxsize=2 * count)
+        handler = InventoryCommandHandler(listeners=[store.append], idempotency=cache)
+        handler.handle(AddStockCommand("sku-00001", 3 * count, "store-01"))
+        unkeyed = [ReserveStockCommand("sku-00001", 1, f"plain-{i:07d}", "store-01") for i in range(count)]
+        keyed = [
+            ReserveStockCommand("sku-00001", 1, f"res-{i:07d}", "store-01", idempotency_key=f"key-{i:07d}")
+            for i in range(count)
+        ]
+
+        print(f"{count:,} reservations per case")
+        print(f"{'case':<24}{'us/command':>12}")
+        for name, commands in [("no key", unkeyed), ("new key", keyed), ("retried key", keyed)]:
+            print(f"{name:<24}{_time(handler, commands) / count * 1e6:>12.2f}")
+        assert handler.ledger.available(("sku-00001", "store-01")) == count
+        store.close()
+
+        store = EventStore(tmp)
+        started = time.perf_counter()
+        rebuilt = IdempotencyCache(maxsize=2 * count)
+        rebuilt.record(store.replay())
+        elapsed = time.perf_counter() - started
+        store.close()
+        print(f"rebuilt {len(rebuilt):,} keys from {2 * count + 1:,} events in {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
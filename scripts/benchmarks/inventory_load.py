@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Inventory command and query load benchmark.
+
+Drives an InventoryCommandHandler and an InventoryQueryHandler with a
+synthetic grocery workload and reports throughput and p50/p99/p999 latency
+per operation. SKUs are drawn from a Zipf distribution, so a few fast movers
+take most of the traffic, and the command mix receives, reserves, releases,
+dispatches and adjusts stock in roughly the shares a dark store sees. The
+workload is generated up front from a seed, against a model of the stock it
+creates, so every run replays the same valid commands in the same order.
+
+With --json the results, parameters, Python version and git commit are
+written to a file; --compare prints the change against such a file from an
+earlier run.
+
+Usage:
+    python3 scripts/benchmarks/inventory_load.py [--commands 200000] [--queries 200000] [--json out.json]
+    python3 scripts/benchmarks/inventory_load.py --compare baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import (  # noqa: E402
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import InventoryError  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.queries import (  # noqa: E402
+    AvailabilityProjection,
+    AvailabilityQuery,
+    BatchAvailabilityQuery,
+    InventoryQueryHandler,
+    ProductAvailabilityQuery,
+)
+
+# Share of each operation in the grocery mix; reserved stock is later
+# dispatched or released, and receiving replenishes what was dispatched.
+COMMAND_MIX = {"receive": 0.10, "reserve": 0.45, "dispatch": 0.30, "release": 0.10, "adjust": 0.05}
+QUERY_MIX = {"availability": 0.70, "product": 0.10, "cart": 0.20}
+ADJUST_REASONS = ["shrink", "damage", "expired", "count"]
+PERCENTILES = (("p50", 0.50), ("p99", 0.99), ("p999", 0.999))
+
+# (operation name, command or query)
+Operation = Tuple[str, object]
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** s."""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self._cumulative = list(itertools.accumulate(1.0 / (rank + 1) ** s for rank in range(n)))
+        self._total = self._cumulative[-1]
+        self._rng = rng
+
+    def __call__(self) -> int:
+        return bisect.bisect_left(self._cumulative, self._rng.random() * self._total)
+
+
+class GroceryWorkload:
+    """
+    Seeded generator of grocery commands and queries over Zipf-skewed SKUs.
+
+    The generator tracks the stock and open reservations its own commands
+    create and only emits commands the handler will accept: a reserve or
+    shrink that the modelled stock cannot cover is replaced by a receive,
+    as a store would replenish instead.
+    """
+
+    def __init__(self, skus: int, locations: int, skew: float, seed: int):
+        self.rng = random.Random(seed)
+        self.skus = [f"sku-{i:06d}" for i in range(skus)]
+        self.locations = [f"store-{i:02d}" for i in range(locations)]
+        self.sample = ZipfSampler(skus, skew, self.rng)
+        self._available: Dict[Tuple[str, str], int] = {}
+        self._open: List[Tuple[str, Tuple[str, str], int]] = []
+        self._reservations = itertools.count()
+
+    def initial_stock(self, quantity: int) -> List[AddStockCommand]:
+        """Commands that stock every SKU at every location before the run."""
+        commands = [
+            AddStockCommand(sku, quantity, location) for sku in self.skus for location in self.locations
+        ]
+        for command in commands:
+            self._available[(command.product_id, command.location_id)] = quantity
+        return commands
+
+    def commands(self, count: int) -> List[Operation]:
+        rng = self.rng
+        names = list(COMMAND_MIX)
+        weights = list(COMMAND_MIX.values())
+        operations: List[Operation] = []
+        for name in rng.choices(names, weights, k=count):
+            key = (self.skus[self.sample()], rng.choice(self.locations))
+            if name in ("dispatch", "release") and self._open:
+                # Orders are picked or abandoned in roughly the order placed.
+                reservation_id, reserved_key, quantity = self._open.pop(
+                    min(len(self._open) - 1, int(rng.expovariate(0.05)))
+                )
+                if name == "dispatch":
+                    operations.append((name, DispatchStockCommand(reservation_id, "customer")))
+                else:
+                    self._available[reserved_key] += quantity
+                    operations.append((name, ReleaseReservationCommand(reservation_id)))
+                continue
+            if name == "adjust":
+                change = rng.choice((-2, -1, -1, 1))
+                if self._available[key] + change >= 0:
+                    self._available[key] += change
+                    operations.append((name, AdjustStockCommand(key, change, rng.choice(ADJUST_REASONS))))
+                    continue
+            elif name in ("reserve", "dispatch", "release"):
+                quantity = rng.randint(1, 4)
+                if self._available[key] >= quantity:
+                    reservation_id = f"res-{next(self._reservations):09d}"
+                    self._available[key] -= quantity
+                    self._open.append((reservation_id, key, quantity))
+                    operations.append(("reserve", ReserveStockCommand(key[0], quantity, reservation_id, key[1])))
+                    continue
+            quantity = rng.choice((12, 24, 48))
+            self._available[key] += quantity
+            operations.append(("receive", AddStockCommand(key[0], quantity, key[1])))
+        return operations
+
+    def queries(self, count: int, cart_lines: int) -> List[Operation]:
+        rng = self.rng
+        names = list(QUERY_MIX)
+        weights = list(QUERY_MIX.values())
+        operations: List[Operation] = []
+        for name in rng.choices(names, weights, k=count):
+            if name == "availability":
+                query = AvailabilityQuery(self.skus[self.sample()], rng.choice(self.locations))
+            elif name == "product":
+                query = ProductAvailabilityQuery(self.skus[self.sample()])
+            else:
+                location = rng.choice(self.locations)
+                query = BatchAvailabilityQuery(
+                    tuple(self.skus[self.sample()] for _ in range(cart_lines)),
+                    (location,) * cart_lines,
+                    tuple(rng.randint(1, 3) for _ in range(cart_lines)),
+                )
+            operations.append((name, query))
+        return operations
+
+
+def run(handle, operations: List[Operation]) -> Dict[str, object]:
+    """Apply each operation through handle() and summarise the latencies."""
+    latencies: Dict[str, List[int]] = {name: [] for name, _ in operations}
+    rejected = 0
+    clock = time.perf_counter_ns
+    started = clock()
+    for name, operation in operations:
+        begin = clock()
+        try:
+            handle(operation)
+        except InventoryError:
+            rejected += 1
+        latencies[name].append(clock() - begin)
+    elapsed = (clock() - started) / 1e9
+    return {
+        "operations": len(operations),
+        "rejected": rejected,
+        "seconds": round(elapsed, 4),
+        "throughput": round(len(operations) / elapsed, 1),
+        "latency_us": _percentiles([ns for values in latencies.values() for ns in values]),
+        "by_operation": {
+            name: {"operations": len(values), "latency_us": _percentiles(values)}
+            for name, values in sorted(latencies.items())
+        },
+    }
+
+
+def _percentiles(latencies_ns: List[int]) -> Dict[str, float]:
+    ordered = sorted(latencies_ns)
+    last = len(ordered) - 1
+    return {label: round(ordered[round(q * last)] / 1e3, 2) for label, q in PERCENTILES}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_results(results: Dict[str, Dict[str, object]]) -> None:
+    print(f"{'path':<10}{'operation':<14}{'ops':>9}{'ops/s':>12}{'p50 us':>9}{'p99 us':>9}{'p999 us':>9}")
+    for path, summary in results.items():
+        rows = [("all", summary)] + list(summary["by_operation"].items())
+        for name, row in rows:
+            latency = row["latency_us"]
+            throughput = f"{summary['throughput']:,.0f}" if name == "all" else ""
+            print(
+                f"{path:<10}{name:<14}{row['operations']:>9,}{throughput:>12}"
+                f"{latency['p50']:>9.1f}{latency['p99']:>9.1f}{latency['p999']:>9.1f}"
+            )
+        if summary["rejected"]:
+            print(f"{path:<10}{summary['rejected']:,} operations rejected")
+
+
+def _print_comparison(
+    results: Dict[str, Dict[str, object]], parameters: Dict[str, object], baseline: Dict[str, object]
+) -> None:
+    print(f"\nchange against {baseline.get('commit') or 'baseline'} (negative latency is faster)")
+    if baseline["parameters"] != parameters:
+        print("warning: the baseline was run with different parameters")
+    print(f"{'path':<10}{'ops/s':>10}{'p50':>10}{'p99':>10}{'p999':>10}")
+    for path, summary in results.items():
+        before = baseline["results"].get(path)
+        if before is None:
+            continue
+        cells = [summary["throughput"] / before["throughput"] - 1]
+        cells += [summary["latency_us"][label] / before["latency_us"][label] - 1 for label, _ in PERCENTILES]
+        print(f"{path:<10}" + "".join(f"{cell:>+10.1%}" for cell in cells))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200_000)
+    parser.add_argument("--skus", type=int, default=5_000)
+    parser.add_argument("--locations", type=int, default=8)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of SKU popularity")
+    parser.add_argument("--cart-lines", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="results file of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    workload = GroceryWorkload(args.skus, args.locations, args.skew, args.seed)
+    projection = AvailabilityProjection()
+    handler = InventoryCommandHandler(listeners=[projection])
+    handler.handle_batch(workload.initial_stock(quantity=40))
+    commands = workload.commands(args.commands)
+    queries = workload.queries(args.queries, args.cart_lines)
+
+    results = {
+        "commands": run(handler.handle, commands),
+        "queries": run(InventoryQueryHandler(projection).handle, queries),
+    }
+    print(
+        f"{args.skus:,} SKUs (Zipf s={args.skew}) x {args.locations} locations, "
+        f"{args.cart_lines}-line carts, seed {args.seed}"
+    )
+    _print_results(results)
+
+    report = {
+        "benchmark": "inventory_load",
+        "commit": _git_commit(),
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            name: value for name, value in vars(args).items() if name not in ("json", "compare")
+        },
+        "results": results,
+    }
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nresults written to {args.json}")
+    if args.compare is not None:
+        _print_comparison(results, report["parameters"], json.loads(args.compare.read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Inventory low-stock detection benchmark.
+
+Compares one polling sweep that checks every stock level in the ledger
+against its reorder point with the per-event cost of the incremental
+LowStockDetector listener, for several catalogue sizes.
+
+Usage:
+    python3 scripts/benchmarks/low_stock.py [--keys 10000 100000 1000000] [--events 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.alerts import LowStockDetector  # noqa: E402
+from inventory.events import StockReceived, StockReserved  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.ledger import StockLedger  # noqa: E402
+
+REORDER_POINT = 20
+
+
+def _ledger(keys: int) -> StockLedger:
+    ledger = StockLedger()
+    for i in range(keys):
+        ledger.apply(StockReceived(f"sku-{i:07d}", 100, "store-01", occurred_at=0.0))
+    return ledger
+
+
+def poll(ledger: StockLedger) -> float:
+    started = time.perf_counter()
+    low = [key for key, level in ledger.levels() if level.available <= REORDER_POINT]
+    elapsed = time.perf_counter() - started
+    assert not low
+    return elapsed
+
+
+def detect(ledger: StockLedger, keys: int, count: int) -> float:
+    warnings = []
+    detector = LowStockDetector(
+        InventoryCommandHandler(ledger), warnings.extend, default_reorder_point=REORDER_POINT, hysteresis=10
+    )
+    rng = random.Random(3)
+    events = [
+        StockReserved(f"sku-{rng.randrange(keys):07d}", 1, f"res-{i:07d}", "store-01", occurred_at=0.0)
+        for i in range(count)
+    ]
+    started = time.perf_counter()
+    for event in events:
+        detector((event,))
+    return time.perf_counter() - started
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    print(f"reorder point {REORDER_POINT}, {args.events:,} single-event reservations")
+    print(f"{'keys':>12}{'poll sweep (ms)':>17}{'detector (us/event)':>21}")
+    for keys in args.keys:
+        ledger = _ledger(keys)
+        sweep = min(poll(ledger) for _ in range(3))
+        per_event = detect(ledger, keys, args.events) / args.events
+        print(f"{keys:>12,}{sweep * 1e3:>17.1f}{per_event * 1e6:>21.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Inventory metrics overhead benchmark.
+
+Times the raw cost of a histogram observation and a counter increment, then
+the cost per command of reserving and releasing stock through an
+InventoryCommandHandler created without and with a MetricsRegistry, and the
+time to render the registry in the Prometheus text format.
+
+Usage:
+    python3 scripts/benchmarks/metrics_overhead.py [--operations 1000000] [--commands 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import (  # noqa: E402
+    AddStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.metrics import Counter, Histogram, MetricsRegistry  # noqa: E402
+
+
+def per_call_ns(fn, operations: int) -> float:
+    """Nanoseconds per fn() call, net of the loop itself."""
+    started = time.perf_counter()
+    for _ in range(operations):
+        pass
+    empty = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(operations):
+        fn()
+    return (time.perf_counter() - started - empty) / operations * 1e9
+
+
+def command_us(metrics: Optional[MetricsRegistry], commands: int, skus: int) -> float:
+    handler = InventoryCommandHandler(metrics=metrics)
+    handler.handle_batch(AddStockCommand(f"sku-{i:05d}", 1_000, "store-01") for i in range(skus))
+    work = []
+    for i in range(commands // 2):
+        work.append(ReserveStockCommand(f"sku-{i % skus:05d}", 1, f"res-{i:08d}", "store-01"))
+        work.append(ReleaseReservationCommand(f"res-{i:08d}"))
+    handle = handler.handle
+    started = time.perf_counter()
+    for command in work:
+        handle(command)
+    return (time.perf_counter() - started) / len(work) * 1e6
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument("--commands", type=int, default=200_000)
+    parser.add_argument("--skus", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    histogram = Histogram()
+    counter = Counter()
+    print(f"{'operation':<34}{'cost':>14}")
+    print(f"{'Histogram.observe()':<34}{per_call_ns(lambda: histogram.observe(3e-6), args.operations):>11.0f} ns")
+    print(f"{'Counter.inc()':<34}{per_call_ns(counter.inc, args.operations):>11.0f} ns")
+
+    # Alternate the two handlers so drift on a shared machine hits both alike.
+    registry = MetricsRegistry()
+    plain = timed = float("inf")
+    for _ in range(5):
+        plain = min(plain, command_us(None, args.commands, args.skus))
+        timed = min(timed, command_us(registry, args.commands, args.skus))
+    print(f"{'command, metrics off':<34}{plain:>11.2f} us")
+    print(f"{'command, metrics on':<34}{timed:>11.2f} us")
+    print(f"{'added per command':<34}{(timed - plain) * 1e3:>11.0f} ns")
+
+    started = time.perf_counter()
+    text = registry.render_prometheus()
+    rendered = time.perf_counter() - started
+    print(f"{'render_prometheus()':<34}{rendered * 1e3:>11.2f} ms ({len(text.splitlines())} lines)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
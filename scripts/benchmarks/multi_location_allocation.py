@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Inventory multi-location allocation benchmark.
+
+Places AllocateStockCommands through a ReservationAllocator with every dark
+store as a candidate, ranked by a random distance per order line, and
+reports the cost per order line of planning alone and of planning plus
+reserving, with and without splitting.
+
+Usage:
+    python3 scripts/benchmarks/multi_location_allocation.py [--locations 12 48] [--lines 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.allocation import ReservationAllocator  # noqa: E402
+from inventory.commands import AddStockCommand, AllocateStockCommand  # noqa: E402
+from inventory.errors import InsufficientStockError  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+
+
+def _allocator(products: int, locations: List[str], rng: random.Random) -> ReservationAllocator:
+    handler = InventoryCommandHandler()
+    # Each store stocks about a third of the catalogue.
+    handler.handle_batch(
+        AddStockCommand(f"sku-{p:05d}", rng.randrange(1, 30), location)
+        for p in range(products)
+        for location in locations
+        if rng.random() < 0.35
+    )
+    return ReservationAllocator(handler)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locations", type=int, nargs="+", default=[12, 48])
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    print(f"{args.lines:,} order lines of 1-8 units over {args.products:,} products")
+    print(f"{'locations':>10}{'split':>7}{'plan (us/line)':>16}{'reserve (us/line)':>19}{'rejected':>10}")
+    for count in args.locations:
+        locations = [f"dark-{i:03d}" for i in range(count)]
+        for split in (False, True):
+            rng = random.Random(21)
+            allocator = _allocator(args.products, locations, rng)
+            commands = [
+                AllocateStockCommand(
+                    f"sku-{rng.randrange(args.products):05d}",
+                    rng.randrange(1, 9),
+                    f"res-{i:07d}",
+                    tuple((location, rng.uniform(0, 20)) for location in locations),
+                    split,
+                )
+                for i in range(args.lines)
+            ]
+            started = time.perf_counter()
+            for command in commands:
+                try:
+                    allocator.plan(command)
+                except InsufficientStockError:
+                    pass
+            planned = time.perf_counter() - started
+            rejected = 0
+            started = time.perf_counter()
+            for command in commands:
+                try:
+                    allocator.handle(command)
+                except InsufficientStockError:
+                    rejected += 1
+            reserved = time.perf_counter() - started
+            print(
+                f"{count:>10}{'yes' if split else 'no':>7}{planned / args.lines * 1e6:>16.1f}"
+                f"{reserved / args.lines * 1e6:>19.1f}{rejected:>10,}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Inventory outbox latency benchmark.
+
+Times ReserveStockCommands when every event is published synchronously
+from the command handler, against recording events in the SQLite outbox
+and publishing them from the relay thread. Publishing is simulated by a
+fixed per-call broker round trip plus a small per-event cost.
+
+Usage:
+    python3 scripts/benchmarks/outbox_latency.py [--commands 5000] [--round-trip-ms 0.5]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand, ReserveStockCommand  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.outbox import OutboxRelay, SQLiteOutbox  # noqa: E402
+
+
+def _broker(round_trip: float) -> Callable[[Sequence[object]], None]:
+    def publish(events: Sequence[object]) -> None:
+        time.sleep(round_trip + 2e-6 * len(events))
+    return publish
+
+
+def _latencies(handler: InventoryCommandHandler, count: int) -> List[float]:
+    handler.handle(AddStockCommand("sku-00001", count, "store-01"))
+    latencies = []
+    for i in range(count):
+        command = ReserveStockCommand("sku-00001", 1, f"res-{i:07d}", "store-01")
+        started = time.perf_counter()
+        handler.handle(command)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _report(name: str, latencies: List[float], total: float) -> None:
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(
+        f"{name:<16}{statistics.median(latencies) * 1e6:>10.0f}{p99 * 1e6:>10.0f}"
+        f"{len(latencies) / total:>14,.0f}"
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=5000)
+    parser.add_argument("--round-trip-ms", type=float, default=0.5)
+    parser.add_argument("--batch", type=int, default=500, help="relay batch size")
+    args = parser.parse_args(argv)
+    publish = _broker(args.round_trip_ms / 1000)
+
+    print(f"{args.commands:,} reservations, broker round trip {args.round_trip_ms} ms")
+    print(f"{'publishing':<16}{'p50 (us)':>10}{'p99 (us)':>10}{'commands/s':>14}")
+
+    started = time.perf_counter()
+    latencies = _latencies(InventoryCommandHandler(listeners=[publish]), args.commands)
+    _report("synchronous", latencies, time.perf_counter() - started)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = SQLiteOutbox(Path(tmp) / "outbox.db", max_pending=50_000)
+        relay = OutboxRelay(outbox, publish, batch_size=args.batch)
+        relay.start()
+        started = time.perf_counter()
+        latencies = _latencies(InventoryCommandHandler(outbox=outbox), args.commands)
+        relay.stop()
+        # Includes draining the outbox, so every event has been published.
+        _report("outbox + relay", latencies, time.perf_counter() - started)
+        outbox.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
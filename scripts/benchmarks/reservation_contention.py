@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Inventory reservation contention benchmark.
+
+Several threads issue ReserveStockCommands at once, either all against one
+hot SKU with less stock than requested or each against its own SKU. Runs
+the handler's optimistic, stripe-locked reservation path and, for
+comparison, the same handler behind one global lock. Every run checks that
+no stock was oversold.
+
+Usage:
+    python3 scripts/benchmarks/reservation_contention.py [--threads 1 2 4 8] [--reservations 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand, ReserveStockCommand  # noqa: E402
+from inventory.errors import InsufficientStockError  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+
+
+def run(threads: int, per_thread: int, hot: bool, global_lock: bool) -> Tuple[float, int]:
+    """Return elapsed seconds and the number of successful reservations."""
+    handler = InventoryCommandHandler(max_attempts=1000)
+    skus = ["sku-hot"] if hot else [f"sku-{t:03d}" for t in range(threads)]
+    # The hot SKU holds stock for half the attempts, so threads race for the last units.
+    stock = threads * per_thread // 2 if hot else per_thread
+    for sku in skus:
+        handler.handle(AddStockCommand(sku, stock, "store-01"))
+
+    handle: Callable[[object], object] = handler.handle
+    if global_lock:
+        lock = threading.Lock()
+
+        def handle(command: object) -> object:
+            with lock:
+                return handler.handle(command)
+
+    successes = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index: int) -> None:
+        sku = skus[0] if hot else skus[index]
+        commands = [
+            ReserveStockCommand(sku, 1, f"res-{index}-{i}", "store-01") for i in range(per_thread)
+        ]
+        barrier.wait()
+        won = 0
+        for command in commands:
+            try:
+                handle(command)
+                won += 1
+            except InsufficientStockError:
+                pass
+        successes[index] = won
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    won = sum(successes)
+    reserved = sum(handler.ledger.level((sku, "store-01")).reserved for sku in skus)
+    on_hand = sum(handler.ledger.level((sku, "store-01")).on_hand for sku in skus)
+    assert reserved == won <= on_hand, (reserved, won, on_hand)
+    return elapsed, won
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--reservations", type=int, default=20_000, help="attempts per thread")
+    parser.add_argument(
+        "--switch-interval", type=float, default=1e-5,
+        help="interpreter thread switch interval; small values force more interleaving",
+    )
+    args = parser.parse_args(argv)
+    sys.setswitchinterval(args.switch_interval)
+
+    print(f"{args.reservations:,} attempts per thread, switch interval {args.switch_interval}s")
+    print(f"{'workload':<10}{'threads':>8}{'global lock (op/s)':>20}{'optimistic (op/s)':>20}{'won':>10}")
+    for hot in (True, False):
+        for threads in args.threads:
+            attempts = threads * args.reservations
+            locked, _ = run(threads, args.reservations, hot, global_lock=True)
+            optimistic, won = run(threads, args.reservations, hot, global_lock=False)
+            print(
+                f"{'hot SKU' if hot else 'per SKU':<10}{threads:>8}"
+                f"{attempts / locked:>20,.0f}{attempts / optimistic:>20,.0f}{won:>10,}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
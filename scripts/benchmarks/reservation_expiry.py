@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Inventory reservation expiry benchmark.
+
+Opens a large number of reservations with staggered expiration times, then
+advances a simulated clock tick by tick and releases whatever has lapsed,
+once with a sweep over every open reservation per tick and once with the
+heap-based ReservationExpiryScheduler.
+
+Usage:
+    python3 scripts/benchmarks/reservation_expiry.py [--reservations 500000] [--ticks 50]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import (  # noqa: E402
+    AddStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.expiry import ReservationExpiryScheduler  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+
+SKUS = 5000
+START = 1_000_000.0
+
+
+def _populated_handler(reservations: int, horizon: int) -> InventoryCommandHandler:
+    handler = InventoryCommandHandler()
+    for sku in range(SKUS):
+        handler.handle(AddStockCommand(f"sku-{sku:05d}", reservations, "store-01"))
+    for i in range(reservations):
+        handler.handle(ReserveStockCommand(
+            f"sku-{i % SKUS:05d}", 1, f"res-{i:09d}", "store-01",
+            expiration_time=START + (i * 7919) % horizon,
+        ))
+    return handler
+
+
+def sweep(handler: InventoryCommandHandler, ticks: int) -> Tuple[float, int]:
+    """Scan every open reservation on each tick."""
+    expired = 0
+    started = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        now = START + tick
+        due = [
+            r.reservation_id for r in handler.ledger.reservations()
+            if r.expiration_time is not None and r.expiration_time <= now
+        ]
+        for reservation_id in due:
+            handler.handle(ReleaseReservationCommand(reservation_id))
+        expired += len(due)
+    return time.perf_counter() - started, expired
+
+
+def scheduled(handler: InventoryCommandHandler, ticks: int) -> Tuple[float, int]:
+    """Pop only the lapsed reservations from the scheduler heap on each tick."""
+    scheduler = ReservationExpiryScheduler(handler)
+    expired = 0
+    started = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        expired += len(scheduler.expire_due(START + tick))
+    return time.perf_counter() - started, expired
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservations", type=int, default=500_000)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--horizon", type=int, default=3600, help="seconds over which expirations are spread")
+    args = parser.parse_args(argv)
+
+    print(f"{args.reservations:,} open reservations, {args.ticks} one-second ticks")
+    print(f"{'strategy':<12}{'total (s)':>12}{'per tick (ms)':>16}{'expired':>10}")
+    for name, run in (("sweep", sweep), ("heap", scheduled)):
+        handler = _populated_handler(args.reservations, args.horizon)
+        elapsed, expired = run(handler, args.ticks)
+        print(f"{name:<12}{elapsed:>12.3f}{elapsed / args.ticks * 1000:>16.2f}{expired:>10,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
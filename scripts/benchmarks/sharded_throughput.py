@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Inventory sharded engine throughput benchmark.
+
+Stocks a catalogue of SKUs, then pushes a stream of ReserveStockCommands
+through ShardedInventoryEngine in fixed-size batches for increasing shard
+counts, next to a single in-process InventoryCommandHandler.
+
+Usage:
+    python3 scripts/benchmarks/sharded_throughput.py [--shards 1 2 4 8] [--commands 400000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from inventory.commands import AddStockCommand, ReserveStockCommand  # noqa: E402
+from inventory.handlers import InventoryCommandHandler  # noqa: E402
+from inventory.sharding import ShardedInventoryEngine  # noqa: E402
+
+
+def _workload(skus: int, count: int) -> List[object]:
+    rng = random.Random(11)
+    return [
+        ReserveStockCommand(f"sku-{rng.randrange(skus):06d}", 1, f"res-{i:09d}", "store-01")
+        for i in range(count)
+    ]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--commands", type=int, default=400_000)
+    parser.add_argument("--skus", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    stock = [AddStockCommand(f"sku-{i:06d}", 1_000_000, "store-01") for i in range(args.skus)]
+    reserves = _workload(args.skus, args.commands)
+
+    print(f"{args.commands:,} reservations over {args.skus:,} SKUs, batch {args.batch}, {os.cpu_count()} CPUs")
+    print(f"{'engine':<18}{'total (s)':>12}{'commands/s':>14}")
+
+    handler = InventoryCommandHandler()
+    handler.handle_batch(stock)
+    started = time.perf_counter()
+    for command in reserves:
+        handler.handle(command)
+    elapsed = time.perf_counter() - started
+    print(f"{'in-process':<18}{elapsed:>12.2f}{args.commands / elapsed:>14,.0f}")
+
+    for shards in args.shards:
+        with ShardedInventoryEngine(shards) as engine:
+            engine.handle_many(stock)
+            started = time.perf_counter()
+            for start in range(0, len(reserves), args.batch):
+                engine.handle_many(reserves[start:start + args.batch])
+            elapsed = time.perf_counter() - started
+        print(f"{f'{shards} shard(s)':<18}{elapsed:>12.2f}{args.commands / elapsed:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
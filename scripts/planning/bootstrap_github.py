@@ -7,7 +7,13 @@ creates/updates all 40 issues from issues.json, and adds them to the project.
 
 Usage:
     export GH_TOKEN=<your-github-token>
-    python3 scripts/planning/bootstrap_github.py
+    python3 scripts/planning/bootstrap_github.py [--workers 8] [--full] [--state PATH]
+
+Re-runs are incremental: what was pushed is recorded in .bootstrap_state.json
+next to this script, and only issues and field values changed since are sent.
+The saved project, field and item IDs are checked against GitHub first; stale
+ones trigger a full project sync. --full ignores the state and compares
+everything with GitHub.
 
 Requirements:
     - Python 3.7+
@@ -16,14 +22,23 @@ Requirements:
     - issues.json file (generated by generate_issues_json.py)
 """
 
+import argparse
+import hashlib
 import os
 import sys
 import json
+import math
+import random
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Any, Tuple
 
 # Configuration
 REPO_OWNER = "Abuzhor"
@@ -34,10 +49,28 @@ Execution board for tracking all phases of the Smart Grocery Logistics Platform
 Source: docs/notion-export/** → GitHub Issues via PHASE 0 bootstrap.
 """
 
+# HTTP
+API_URL = "https://api.github.com"
+DEFAULT_TIMEOUT = 30  # seconds, per request
+DEFAULT_POOL_SIZE = 10  # keep-alive connections per host
+
+# Rate limiting
+DEFAULT_MAX_RATE = 50.0  # quota units (REST requests, GraphQL points) per second per API resource
+SECONDARY_POINTS_PER_MINUTE = 900  # GitHub's secondary limit
+RATE_LIMIT_RESERVE = 100  # quota left untouched for other tools
+QUOTA_HORIZON = 60.0  # seconds the remaining quota is paced to last at least
+MAX_BACKOFF = 60.0  # seconds
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Concurrency
+DEFAULT_WORKERS = 8  # parallel issue upserts; the session's pool grows to match more
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
 ISSUES_PATH = SCRIPT_DIR / "issues.json"
+STATE_PATH = SCRIPT_DIR / ".bootstrap_state.json"
+STATE_VERSION = 1
 
 # Color codes for output
 class Colors:
@@ -75,16 +108,217 @@ def check_dependencies():
         print_color(Colors.RED, "Install with: pip install requests")
         sys.exit(1)
 
+class RateLimiter:
+    """
+    Token-bucket limiter shared by the GitHub clients and their threads.
+
+    Requests draw from two buckets. Each API resource ("core" for REST,
+    "graphql") has a primary bucket paced from the X-RateLimit-* headers and
+    the GraphQL rateLimit object, counted in that quota's units: one per REST
+    request, and a GraphQL query's reported point cost. It refills at
+    max_rate while quota is plentiful, slowing as the quota left above the
+    reserve would run out within QUOTA_HORIZON seconds, and is paused until
+    the reset once it has. A shared points bucket keeps under GitHub's
+    secondary limit of 900 points per minute, where a read costs 1 point and
+    a write 5; like the limit, it allows a minute's points in a burst. A 403
+    or 429 rate-limit response pauses every caller for its Retry-After (in
+    seconds or as an HTTP date) or reset time, or else for an exponential
+    backoff; jitter spreads the retries.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = DEFAULT_MAX_RATE,
+        points_per_minute: float = SECONDARY_POINTS_PER_MINUTE,
+        reserve: int = RATE_LIMIT_RESERVE,
+        max_backoff: float = MAX_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.max_rate = max_rate
+        self.reserve = reserve
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        # name -> [rate per second, capacity, tokens, last refill time]
+        self._buckets: Dict[str, List[float]] = {
+            "points": [points_per_minute / 60, points_per_minute, points_per_minute, clock()]
+        }
+        self._paused_until = 0.0
+        self._backoff = 0.0
+
+    def send(
+        self,
+        resource: str,
+        points: int,
+        request: Callable[[], requests.Response],
+        cost: float = 1
+    ) -> requests.Response:
+        """
+        Send request() when the limits allow, retrying rate-limited responses
+        up to MAX_RATE_LIMIT_RETRIES times; return the last response.
+        """
+        for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.acquire(resource, points, cost)
+            response = request()
+            if self.observe(resource, response) is None:
+                with self._lock:
+                    self._backoff = 0.0
+                break
+        return response
+
+    def acquire(self, resource: str, points: int = 1, cost: float = 1) -> None:
+        """
+        Block until a request to resource may be sent, taking cost from its
+        primary quota and points from the secondary limit.
+        """
+        while True:
+            with self._lock:
+                now = self.clock()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    primary = self._bucket(resource, now)
+                    secondary = self._bucket("points", now)
+                    wait = max(_shortfall(primary, cost), _shortfall(secondary, points))
+                    if wait <= 0:
+                        primary[2] -= cost
+                        secondary[2] -= points
+                        return
+            self.sleep(wait)
+
+    def update(self, resource: str, remaining: int, reset_at: float) -> None:
+        """Pace resource given the remaining quota and its reset, a POSIX timestamp."""
+        with self._lock:
+            window = max(reset_at - self.wall_clock(), 1.0)
+            usable = remaining - self.reserve
+            bucket = self._bucket(resource, self.clock())
+            if usable <= 0:
+                bucket[0] = self.max_rate
+                self._pause(window)
+            else:
+                bucket[0] = min(self.max_rate, usable / min(window, QUOTA_HORIZON))
+
+    def observe(self, resource: str, response: requests.Response) -> Optional[float]:
+        """
+        Update pacing from a response's rate-limit headers. For a rate-limited
+        response, pause all callers and return the pause.
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            self.update(resource, int(remaining), float(reset))
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = parse_retry_after(headers.get("Retry-After"), self.wall_clock())
+        if retry_after is not None:
+            return self.backoff(retry_after)
+        if remaining == "0" and reset is not None:
+            return self.backoff(float(reset) - self.wall_clock())
+        if response.status_code == 429 or "rate limit" in response.text.lower():
+            return self.backoff()
+        return None  # a permissions error, not a rate limit
+
+    def backoff(self, delay: Optional[float] = None) -> float:
+        """
+        Pause all callers for delay seconds or, without one, for twice the
+        previous backoff; return the pause, which includes up to 25% jitter.
+        """
+        with self._lock:
+            if delay is None:
+                self._backoff = min(self.max_backoff, max(1.0, 2 * self._backoff))
+                delay = self._backoff
+            delay = max(delay, 0.0)
+            delay += self._random.uniform(0, 0.25 * max(delay, 1.0))
+            self._pause(delay)
+            return delay
+
+    def _pause(self, delay: float) -> None:
+        self._paused_until = max(self._paused_until, self.clock() + delay)
+
+    def _bucket(self, name: str, now: float) -> List[float]:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = [self.max_rate, self.max_rate, self.max_rate, now]
+        rate, capacity, tokens, updated = bucket
+        bucket[2] = min(capacity, tokens + (now - updated) * rate)
+        bucket[3] = now
+        return bucket
+
+
+def _shortfall(bucket: List[float], cost: float) -> float:
+    """Seconds until bucket holds cost tokens, or at most its capacity."""
+    rate, capacity, tokens, _ = bucket
+    return (min(cost, capacity) - tokens) / rate
+
+
+def parse_github_time(value: str) -> float:
+    """Parse a GitHub ISO 8601 timestamp such as 2024-01-01T00:00:00Z."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+def parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header, given either as seconds or as
+    an HTTP date, measured from now (POSIX time); None if absent or invalid.
+    """
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        # HTTP dates are always GMT, whether or not they say so
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        seconds = date.timestamp() - now
+    return seconds if math.isfinite(seconds) else None
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create an HTTP session for the GitHub clients.
+
+    The session keeps up to pool_size connections per host alive, so calls
+    after the first reuse an open TCP+TLS connection instead of opening a new
+    one, and asks for gzip-compressed responses. Share one session between
+    the GraphQL and REST clients; both talk to the same host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
 class GitHubGraphQLClient:
     """GitHub GraphQL API client"""
     
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        base_url: str = API_URL,
+        limiter: Optional[RateLimiter] = None
+    ):
         self.token = token
-        self.endpoint = "https://api.github.com/graphql"
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter()
+        self.endpoint = f"{base_url}/graphql"
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
+        # query text -> rate limit points it cost last time it was sent
+        self._costs: Dict[str, int] = {}
     
     def query(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """Execute GraphQL query"""
@@ -92,18 +326,41 @@ class GitHubGraphQLClient:
         if variables:
             payload["variables"] = variables
         
-        response = requests.post(
-            self.endpoint,
-            headers=self.headers,
-            json=payload
-        )
-        
-        if response.status_code != 200:
-            print_color(Colors.RED, f"GraphQL request failed: {response.status_code}")
-            print_color(Colors.RED, response.text)
-            raise Exception(f"GraphQL HTTP error: {response.status_code}")
+        # Mutations count 5 points against the secondary limit, queries 1.
+        # The primary quota is charged what the query cost last time; pages of
+        # one paginated query send the same text, so they cost alike.
+        points = 5 if query.lstrip().startswith("mutation") else 1
+        cost = self._costs.get(query, 1)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            response = self.limiter.send("graphql", points, lambda: self.session.post(
+                self.endpoint,
+                headers=self.headers,
+                json=payload,
+                timeout=self.timeout
+            ), cost)
+            
+            if response.status_code != 200:
+                print_color(Colors.RED, f"GraphQL request failed: {response.status_code}")
+                print_color(Colors.RED, response.text)
+                raise Exception(f"GraphQL HTTP error: {response.status_code}")
+            
+            result = response.json()
+            # GraphQL reports exhausted quota with status 200 and a RATE_LIMITED error
+            if attempt < MAX_RATE_LIMIT_RETRIES and any(
+                e.get("type") == "RATE_LIMITED" for e in result.get("errors", [])
+            ):
+                self.limiter.backoff()
+                continue
+            break
         
-        result = response.json()
+        data = result.get("data") or {}
+        # Queries that select rateLimit { cost remaining resetAt } pace later calls
+        rate_limit = data.pop("rateLimit", None) if isinstance(data, dict) else None
+        if rate_limit:
+            if rate_limit.get("cost"):
+                self._costs[query] = rate_limit["cost"]
+            if "remaining" in rate_limit and "resetAt" in rate_limit:
+                self.limiter.update("graphql", rate_limit["remaining"], parse_github_time(rate_limit["resetAt"]))
         
         if "errors" in result:
             # For certain queries (like checking if org/user exists), we want to handle gracefully
@@ -117,17 +374,29 @@ class GitHubGraphQLClient:
                 print_color(Colors.RED, json.dumps(result["errors"], indent=2))
                 raise Exception("GraphQL query failed")
         
-        return result.get("data", {})
+        return data
 
 
 class GitHubRESTClient:
     """GitHub REST API client"""
     
-    def __init__(self, token: str, owner: str, repo: str):
+    def __init__(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        base_url: str = API_URL,
+        limiter: Optional[RateLimiter] = None
+    ):
         self.token = token
         self.owner = owner
         self.repo = repo
-        self.base_url = "https://api.github.com"
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter()
+        self.base_url = base_url
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.github.v3+json",
@@ -136,55 +405,37 @@ class GitHubRESTClient:
     
     def get(self, path: str, params: Optional[Dict] = None) -> Any:
         """Execute GET request"""
-        response = requests.get(
+        response = self.limiter.send("core", 1, lambda: self.session.get(
             f"{self.base_url}{path}",
             headers=self.headers,
-            params=params or {}
-        )
+            params=params or {},
+            timeout=self.timeout
+        ))
         response.raise_for_status()
         return response.json()
     
     def post(self, path: str, data: Dict) -> Any:
         """Execute POST request"""
-        response = requests.post(
+        response = self.limiter.send("core", 5, lambda: self.session.post(
             f"{self.base_url}{path}",
             headers=self.headers,
-            json=data
-        )
+            json=data,
+            timeout=self.timeout
+        ))
         response.raise_for_status()
         return response.json()
     
     def patch(self, path: str, data: Dict) -> Any:
         """Execute PATCH request"""
-        response = requests.patch(
+        response = self.limiter.send("core", 5, lambda: self.session.patch(
             f"{self.base_url}{path}",
             headers=self.headers,
-            json=data
-        )
+            json=data,
+            timeout=self.timeout
+        ))
         response.raise_for_status()
         return response.json()
     
-    def get_all_issues(self) -> List[Dict]:
-        """Get all issues (open and closed) with pagination"""
-        issues = []
-        page = 1
-        per_page = 100
-        
-        while True:
-            batch = self.get(
-                f"/repos/{self.owner}/{self.repo}/issues",
-                params={"state": "all", "per_page": per_page, "page": page}
-            )
-            if not batch:
-                break
-            issues.extend(batch)
-            if len(batch) < per_page:
-                break
-            page += 1
-            time.sleep(0.1)  # Rate limit courtesy
-        
-        return issues
-    
     def get_milestones(self) -> Dict[str, int]:
         """Get all milestones and return mapping of title to number"""
         milestones = self.get(f"/repos/{self.owner}/{self.repo}/milestones", params={"state": "all"})
@@ -483,25 +734,73 @@ def add_single_select_options(client: GitHubGraphQLClient, project_id: str, fiel
     
     return result["updateProjectV2Field"]["projectV2Field"]
 
-def get_repository_issues(client: GitHubGraphQLClient, owner: str, repo: str, limit: int = 100) -> List[Dict]:
-    """Get repository issues"""
+def paginate(
+    client: GitHubGraphQLClient,
+    query: str,
+    variables: Dict,
+    connection: Callable[[Dict], Dict],
+    page_size: int = 100
+) -> Iterator[List[Dict]]:
+    """
+    Yield the nodes of a GraphQL connection one page at a time.
+    
+    query must take $first: Int! and $after: String and select
+    pageInfo { hasNextPage endCursor } on the connection, which
+    connection(data) returns from the query result. Each page is fetched
+    only when the previous one has been consumed.
+    """
+    after = None
+    while True:
+        result = client.query(query, {**variables, "first": page_size, "after": after})
+        page = connection(result)
+        yield page["nodes"]
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        after = page["pageInfo"]["endCursor"]
+
+
+def get_repository_issues(
+    client: GitHubGraphQLClient,
+    owner: str,
+    repo: str,
+    page_size: int = 100
+) -> Iterator[List[Dict]]:
+    """
+    Yield pages of all repository issues (open and closed), newest first.
+    
+    Issues have the fields upsert_issue() compares, in the shape of the REST
+    API's issues: number, node_id, title, body, labels as [{"name": ...}]
+    and milestone as {"number": ...} or None. Unlike the REST issue list,
+    pull requests are not included.
+    """
     query = """
-    query($owner: String!, $repo: String!, $first: Int!) {
+    query($owner: String!, $repo: String!, $first: Int!, $after: String) {
+      rateLimit { cost remaining resetAt }
       repository(owner: $owner, name: $repo) {
-        issues(first: $first, orderBy: {field: CREATED_AT, direction: DESC}) {
+        issues(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+          pageInfo { hasNextPage endCursor }
           nodes {
-            id
+            node_id: id
             number
             title
-            url
+            body
+            labels(first: 100) { nodes { name } }
+            milestone { number }
           }
         }
       }
     }
     """
     
-    result = client.query(query, {"owner": owner, "repo": repo, "first": limit})
-    return result["repository"]["issues"]["nodes"]
+    pages = paginate(
+        client,
+        query,
+        {"owner": owner, "repo": repo},
+        lambda result: result["repository"]["issues"],
+        page_size
+    )
+    for page in pages:
+        yield [{**issue, "labels": issue["labels"]["nodes"]} for issue in page]
 
 def add_issue_to_project(client: GitHubGraphQLClient, project_id: str, issue_id: str) -> Dict:
     """Add an issue to a project"""
@@ -523,20 +822,20 @@ def add_issue_to_project(client: GitHubGraphQLClient, project_id: str, issue_id:
     return result["addProjectV2ItemById"]["item"]
 
 
-def get_project_items(client: GitHubGraphQLClient, project_id: str) -> List[Dict]:
-    """Get all items in a project"""
+def get_project_items(client: GitHubGraphQLClient, project_id: str, page_size: int = 100) -> Iterator[List[Dict]]:
+    """Yield pages of all items in a project, with the number of each item's issue"""
     query = """
-    query($projectId: ID!) {
+    query($projectId: ID!, $first: Int!, $after: String) {
+      rateLimit { cost remaining resetAt }
       node(id: $projectId) {
         ... on ProjectV2 {
-          items(first: 100) {
+          items(first: $first, after: $after) {
+            pageInfo { hasNextPage endCursor }
             nodes {
               id
               content {
                 ... on Issue {
-                  id
                   number
-                  title
                 }
               }
             }
@@ -546,8 +845,13 @@ def get_project_items(client: GitHubGraphQLClient, project_id: str) -> List[Dict
     }
     """
     
-    result = client.query(query, {"projectId": project_id})
-    return result["node"]["items"]["nodes"]
+    return paginate(
+        client,
+        query,
+        {"projectId": project_id},
+        lambda result: result["node"]["items"],
+        page_size
+    )
 
 
 def set_project_field_value(client: GitHubGraphQLClient, project_id: str, item_id: str, field_id: str, value: Any) -> bool:
@@ -682,128 +986,83 @@ def build_field_maps(fields: List[Dict]) -> tuple[Dict[str, str], Dict[str, Dict
       option_ids[field["name"]] = {opt["name"]: opt["id"] for opt in field.get("options", [])}
   return field_ids, option_ids
 
-def main():
-    """Main execution"""
-    print_header(f"GitHub Bootstrap for {REPO_OWNER}/{REPO_NAME}")
-    
-    # Check dependencies
-    check_dependencies()
-    
-    # Get GitHub token
-    token = get_github_token()
-    graphql_client = GitHubGraphQLClient(token)
-    rest_client = GitHubRESTClient(token, REPO_OWNER, REPO_NAME)
-    
-    print_color(Colors.GREEN, "✓ GitHub clients initialized")
-    print()
-    
-    # Load configuration
-    if not CONFIG_PATH.exists():
-        print_color(Colors.RED, f"Error: config.json not found at {CONFIG_PATH}")
-        sys.exit(1)
-    
-    if not ISSUES_PATH.exists():
-        print_color(Colors.RED, f"Error: issues.json not found at {ISSUES_PATH}")
-        print_color(Colors.RED, "Run: python3 scripts/planning/generate_issues_json.py")
-        sys.exit(1)
-    
-    with open(ISSUES_PATH, 'r', encoding='utf-8') as f:
-        issues_data = json.load(f)
-    
-    print_color(Colors.GREEN, f"✓ Loaded {len(issues_data)} issue definitions from issues.json")
-    print()
-    
-    # Get milestones
-    print("Fetching milestones...")
-    milestones = rest_client.get_milestones()
-    print_color(Colors.GREEN, f"✓ Found {len(milestones)} milestones")
-    for title in sorted(milestones.keys()):
-        print(f"  - {title}")
-    print()
-    
-    # Get existing issues
-    print("Fetching existing issues...")
-    existing_issues = rest_client.get_all_issues()
-    existing_by_title = {issue["title"]: issue for issue in existing_issues}
-    print_color(Colors.GREEN, f"✓ Found {len(existing_issues)} existing issues")
-    print()
-    
-    # Upsert issues
-    print_header("Creating/Updating Issues")
-    
-    created_issues = []
-    updated_issues = []
-    skipped_issues = []
-    warnings = []
-    
-    for issue_def in issues_data:
-        title = issue_def["title"]
-        body = issue_def["body"]
-        labels = issue_def["labels"]
-        milestone_title = issue_def.get("milestone")
-        
-        # Get milestone number
-        milestone_number = None
-        if milestone_title and milestone_title in milestones:
-            milestone_number = milestones[milestone_title]
-        elif milestone_title:
-            warnings.append(f"Milestone not found: {milestone_title} for issue '{title}'")
-        
-        try:
-            if title in existing_by_title:
-                # Update existing issue
-                existing = existing_by_title[title]
-                issue_number = existing["number"]
-                
-                # Check if update is needed
-                needs_update = False
-                if existing["body"] != body:
-                    needs_update = True
-                existing_labels = {label["name"] for label in existing.get("labels", [])}
-                if existing_labels != set(labels):
-                    needs_update = True
-                existing_milestone = existing.get("milestone", {}).get("number") if existing.get("milestone") else None
-                if existing_milestone != milestone_number:
-                    needs_update = True
-                
-                if needs_update:
-                    rest_client.update_issue(issue_number, body, labels, milestone_number)
-                    print_color(Colors.YELLOW, f"  ↻ Updated issue #{issue_number}: {title[:60]}...")
-                    updated_issues.append((issue_number, title))
-                else:
-                    print_color(Colors.YELLOW, f"  = Skipped (no changes) #{issue_number}: {title[:60]}...")
-                    skipped_issues.append((issue_number, title))
-                
-                # Store issue data for project sync
-                issue_def["_github_number"] = issue_number
-                issue_def["_github_id"] = existing["node_id"]
-            else:
-                # Create new issue
-                created = rest_client.create_issue(title, body, labels, milestone_number)
-                issue_number = created["number"]
-                print_color(Colors.GREEN, f"  ✓ Created issue #{issue_number}: {title[:60]}...")
-                created_issues.append((issue_number, title))
-                
-                # Store issue data for project sync
-                issue_def["_github_number"] = issue_number
-                issue_def["_github_id"] = created["node_id"]
-            
-            time.sleep(0.2)  # Rate limit courtesy
-        
-        except Exception as e:
-            warnings.append(f"Failed to upsert issue '{title}': {str(e)}")
-            print_color(Colors.RED, f"  ✗ Error with issue '{title}': {str(e)}")
-    
-    print()
-    print_color(Colors.GREEN, f"✓ Issue upsert complete")
-    print(f"  Created: {len(created_issues)}")
-    print(f"  Updated: {len(updated_issues)}")
-    print(f"  Skipped (no changes): {len(skipped_issues)}")
-    print()
-    
-    # Create or find project
-    print_header("Setting up Projects v2 Board")
-    
+def issue_hash(issue_def: Dict) -> str:
+    """Hash of the parts of an issue definition that are pushed to the issue"""
+    content = {
+        "title": issue_def["title"],
+        "body": issue_def["body"],
+        "labels": sorted(issue_def["labels"]),
+        "milestone": issue_def.get("milestone")
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_state(path: Path) -> Dict:
+    """
+    Load the sync state left by the last run. Returns an empty state if the
+    file is missing, unreadable or was written for another repository.
+    """
+    empty = {"version": STATE_VERSION, "repository": f"{REPO_OWNER}/{REPO_NAME}", "issues": {}}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if (
+        not isinstance(state, dict)
+        or state.get("version") != STATE_VERSION
+        or state.get("repository") != empty["repository"]
+        or not isinstance(state.get("issues"), dict)
+    ):
+        return empty
+    return state
+
+
+def save_state(path: Path, state: Dict) -> None:
+    """Write the sync state, atomically replacing the old file"""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def saved_project_is_current(client: GitHubGraphQLClient, saved_project: Dict) -> bool:
+    """
+    Check that the project saved in the sync state still exists under its
+    title and still has every saved field and option ID. A project that
+    was deleted, renamed or had fields or options replaced fails the check.
+    """
+    try:
+        project = client.query("""
+        query($projectId: ID!) {
+          node(id: $projectId) {
+            ... on ProjectV2 {
+              title
+            }
+          }
+        }
+        """, {"projectId": saved_project["id"]})["node"]
+        if not project or project.get("title") != saved_project["title"]:
+            return False
+        field_ids, option_ids = build_field_maps(get_project_fields(client, saved_project["id"]))
+    except Exception:
+        return False
+    return all(
+        field_ids.get(name) == field_id for name, field_id in saved_project["field_ids"].items()
+    ) and all(
+        option_ids.get(name, {}).get(option) == option_id
+        for name, options in saved_project["option_ids"].items()
+        for option, option_id in options.items()
+    )
+
+
+def setup_project(graphql_client: GitHubGraphQLClient) -> Tuple[Dict, str, Dict[str, str], Dict[str, Dict[str, str]]]:
+    """
+    Find or create the project and its custom fields.
+    Returns: (project, owner_type, field_ids, option_ids) with field and
+    option IDs as built by build_field_maps()
+    """
     # Detect owner type
     print(f"Detecting owner type for '{REPO_OWNER}'...")
     owner_id, owner_type = get_owner_id(graphql_client, REPO_OWNER)
@@ -824,7 +1083,6 @@ def main():
         print_color(Colors.GREEN, f"     {project['url']}")
     
     project_id = project["id"]
-    project_url = project["url"]
     print()
     
     # Create custom fields (idempotent with option checking)
@@ -922,27 +1180,321 @@ def main():
     
     print()
     
-    # Get project items
-    print("Fetching project items...")
-    project_items = get_project_items(graphql_client, project_id)
-    items_by_issue_number = {}
-    for item in project_items:
-        if item.get("content") and "number" in item["content"]:
-            items_by_issue_number[item["content"]["number"]] = item
+    # Re-fetch fields to ensure fresh option IDs
+    refresh_project_fields()
+    field_ids, option_ids = build_field_maps(existing_fields)
+    return project, owner_type, field_ids, option_ids
+
+def upsert_issue(
+    rest_client: GitHubRESTClient,
+    issue_def: Dict,
+    existing: Optional[Dict],
+    milestone_number: Optional[int],
+    force: bool = False
+) -> Tuple[str, int, str]:
+    """
+    Create an issue, or update the existing one if its body, labels or
+    milestone differ. With force, the existing issue is updated without
+    comparing, and only its number and node_id are needed. Returns (action,
+    issue number, node ID), where action is 'created', 'updated' or 'skipped'.
+    """
+    title = issue_def["title"]
+    body = issue_def["body"]
+    labels = issue_def["labels"]
+    
+    if existing is None:
+        created = rest_client.create_issue(title, body, labels, milestone_number)
+        return ("created", created["number"], created["node_id"])
     
-    print_color(Colors.GREEN, f"✓ Found {len(project_items)} items in project")
+    if force:
+        needs_update = True
+    else:
+        # Check if update is needed
+        needs_update = False
+        if existing["body"] != body:
+            needs_update = True
+        existing_labels = {label["name"] for label in existing.get("labels", [])}
+        if existing_labels != set(labels):
+            needs_update = True
+        existing_milestone = existing.get("milestone", {}).get("number") if existing.get("milestone") else None
+        if existing_milestone != milestone_number:
+            needs_update = True
+    
+    if needs_update:
+        rest_client.update_issue(existing["number"], body, labels, milestone_number)
+        return ("updated", existing["number"], existing["node_id"])
+    return ("skipped", existing["number"], existing["node_id"])
+
+
+def upsert_issues(
+    rest_client: GitHubRESTClient,
+    issues_data: List[Dict],
+    existing_by_title: Dict[str, Dict],
+    milestones: Dict[str, int],
+    workers: int = DEFAULT_WORKERS,
+    force: Collection[str] = ()
+) -> Iterator[Tuple[Dict, Optional[str], Optional[Tuple[str, int, str]], Optional[Exception]]]:
+    """
+    Upsert issues on a pool of worker threads sharing the client's rate limiter.
+    Issues whose titles are in force are updated without comparing (see
+    upsert_issue()).
+    
+    Yields (issue_def, milestone warning, upsert_issue() result, error) per
+    issue in the order of issues_data, whatever order the upserts finish in,
+    so output and reports are the same as for a sequential run.
+    """
+    jobs = []
+    for issue_def in issues_data:
+        milestone_title = issue_def.get("milestone")
+        milestone_number = milestones.get(milestone_title) if milestone_title else None
+        warning = None
+        if milestone_title and milestone_number is None:
+            warning = f"Milestone not found: {milestone_title} for issue '{issue_def['title']}'"
+        jobs.append((issue_def, milestone_number, warning))
+    
+    def run(job):
+        issue_def, milestone_number, _ = job
+        try:
+            existing = existing_by_title.get(issue_def["title"])
+            forced = issue_def["title"] in force
+            return upsert_issue(rest_client, issue_def, existing, milestone_number, forced), None
+        except Exception as e:
+            return None, e
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (issue_def, _, warning), (result, error) in zip(jobs, executor.map(run, jobs)):
+            yield issue_def, warning, result, error
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Bootstrap the GitHub Projects v2 board and issues")
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help=f"issues to upsert in parallel (default: {DEFAULT_WORKERS}; 1 upserts one at a time)"
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=STATE_PATH,
+        help=f"sync state file (default: {STATE_PATH.name} next to this script)"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the sync state and compare every issue, field and item with GitHub"
+    )
+    args = parser.parse_args(argv)
+    
+    print_header(f"GitHub Bootstrap for {REPO_OWNER}/{REPO_NAME}")
+    
+    # Check dependencies
+    check_dependencies()
+    
+    # Get GitHub token
+    token = get_github_token()
+    # One keep-alive connection per worker, so parallel upserts never reconnect
+    session = create_session(max(DEFAULT_POOL_SIZE, args.workers))
+    limiter = RateLimiter()
+    graphql_client = GitHubGraphQLClient(token, session, limiter=limiter)
+    rest_client = GitHubRESTClient(token, REPO_OWNER, REPO_NAME, session, limiter=limiter)
+    
+    print_color(Colors.GREEN, "✓ GitHub clients initialized")
     print()
     
+    # Load configuration
+    if not CONFIG_PATH.exists():
+        print_color(Colors.RED, f"Error: config.json not found at {CONFIG_PATH}")
+        sys.exit(1)
+    
+    if not ISSUES_PATH.exists():
+        print_color(Colors.RED, f"Error: issues.json not found at {ISSUES_PATH}")
+        print_color(Colors.RED, "Run: python3 scripts/planning/generate_issues_json.py")
+        sys.exit(1)
+    
+    with open(ISSUES_PATH, 'r', encoding='utf-8') as f:
+        issues_data = json.load(f)
+    
+    print_color(Colors.GREEN, f"✓ Loaded {len(issues_data)} issue definitions from issues.json")
+    print()
+    
+    # Load sync state: issues whose definition is unchanged since the last
+    # run are not pushed again, and field values already set are not re-sent
+    state = load_state(args.state)
+    if args.full:
+        state["issues"] = {}
+        state.pop("project", None)
+    synced_issues = state["issues"]
+    pending = [
+        issue_def for issue_def in issues_data
+        if synced_issues.get(issue_def["title"], {}).get("hash") != issue_hash(issue_def)
+    ]
+    if synced_issues:
+        print_color(Colors.GREEN, f"✓ Sync state: {len(issues_data) - len(pending)} issues unchanged since last run")
+        print()
+    
+    milestones = {}
+    existing_by_title = {}
+    if pending:
+        # Get milestones
+        print("Fetching milestones...")
+        milestones = rest_client.get_milestones()
+        print_color(Colors.GREEN, f"✓ Found {len(milestones)} milestones")
+        for title in sorted(milestones.keys()):
+            print(f"  - {title}")
+        print()
+    
+    if any(issue_def["title"] not in synced_issues for issue_def in pending):
+        # Get existing issues
+        print("Fetching existing issues...")
+        existing_count = 0
+        for page in get_repository_issues(graphql_client, REPO_OWNER, REPO_NAME):
+            existing_by_title.update((issue["title"], issue) for issue in page)
+            existing_count += len(page)
+        print_color(Colors.GREEN, f"✓ Found {existing_count} existing issues")
+        print()
+    forced_titles = set()
+    for issue_def in pending:
+        synced = synced_issues.get(issue_def["title"])
+        if synced and issue_def["title"] not in existing_by_title:
+            # Known from the last run and changed since: update without fetching it
+            existing_by_title[issue_def["title"]] = {"number": synced["number"], "node_id": synced["node_id"]}
+            forced_titles.add(issue_def["title"])
+    
+    # Upsert issues
+    print_header("Creating/Updating Issues")
+    
+    created_issues = []
+    updated_issues = []
+    skipped_issues = []
+    warnings = []
+    
+    # Issues are upserted in parallel; results arrive in issues.json order
+    upserts = upsert_issues(
+        rest_client, pending, existing_by_title, milestones, args.workers, forced_titles
+    )
+    pending_titles = {issue_def["title"] for issue_def in pending}
+    for issue_def in issues_data:
+        title = issue_def["title"]
+        if title not in pending_titles:
+            synced = synced_issues[title]
+            print_color(Colors.YELLOW, f"  = Skipped (unchanged since last sync) #{synced['number']}: {title[:60]}...")
+            skipped_issues.append((synced["number"], title))
+            issue_def["_github_number"] = synced["number"]
+            issue_def["_github_id"] = synced["node_id"]
+            continue
+        _, warning, result, error = next(upserts)
+        if warning:
+            warnings.append(warning)
+        
+        if error is not None:
+            warnings.append(f"Failed to upsert issue '{title}': {str(error)}")
+            print_color(Colors.RED, f"  ✗ Error with issue '{title}': {str(error)}")
+            continue
+        
+        action, issue_number, node_id = result
+        if action == "created":
+            print_color(Colors.GREEN, f"  ✓ Created issue #{issue_number}: {title[:60]}...")
+            created_issues.append((issue_number, title))
+        elif action == "updated":
+            print_color(Colors.YELLOW, f"  ↻ Updated issue #{issue_number}: {title[:60]}...")
+            updated_issues.append((issue_number, title))
+        else:
+            print_color(Colors.YELLOW, f"  = Skipped (no changes) #{issue_number}: {title[:60]}...")
+            skipped_issues.append((issue_number, title))
+        
+        # Store issue data for project sync
+        issue_def["_github_number"] = issue_number
+        issue_def["_github_id"] = node_id
+        synced = synced_issues.setdefault(title, {})
+        if synced.get("number") != issue_number:
+            synced.clear()  # a different issue: its project item and fields are unknown
+        synced.update({"number": issue_number, "node_id": node_id})
+        if not warning:
+            # An issue pushed with a missing milestone is retried next run
+            synced["hash"] = issue_hash(issue_def)
+    
+    save_state(args.state, state)
+    print()
+    print_color(Colors.GREEN, f"✓ Issue upsert complete")
+    print(f"  Created: {len(created_issues)}")
+    print(f"  Updated: {len(updated_issues)}")
+    print(f"  Skipped (no changes): {len(skipped_issues)}")
+    print()
+    
+    # Create or find project
+    print_header("Setting up Projects v2 Board")
+    
+    saved_project = state.get("project")
+    if saved_project and saved_project["title"] != PROJECT_TITLE:
+        saved_project = None
+    if saved_project and not saved_project_is_current(graphql_client, saved_project):
+        # The saved IDs are stale: set up the project again and re-add every
+        # issue and field value, as --full would
+        print_color(Colors.YELLOW, "  ↻ Project in sync state no longer matches GitHub, running a full project sync")
+        print()
+        saved_project = None
+        for synced in synced_issues.values():
+            synced.pop("item_id", None)
+            synced.pop("fields", None)
+    if saved_project:
+        # Project, owner type and field IDs are reused from the last run
+        # once saved_project_is_current() has checked them
+        project = saved_project
+        owner_type = saved_project["owner_type"]
+        field_ids = saved_project["field_ids"]
+        option_ids = saved_project["option_ids"]
+        print_color(Colors.YELLOW, f"  ↻ Project from sync state: {project['title']}")
+        print_color(Colors.YELLOW, f"     {project['url']}")
+        print()
+    else:
+        project, owner_type, field_ids, option_ids = setup_project(graphql_client)
+        state["project"] = {
+            "id": project["id"],
+            "title": project["title"],
+            "url": project["url"],
+            "owner_type": owner_type,
+            "field_ids": field_ids,
+            "option_ids": option_ids
+        }
+        save_state(args.state, state)
+    
+    project_id = project["id"]
+    project_url = project["url"]
+    
+    items_by_issue_number = {}
+    if any("_github_number" in issue_def for issue_def in issues_data):
+        # Get project items, also to check the item IDs in the sync state
+        print("Fetching project items...")
+        item_count = 0
+        for page in get_project_items(graphql_client, project_id):
+            item_count += len(page)
+            for item in page:
+                if item.get("content") and "number" in item["content"]:
+                    items_by_issue_number[item["content"]["number"]] = item
+        
+        print_color(Colors.GREEN, f"✓ Found {item_count} items in project")
+        print()
+    
     # Add issues to project and set field values
     print_header("Adding Issues to Project and Setting Fields")
     
     added_count = 0
     field_update_count = 0
     
-    # Re-fetch fields to ensure fresh option IDs
-    refresh_project_fields()
-    field_ids, option_ids = build_field_maps(existing_fields)
-    
     for issue_def in issues_data:
         if "_github_number" not in issue_def:
             continue  # Issue creation failed
@@ -950,21 +1502,40 @@ def main():
         issue_number = issue_def["_github_number"]
         issue_id = issue_def["_github_id"]
         title = issue_def["title"]
+        synced = synced_issues[title]
         
         try:
+            if "item_id" in synced and items_by_issue_number.get(issue_number, {}).get("id") != synced["item_id"]:
+                # Removed from the project since the last run: add it and set its fields again
+                synced.pop("item_id")
+                synced.pop("fields", None)
+            
             # Add to project if not already there
-            if issue_number not in items_by_issue_number:
+            if "item_id" in synced:
+                item_id = synced["item_id"]
+                print_color(Colors.YELLOW, f"  ↻ Already in project #{issue_number}: {title[:50]}...")
+            elif issue_number not in items_by_issue_number:
                 item = add_issue_to_project(graphql_client, project_id, issue_id)
                 item_id = item["id"]
                 print_color(Colors.GREEN, f"  ✓ Added #{issue_number} to project: {title[:50]}...")
                 added_count += 1
-                time.sleep(0.2)
             else:
                 item_id = items_by_issue_number[issue_number]["id"]
                 print_color(Colors.YELLOW, f"  ↻ Already in project #{issue_number}: {title[:50]}...")
+            synced["item_id"] = item_id
             
-            # Set field values
+            # Set field values, skipping those the last run already set
             project_meta = issue_def.get("project", {})
+            synced_fields = synced.setdefault("fields", {})
+            
+            def set_field(name: str, value: str, value_type: str) -> bool:
+                if synced_fields.get(name) == value:
+                    return False
+                set_project_field_value_typed(
+                    graphql_client, project_id, item_id, field_ids[name], value, value_type
+                )
+                synced_fields[name] = value
+                return True
             
             # Set Phase
             if "Phase" in field_ids:
@@ -972,11 +1543,8 @@ def main():
               if phase_value:
                 option_id = option_ids.get("Phase", {}).get(phase_value)
                 if option_id:
-                  set_project_field_value_typed(
-                    graphql_client, project_id, item_id, field_ids["Phase"], option_id, "single_select"
-                  )
-                  field_update_count += 1
-                  time.sleep(0.1)
+                  if set_field("Phase", option_id, "single_select"):
+                    field_update_count += 1
                 else:
                   available = ", ".join(sorted(option_ids.get("Phase", {}).keys()))
                   warnings.append(
@@ -997,11 +1565,8 @@ def main():
               if domain_value:
                 option_id = option_ids.get("Domain", {}).get(domain_value)
                 if option_id:
-                  set_project_field_value_typed(
-                    graphql_client, project_id, item_id, field_ids["Domain"], option_id, "single_select"
-                  )
-                  field_update_count += 1
-                  time.sleep(0.1)
+                  if set_field("Domain", option_id, "single_select"):
+                    field_update_count += 1
                 else:
                   available = ", ".join(sorted(option_ids.get("Domain", {}).keys()))
                   warnings.append(
@@ -1022,11 +1587,8 @@ def main():
               if priority_value:
                 option_id = option_ids.get("Priority", {}).get(priority_value)
                 if option_id:
-                  set_project_field_value_typed(
-                    graphql_client, project_id, item_id, field_ids["Priority"], option_id, "single_select"
-                  )
-                  field_update_count += 1
-                  time.sleep(0.1)
+                  if set_field("Priority", option_id, "single_select"):
+                    field_update_count += 1
                 else:
                   available = ", ".join(sorted(option_ids.get("Priority", {}).keys()))
                   warnings.append(
@@ -1043,21 +1605,14 @@ def main():
             
             # Set Notion Reference
             if project_meta.get("notion_reference") and "Notion Reference" in field_ids:
-              set_project_field_value_typed(
-                graphql_client,
-                project_id,
-                item_id,
-                field_ids["Notion Reference"],
-                project_meta["notion_reference"],
-                "text"
-              )
-              field_update_count += 1
-              time.sleep(0.1)
+              if set_field("Notion Reference", project_meta["notion_reference"], "text"):
+                field_update_count += 1
         
         except Exception as e:
             warnings.append(f"Failed to add/update project item for issue #{issue_number}: {str(e)}")
             print_color(Colors.RED, f"  ✗ Error with issue #{issue_number}: {str(e)}")
     
+    save_state(args.state, state)
     print()
     print_color(Colors.GREEN, f"✓ Project sync complete")
     print(f"  Added to project: {added_count}")
@@ -1 +1,17 @@
-# Inventory module (placeholder)
\ No newline at end of file
+"""
+Inventory Module
+
+Commands, domain events and the in-memory command handler engine for the
+inventory domain, plus the query handler serving the read side. See
+docs/inventory-boundaries.md for ownership rules.
+"""
+from .handlers import InventoryCommandHandler
+from .ledger import StockLedger
+from .queries import AvailabilityProjection, InventoryQueryHandler
+
+__all__ = [
+    "AvailabilityProjection",
+    "InventoryCommandHandler",
+    "InventoryQueryHandler",
+    "StockLedger",
+]
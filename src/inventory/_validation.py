@@ -0,0 +1,68 @@
+"""Field validators shared by the inventory command and event value types."""
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+
+def require_id(name: str, value: Any) -> None:
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{name} must be a non-empty string, got {value!r}")
+
+
+def require_optional_id(name: str, value: Any) -> None:
+    if value is not None:
+        require_id(name, value)
+
+
+def require_int(name: str, value: Any) -> None:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"{name} must be an int, got {type(value).__name__}")
+
+
+def require_positive(name: str, value: Any) -> None:
+    require_int(name, value)
+    if value <= 0:
+        raise ValueError(f"{name} must be positive, got {value}")
+
+
+def require_non_zero(name: str, value: Any) -> None:
+    require_int(name, value)
+    if value == 0:
+        raise ValueError(f"{name} must be non-zero")
+
+
+def require_optional_time(name: str, value: Optional[float]) -> None:
+    if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool)):
+        raise TypeError(f"{name} must be a POSIX timestamp, got {value!r}")
+
+
+def require_ids(name: str, values: Sequence[Any]) -> None:
+    # Checked with builtins over the whole sequence rather than per item, so
+    # batch queries stay cheap to construct; the items are only walked to
+    # name the offending one.
+    if set(map(type, values)) <= {str} and all(values):
+        return
+    for index, value in enumerate(values):
+        if type(value) is not str or not value:
+            raise ValueError(
+                f"{name}[{index}] must be a non-empty string, got {value!r}{_numpy_hint(value)}"
+            )
+
+
+def require_positive_ints(name: str, values: Sequence[Any]) -> None:
+    if set(map(type, values)) <= {int}:
+        if values and min(values) <= 0:
+            index = min(range(len(values)), key=values.__getitem__)
+            raise ValueError(f"{name}[{index}] must be positive, got {values[index]}")
+        return
+    for index, value in enumerate(values):
+        if type(value) is not int:
+            raise TypeError(
+                f"{name}[{index}] must be an int, got {type(value).__name__}{_numpy_hint(value)}"
+            )
+
+
+def _numpy_hint(value: Any) -> str:
+    if type(value).__module__ == "numpy":
+        return " (convert NumPy arrays with .tolist() first)"
+    return ""
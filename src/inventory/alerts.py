@@ -0,0 +1,117 @@
+"""
+Inventory Low-Stock Alerts
+
+This module emits LowStockWarning events when the available stock of a
+product at a location falls to or below its reorder point.
+
+The detector keeps a running available quantity per stock key, updated from
+each event the command handler emits, so an event costs one dictionary
+update and one comparison however many SKUs are tracked. A warning fires
+only when a key crosses its reorder point. Once warned, a key stays quiet
+until its available stock climbs above reorder_point + hysteresis, so stock
+hovering around the threshold does not produce a warning on every sale.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Mapping, Optional, Sequence, Set
+
+from ._validation import require_int
+from .events import AVAILABLE_DELTAS, LowStockWarning
+from .handlers import InventoryCommandHandler
+from .ledger import StockKey
+
+WarningPublisher = Callable[[Sequence[LowStockWarning]], None]
+
+
+class LowStockDetector:
+    """
+    Handler listener that publishes LowStockWarning events.
+
+    Reorder points are set per stock key, with default_reorder_point covering
+    keys that have none; keys with neither are not watched. The detector
+    registers itself with the handler and seeds its counts from the handler's
+    ledger. Keys already at or below their reorder point start out warned,
+    without a warning being published.
+
+    publish receives the warnings raised by each batch of events. It is called
+    on the command path, after the detector's lock is released, so it should
+    hand the warnings off (e.g. to EventBus.listener()) rather than block.
+    """
+
+    def __init__(
+        self,
+        handler: InventoryCommandHandler,
+        publish: WarningPublisher,
+        reorder_points: Optional[Mapping[StockKey, int]] = None,
+        default_reorder_point: Optional[int] = None,
+        hysteresis: int = 0,
+    ):
+        require_int("hysteresis", hysteresis)
+        if hysteresis < 0:
+            raise ValueError(f"hysteresis must not be negative, got {hysteresis}")
+        if default_reorder_point is not None:
+            require_int("default_reorder_point", default_reorder_point)
+        for key, reorder_point in (reorder_points or {}).items():
+            require_int(f"reorder_points[{key!r}]", reorder_point)
+        self.publish = publish
+        self.default_reorder_point = default_reorder_point
+        self.hysteresis = hysteresis
+        self._lock = threading.Lock()
+        self._reorder_points: Dict[StockKey, int] = dict(reorder_points or {})
+        self._available: Dict[StockKey, int] = {}
+        self._warned: Set[StockKey] = set()
+        for key, level in handler.ledger.levels():
+            self._available[key] = level.available
+            reorder_point = self.reorder_point(*key)
+            if reorder_point is not None and level.available <= reorder_point:
+                self._warned.add(key)
+        handler.add_listener(self)
+
+    def __call__(self, events: Sequence[object]) -> None:
+        deltas = AVAILABLE_DELTAS
+        available = self._available
+        warnings = []
+        with self._lock:
+            for event in events:
+                delta = deltas[type(event)](event)
+                if not delta:
+                    continue
+                key = (event.product_id, event.location_id)
+                quantity = available[key] = available.get(key, 0) + delta
+                reorder_point = self._reorder_points.get(key, self.default_reorder_point)
+                if reorder_point is None:
+                    continue
+                if key in self._warned:
+                    if quantity > reorder_point + self.hysteresis:
+                        self._warned.discard(key)
+                elif quantity <= reorder_point:
+                    self._warned.add(key)
+                    warnings.append(
+                        LowStockWarning(event.product_id, event.location_id, quantity, reorder_point, event.occurred_at)
+                    )
+        if warnings:
+            self.publish(warnings)
+
+    def reorder_point(self, product_id: str, location_id: str) -> Optional[int]:
+        """Reorder point watched for a stock key, or None if it is not watched."""
+        return self._reorder_points.get((product_id, location_id), self.default_reorder_point)
+
+    def set_reorder_point(self, product_id: str, location_id: str, reorder_point: int) -> None:
+        """
+        Change a key's reorder point. A key left at or below the new point is
+        treated as warned without publishing, like keys seen at start-up.
+        """
+        require_int("reorder_point", reorder_point)
+        key = (product_id, location_id)
+        with self._lock:
+            self._reorder_points[key] = reorder_point
+            available = self._available.get(key, 0)
+            if available <= reorder_point:
+                self._warned.add(key)
+            elif available > reorder_point + self.hysteresis:
+                self._warned.discard(key)
+
+    def is_low(self, product_id: str, location_id: str) -> bool:
+        """Whether a warning has fired for the key and not yet re-armed."""
+        return (product_id, location_id) in self._warned
@@ -0,0 +1,128 @@
+"""
+Inventory Multi-Location Allocation
+
+This module reserves stock across several candidate locations, choosing the
+cheapest by a cost the caller supplies, such as distance to the customer.
+
+ReservationAllocator keeps a per-product index of the locations currently
+holding available stock, maintained incrementally from the events the
+command handler emits. Planning an AllocateStockCommand therefore touches
+only the command's candidates: it ranks those that hold the product by cost
+and reroutes the whole quantity to the cheapest one holding enough, or, if
+the command allows it and none does, splits it over the cheapest candidates
+in turn. The plan is carried out as ordinary ReserveStockCommands through the
+handler, a split one as a single handle_batch(), so every part is validated
+against the ledger and the reservation is placed entirely or not at all.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+from .commands import AllocateStockCommand, ReserveStockCommand
+from .errors import ConcurrencyConflictError, InsufficientStockError
+from .events import AVAILABLE_DELTAS, StockReserved
+from .handlers import InventoryCommandHandler
+
+# (location_id, quantity) parts of an allocation, cheapest location first.
+AllocationPlan = List[Tuple[str, int]]
+
+
+class ReservationAllocator:
+    """
+    Handler listener that places AllocateStockCommands.
+
+    The allocator registers itself with the handler and seeds its location
+    index from the handler's ledger. A plan may go stale if other writers
+    take the stock before it is reserved; the handler then rejects it and
+    the allocator plans again from the updated index, up to the handler's
+    max_attempts.
+    """
+
+    def __init__(self, handler: InventoryCommandHandler):
+        self.handler = handler
+        self._lock = threading.Lock()
+        # product_id -> location_id -> available, for positive quantities only.
+        self._stocked: Dict[str, Dict[str, int]] = {}
+        for (product_id, location_id), level in handler.ledger.levels():
+            if level.available > 0:
+                self._stocked.setdefault(product_id, {})[location_id] = level.available
+        handler.add_listener(self)
+
+    def __call__(self, events: Sequence[object]) -> None:
+        deltas = AVAILABLE_DELTAS
+        with self._lock:
+            for event in events:
+                delta = deltas[type(event)](event)
+                if not delta:
+                    continue
+                locations = self._stocked.get(event.product_id)
+                if locations is None:
+                    locations = self._stocked[event.product_id] = {}
+                available = locations.get(event.location_id, 0) + delta
+                if available > 0:
+                    locations[event.location_id] = available
+                else:
+                    locations.pop(event.location_id, None)
+
+    def plan(self, command: AllocateStockCommand) -> AllocationPlan:
+        """
+        Choose the locations to reserve from, without reserving anything.
+
+        Raises InsufficientStockError if the candidates cannot cover the
+        quantity.
+        """
+        stocked = self._stocked.get(command.product_id, {})
+        ranked = sorted(
+            (cost, location_id) for location_id, cost in command.location_costs if location_id in stocked
+        )
+        quantity = command.quantity
+        for _, location_id in ranked:
+            if stocked.get(location_id, 0) >= quantity:
+                return [(location_id, quantity)]
+        if command.split:
+            parts = []
+            for _, location_id in ranked:
+                take = min(stocked.get(location_id, 0), quantity)
+                if take > 0:
+                    parts.append((location_id, take))
+                    quantity -= take
+                    if not quantity:
+                        return parts
+        raise InsufficientStockError(
+            f"Cannot allocate {command.quantity} of {command.product_id!r} from "
+            f"{len(command.location_costs)} candidate location(s)"
+            + ("" if command.split else " without splitting")
+        )
+
+    def handle(self, command: AllocateStockCommand) -> List[StockReserved]:
+        """Reserve the command's quantity and return one event per location used."""
+        for _ in range(self.handler.max_attempts):
+            parts = self.plan(command)
+            try:
+                if len(parts) == 1:
+                    location_id, quantity = parts[0]
+                    return [self.handler.handle(ReserveStockCommand(
+                        command.product_id,
+                        quantity,
+                        command.reservation_id,
+                        location_id,
+                        command.expiration_time,
+                    ))]
+                return self.handler.handle_batch([
+                    ReserveStockCommand(
+                        command.product_id,
+                        quantity,
+                        f"{command.reservation_id}@{location_id}",
+                        location_id,
+                        command.expiration_time,
+                    )
+                    for location_id, quantity in parts
+                ])
+            except InsufficientStockError:
+                # Another writer took stock the plan counted on.
+                continue
+        raise ConcurrencyConflictError(
+            f"Allocation of {command.reservation_id!r} conflicted with concurrent writers "
+            f"{self.handler.max_attempts} times"
+        )
@@ -0,0 +1,254 @@
+"""
+Inventory Audit Index
+
+This module answers audit queries over StockAdjusted events, such as "all
+shrink adjustments at store X last week", without scanning the event log.
+
+AdjustmentAuditIndex groups adjustments by (reason, location, time bucket).
+Each adjustment is also filed under the keys with reason, location or both
+left as None, so a query that fixes any combination of the two finds its
+buckets by direct lookup. A query then reads only the buckets its time range
+covers, and filters by timestamp only in the first and last of them.
+
+The index follows the event store rather than the command handler: refresh()
+replays the log from the last offset it covered, decoding StockAdjusted
+records only. save() writes the indexed events and that offset to a sidecar
+file, so a restart reloads the index and replays just the log written since.
+
+Sidecar layout (little endian):
+    magic       b"INVAUD1\\n"
+    header      u64 offset, f64 bucket seconds, u32 symbols, u32 events
+    symbols     u16 length + UTF-8 bytes, per reason/product/location
+    events      i64 quantity change, u32 reason, u32 product, u32 location,
+                f64 occurred_at, u16 adjustment id length, by time bucket
+    ids         UTF-8 adjustment ids, concatenated in event order
+    trailer     u32 crc32 of everything before it
+
+Fixed-width rows let a load unpack every event in one pass over the file
+and share one string object per symbol.
+"""
+from __future__ import annotations
+
+import math
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ._validation import require_optional_id, require_optional_time
+from .eventstore import EventStore
+from .events import StockAdjusted
+
+AUDIT_MAGIC = b"INVAUD1\n"
+DEFAULT_BUCKET_SECONDS = 3600.0
+
+_HEADER = struct.Struct("<QdII")
+_SYMBOL_LENGTH = struct.Struct("<H")
+_ROW = struct.Struct("<qIIIdH")
+_TRAILER = struct.Struct("<I")
+_SETTERS = tuple(
+    getattr(StockAdjusted, name).__set__
+    for name in ("adjustment_id", "quantity_change", "reason", "product_id", "location_id", "occurred_at")
+)
+
+# (reason, location_id, bucket); None in either position matches any value.
+_BucketKey = Tuple[Optional[str], Optional[str], int]
+
+
+@dataclass(frozen=True, slots=True)
+class AdjustmentAuditQuery:
+    """
+    Query for stock adjustments, filtered by any combination of fields.
+
+    Expected Fields:
+        reason: (optional) Reason the adjustments were recorded under
+        location_id: (optional) Location the adjustments were made at
+        start: (optional) POSIX timestamp; only adjustments at or after it
+        end: (optional) POSIX timestamp; only adjustments before it
+    """
+
+    reason: Optional[str] = None
+    location_id: Optional[str] = None
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+    def __post_init__(self):
+        require_optional_id("reason", self.reason)
+        require_optional_id("location_id", self.location_id)
+        require_optional_time("start", self.start)
+        require_optional_time("end", self.end)
+
+
+class AdjustmentAuditIndex:
+    """
+    Secondary index of the StockAdjusted events in an event store.
+
+    With a path, the index is loaded from that sidecar file if it exists and
+    was written with the same bucket size; otherwise it is rebuilt from the
+    log. query() refreshes the index first, so results cover every event
+    appended before the call.
+    """
+
+    def __init__(
+        self,
+        store: EventStore,
+        path: Optional[Union[str, Path]] = None,
+        bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+    ):
+        if bucket_seconds <= 0:
+            raise ValueError(f"bucket_seconds must be positive, got {bucket_seconds}")
+        self.store = store
+        self.path = None if path is None else Path(path)
+        self.bucket_seconds = bucket_seconds
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._buckets: Dict[_BucketKey, List[StockAdjusted]] = {}
+        self._first_bucket = math.inf
+        self._last_bucket = -math.inf
+        if self.path is not None and self.path.exists():
+            self._load()
+        self.refresh()
+
+    @property
+    def offset(self) -> int:
+        """Event store offset the index covers: every event before it is indexed."""
+        return self._offset
+
+    def refresh(self) -> int:
+        """Index the adjustments appended since the last refresh; return how many."""
+        with self._lock:
+            end = self.store.next_offset
+            added = 0
+            for event in self.store.replay(self._offset, end, types=(StockAdjusted,)):
+                self._add(event)
+                added += 1
+            self._offset = end
+            return added
+
+    def query(self, query: AdjustmentAuditQuery) -> List[StockAdjusted]:
+        """Return the matching adjustments, ordered by time bucket, then log order."""
+        self.refresh()
+        width = self.bucket_seconds
+        start = -math.inf if query.start is None else query.start
+        end = math.inf if query.end is None else query.end
+        with self._lock:
+            first, last = self._first_bucket, self._last_bucket
+            if query.start is not None:
+                first = max(first, math.floor(start / width))
+            if query.end is not None:
+                last = min(last, math.floor(end / width))
+            if first > last:
+                return []
+            buckets = self._buckets
+            matches: List[StockAdjusted] = []
+            for bucket in range(int(first), int(last) + 1):
+                events = buckets.get((query.reason, query.location_id, bucket))
+                if not events:
+                    continue
+                if start <= bucket * width and (bucket + 1) * width <= end:
+                    matches.extend(events)
+                else:
+                    matches.extend(event for event in events if start <= event.occurred_at < end)
+            return matches
+
+    def save(self) -> Path:
+        """Write the index to its sidecar file, atomically replacing the old one."""
+        if self.path is None:
+            raise ValueError("AdjustmentAuditIndex was created without a path")
+        with self._lock:
+            events = [
+                event
+                for (reason, location_id, _), indexed in sorted(
+                    self._buckets.items(), key=lambda item: item[0][2]
+                )
+                if reason is None and location_id is None
+                for event in indexed
+            ]
+            offset = self._offset
+        symbols: Dict[str, int] = {}
+        rows = []
+        ids = []
+        for event in events:
+            raw_id = event.adjustment_id.encode("utf-8")
+            ids.append(raw_id)
+            rows.append(_ROW.pack(
+                event.quantity_change,
+                symbols.setdefault(event.reason, len(symbols)),
+                symbols.setdefault(event.product_id, len(symbols)),
+                symbols.setdefault(event.location_id, len(symbols)),
+                event.occurred_at,
+                len(raw_id),
+            ))
+        parts = [AUDIT_MAGIC, _HEADER.pack(offset, self.bucket_seconds, len(symbols), len(rows))]
+        for symbol in symbols:
+            raw = symbol.encode("utf-8")
+            parts += [_SYMBOL_LENGTH.pack(len(raw)), raw]
+        data = b"".join(parts + rows + ids)
+        data += _TRAILER.pack(zlib.crc32(data))
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.path)
+        return self.path
+
+    def _add(self, event: StockAdjusted) -> None:
+        bucket = math.floor(event.occurred_at / self.bucket_seconds)
+        buckets = self._buckets
+        for key in (
+            (event.reason, event.location_id, bucket),
+            (event.reason, None, bucket),
+            (None, event.location_id, bucket),
+            (None, None, bucket),
+        ):
+            indexed = buckets.get(key)
+            if indexed is None:
+                buckets[key] = [event]
+            else:
+                indexed.append(event)
+        if bucket < self._first_bucket:
+            self._first_bucket = bucket
+        if bucket > self._last_bucket:
+            self._last_bucket = bucket
+
+    def _load(self) -> None:
+        """Load the sidecar file, leaving the index empty if it is unusable."""
+        data = self.path.read_bytes()
+        body = len(data) - _TRAILER.size
+        if (
+            not data.startswith(AUDIT_MAGIC)
+            or body < len(AUDIT_MAGIC) + _HEADER.size
+            or _TRAILER.unpack_from(data, body)[0] != zlib.crc32(memoryview(data)[:body])
+        ):
+            return
+        offset, bucket_seconds, symbol_count, count = _HEADER.unpack_from(data, len(AUDIT_MAGIC))
+        if bucket_seconds != self.bucket_seconds or offset > self.store.next_offset:
+            return
+        pos = len(AUDIT_MAGIC) + _HEADER.size
+        symbols = []
+        for _ in range(symbol_count):
+            (length,) = _SYMBOL_LENGTH.unpack_from(data, pos)
+            pos += _SYMBOL_LENGTH.size
+            symbols.append(data[pos:pos + length].decode("utf-8"))
+            pos += length
+        rows_end = pos + count * _ROW.size
+        id_pos = rows_end
+        for change, reason, product, location, occurred_at, id_length in _ROW.iter_unpack(data[pos:rows_end]):
+            event = object.__new__(StockAdjusted)
+            values = (
+                data[id_pos:id_pos + id_length].decode("utf-8"),
+                change,
+                symbols[reason],
+                symbols[product],
+                symbols[location],
+                occurred_at,
+            )
+            for set_value, value in zip(_SETTERS, values):
+                set_value(event, value)
+            id_pos += id_length
+            self._add(event)
+        self._offset = offset
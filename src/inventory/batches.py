@@ -0,0 +1,158 @@
+"""
+Inventory Batches
+
+This module tracks the unallocated quantity of each batch of one product at
+one location, ordered first-expired-first-out (FEFO).
+
+Batches sit in a min-heap keyed by expiration time, so the batch to consume
+next is always at the top. Allocating a reservation takes from the top
+batch and pops it once it is exhausted, touching only the k batches it
+draws from: O(k log n) for n batches, with no sorting per reservation.
+Stock received without a batch_id is kept as one unbatched pool that sorts
+after every batch, as do batches with no expiration time.
+
+A batch is forgotten once it has no stock left and no open reservation
+holds an allocation from it, so the index grows with live stock rather
+than with every batch ever received.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# (batch_id, quantity) pairs; batch_id None is the unbatched pool.
+Allocation = Tuple[Tuple[Optional[str], int], ...]
+
+# Heap entries are (expiration time, pool flag, batch id). The flag sorts the
+# unbatched pool after batches expiring at the same time and keeps None out
+# of comparisons between batch ids.
+_Entry = Tuple[float, int, str]
+_UNBATCHED = ""
+
+
+class BatchIndex:
+    """Unallocated quantity per batch for one stock key, in FEFO order."""
+
+    __slots__ = ("_quantities", "_expiry", "_held", "_heap")
+
+    def __init__(self):
+        self._quantities: Dict[str, int] = {}
+        # Holds exactly the batches with stock or open allocations.
+        self._expiry: Dict[str, float] = {}
+        # Number of open allocations drawing on each batch.
+        self._held: Dict[str, int] = {}
+        # Holds exactly the batches with a positive quantity.
+        self._heap: List[_Entry] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def copy(self) -> "BatchIndex":
+        index = BatchIndex()
+        index._quantities = dict(self._quantities)
+        index._expiry = dict(self._expiry)
+        index._held = dict(self._held)
+        index._heap = list(self._heap)
+        return index
+
+    def quantity(self, batch_id: Optional[str]) -> int:
+        """Unallocated quantity of a batch (None for the unbatched pool)."""
+        return self._quantities.get(_UNBATCHED if batch_id is None else batch_id, 0)
+
+    def expiration_time(self, batch_id: Optional[str]) -> Optional[float]:
+        """Expiration time recorded for a batch, or None if it has none."""
+        expires = self._expiry.get(_UNBATCHED if batch_id is None else batch_id, math.inf)
+        return None if math.isinf(expires) else expires
+
+    def batches(self) -> Iterator[Tuple[Optional[str], Optional[float], int]]:
+        """Iterate (batch_id, expiration_time, quantity) for batches with stock left."""
+        for expires, _, batch in sorted(self._heap):
+            yield (
+                None if batch == _UNBATCHED else batch,
+                None if math.isinf(expires) else expires,
+                self._quantities[batch],
+            )
+
+    def add(self, batch_id: Optional[str], quantity: int, expiration_time: Optional[float] = None) -> None:
+        """
+        Add stock to a batch. A batch keeps the expiration time it was first
+        seen with for as long as it is tracked; adding 0 only records that
+        expiration time.
+        """
+        batch = _UNBATCHED if batch_id is None else batch_id
+        if batch not in self._expiry:
+            self._expiry[batch] = math.inf if expiration_time is None else expiration_time
+        self._credit(batch, quantity)
+
+    def allocate(self, quantity: int) -> Allocation:
+        """
+        Take quantity from the earliest-expiring batches for a reservation
+        and return what came from each. The batches stay tracked until the
+        allocation is restored or dispatched.
+        """
+        return self._take(quantity, True)
+
+    def remove(self, quantity: int) -> None:
+        """Take quantity from the earliest-expiring batches for good (shrinkage)."""
+        self._take(quantity, False)
+
+    def hold(self, allocation: Allocation) -> None:
+        """Record an allocation as open, e.g. one restored from a snapshot."""
+        held = self._held
+        for batch_id, _ in allocation:
+            batch = _UNBATCHED if batch_id is None else batch_id
+            held[batch] = held.get(batch, 0) + 1
+
+    def restore(self, allocation: Allocation) -> None:
+        """Return a previous allocation to its batches."""
+        for batch_id, quantity in allocation:
+            self._credit(_UNBATCHED if batch_id is None else batch_id, quantity)
+        self.dispatch(allocation)
+
+    def dispatch(self, allocation: Allocation) -> None:
+        """Close an allocation whose stock has left, forgetting spent batches."""
+        held = self._held
+        for batch_id, _ in allocation:
+            batch = _UNBATCHED if batch_id is None else batch_id
+            count = held.get(batch, 0) - 1
+            if count > 0:
+                held[batch] = count
+                continue
+            held.pop(batch, None)
+            if batch not in self._quantities:
+                self._expiry.pop(batch, None)
+
+    def _take(self, quantity: int, hold: bool) -> Allocation:
+        heap = self._heap
+        quantities = self._quantities
+        held = self._held
+        taken = []
+        while quantity > 0:
+            if not heap:
+                raise ValueError("Batch index holds less stock than requested")
+            _, _, batch = heap[0]
+            if hold:
+                held[batch] = held.get(batch, 0) + 1
+            stock = quantities[batch]
+            take = stock if stock < quantity else quantity
+            stock -= take
+            quantity -= take
+            if stock:
+                quantities[batch] = stock
+            else:
+                del quantities[batch]
+                heapq.heappop(heap)
+                if batch not in held:
+                    del self._expiry[batch]
+            taken.append((None if batch == _UNBATCHED else batch, take))
+        return tuple(taken)
+
+    def _credit(self, batch: str, quantity: int) -> None:
+        if quantity <= 0:
+            return
+        held = self._quantities.get(batch, 0)
+        if not held:
+            expires = self._expiry.setdefault(batch, math.inf)
+            heapq.heappush(self._heap, (expires, 1 if batch == _UNBATCHED else 0, batch))
+        self._quantities[batch] = held + quantity
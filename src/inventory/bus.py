@@ -0,0 +1,271 @@
+"""
+Inventory Event Bus
+
+This module delivers domain events to in-process subscribers on an asyncio
+event loop.
+
+Subscriptions are registered per event type, and publishing looks up each
+event's subscribers in a dispatch table keyed by type. Every subscription
+has its own bounded queue and consumer task, so one slow subscriber never
+holds up another or the publisher. When a queue is full, a non-blocking
+publish drops the surplus and counts it on the subscription. An awaited
+publish to a subscription created with block=True waits for room instead.
+
+Publishers hand over whole event batches, and queues hold batches rather than
+single events, so queue overhead is paid once per batch per subscriber.
+
+Given a MetricsRegistry, the bus exposes its queue depths as gauges and its
+delivered, dropped and failed events as counters. They are read from the
+subscriptions when a snapshot is taken, so publishing and delivery do no
+extra work for them. The counters are cumulative over the bus's lifetime:
+unsubscribe() folds a subscription's counts into totals kept by the bus.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from .metrics import MetricsRegistry
+
+Subscriber = Callable[[object], Union[None, Awaitable[None]]]
+
+DEFAULT_MAX_PENDING = 10_000
+
+# Subscription counters the bus keeps running totals of.
+_COUNTED = ("delivered", "dropped", "errors")
+
+
+class Subscription:
+    """
+    One subscriber's queue, consumer task and delivery counters.
+
+    pending counts events queued but not yet handled, and is bounded by
+    maxsize. delivered, dropped and errors count events since subscribing.
+    """
+
+    def __init__(self, handler: Subscriber, maxsize: int, block: bool):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.handler = handler
+        self.maxsize = maxsize
+        self.block = block
+        self.pending = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._is_async = inspect.iscoroutinefunction(handler)
+        self._queue: "asyncio.Queue[List[object]]" = asyncio.Queue()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._task = asyncio.get_running_loop().create_task(self._consume())
+
+    def offer(self, events: List[object]) -> None:
+        """Queue as many events as fit without waiting; drop and count the rest."""
+        room = self.maxsize - self.pending
+        if room < len(events):
+            self.dropped += len(events) - max(room, 0)
+            if room <= 0:
+                return
+            events = events[:room]
+        self._enqueue(events)
+
+    async def put(self, events: List[object]) -> None:
+        """Queue events, waiting for the consumer to make room if needed."""
+        # A batch larger than maxsize is let in once the queue is empty.
+        while self.pending and self.pending + len(events) > self.maxsize:
+            self._space.clear()
+            await self._space.wait()
+        self._enqueue(events)
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+    def _enqueue(self, events: List[object]) -> None:
+        self.pending += len(events)
+        self._queue.put_nowait(events)
+
+    async def _consume(self) -> None:
+        queue = self._queue
+        handler = self.handler
+        while True:
+            events = await queue.get()
+            for event in events:
+                try:
+                    if self._is_async:
+                        await handler(event)
+                    else:
+                        handler(event)
+                except Exception as exc:
+                    self.errors += 1
+                    self.last_error = exc
+            self.pending -= len(events)
+            self.delivered += len(events)
+            self._space.set()
+            queue.task_done()
+
+
+class EventBus:
+    """
+    Typed publish/subscribe over asyncio with bounded per-subscriber queues.
+
+    Create subscriptions from code running on the bus's event loop. The
+    command handler, which may run on other threads, publishes through
+    listener().
+    """
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self._routes: Dict[type, List[Subscription]] = {}
+        self._wildcard: List[Subscription] = []
+        self._subscriptions: List[Subscription] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        # Guards moving a subscription's counts into _retired against metric
+        # reads from other threads.
+        self._lock = threading.Lock()
+        self._retired = dict.fromkeys(_COUNTED, 0)
+        if metrics is not None:
+            self._register_metrics(metrics)
+
+    @property
+    def subscriptions(self) -> Sequence[Subscription]:
+        return tuple(self._subscriptions)
+
+    def subscribe(
+        self,
+        handler: Subscriber,
+        *event_types: type,
+        maxsize: int = DEFAULT_MAX_PENDING,
+        block: bool = False,
+    ) -> Subscription:
+        """
+        Deliver events of the given types (all events if none are given) to
+        handler, a plain or async callable taking one event.
+        """
+        self._capture_loop()
+        subscription = Subscription(handler, maxsize, block)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        if not event_types:
+            self._wildcard.append(subscription)
+        for event_type in event_types:
+            self._routes.setdefault(event_type, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering to a subscription; events already queued are discarded."""
+        subscription.cancel()
+        with self._lock:
+            self._subscriptions.remove(subscription)
+            for name in _COUNTED:
+                self._retired[name] += getattr(subscription, name)
+        if subscription in self._wildcard:
+            self._wildcard.remove(subscription)
+        for subscriptions in self._routes.values():
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def publish_nowait(self, events: Sequence[object]) -> None:
+        """Queue events for their subscribers without waiting; full queues drop."""
+        for subscription, batch in self._fan_out(events):
+            subscription.offer(batch)
+
+    async def publish(self, events: Sequence[object]) -> None:
+        """Queue events, waiting on full queues of block=True subscriptions."""
+        for subscription, batch in self._fan_out(events):
+            if subscription.block:
+                await subscription.put(batch)
+            else:
+                subscription.offer(batch)
+
+    def listener(self) -> Callable[[Sequence[object]], None]:
+        """
+        Return a command handler listener that publishes into this bus.
+
+        It never blocks the command path: from threads other than the one
+        running the bus's loop it schedules a non-blocking publish on the
+        loop. It may be created on any thread once the bus has a
+        subscription, and otherwise must be created on the loop.
+        """
+        if self._loop is None:
+            self._capture_loop()
+        loop = self._loop
+        loop_thread = self._loop_thread
+
+        def publish(events: Sequence[object]) -> None:
+            if threading.get_ident() == loop_thread:
+                self.publish_nowait(events)
+            else:
+                loop.call_soon_threadsafe(self.publish_nowait, list(events))
+
+        return publish
+
+    def total(self, counter: str) -> int:
+        """
+        Events delivered, dropped or failed ("delivered", "dropped", "errors")
+        over every subscription the bus has had, current or removed.
+        """
+        with self._lock:
+            return self._retired[counter] + sum(
+                getattr(subscription, counter) for subscription in self._subscriptions
+            )
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been handled."""
+        for subscription in list(self._subscriptions):
+            await subscription.join()
+
+    async def close(self) -> None:
+        """Drain the queues, then stop every consumer task."""
+        await self.drain()
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+
+    def _capture_loop(self) -> None:
+        # Called on the loop, so the current thread is the one running it.
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+
+    def _register_metrics(self, metrics: MetricsRegistry) -> None:
+        metrics.gauge("inventory_bus_subscriptions", "Event bus subscriptions.", lambda: len(self._subscriptions))
+        metrics.gauge(
+            "inventory_bus_pending_events",
+            "Events queued for subscribers, not yet handled.",
+            lambda: sum(subscription.pending for subscription in self.subscriptions),
+        )
+        metrics.gauge(
+            "inventory_bus_max_pending_events",
+            "Events queued for the subscriber with the deepest queue.",
+            lambda: max((subscription.pending for subscription in self.subscriptions), default=0),
+        )
+        metrics.observed_counter(
+            "inventory_bus_delivered_events_total", "Events handled by subscribers.", lambda: self.total("delivered")
+        )
+        metrics.observed_counter(
+            "inventory_bus_dropped_events_total",
+            "Events dropped on full subscriber queues.",
+            lambda: self.total("dropped"),
+        )
+        metrics.observed_counter(
+            "inventory_bus_handler_errors_total", "Events whose subscriber raised.", lambda: self.total("errors")
+        )
+
+    def _fan_out(self, events: Sequence[object]) -> List[tuple]:
+        routes = self._routes
+        batches: Dict[int, tuple] = {}
+        for event in events:
+            for subscription in routes.get(type(event), ()):
+                entry = batches.get(id(subscription))
+                if entry is None:
+                    entry = batches[id(subscription)] = (subscription, [])
+                entry[1].append(event)
+        fanned = list(batches.values())
+        if self._wildcard:
+            everything = list(events)
+            fanned.extend((subscription, everything) for subscription in self._wildcard)
+        return fanned
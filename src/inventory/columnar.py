@@ -0,0 +1,179 @@
+"""
+Inventory Columnar Stock Positions
+
+This module keeps every stock position in column form, for replenishment
+runs and analytics that read all SKU-locations at once.
+
+ColumnarStockProjection is a command handler listener. Each stock key owns a
+row in four contiguous int64 columns (product index, location index, on
+hand, reserved), and product and location identifiers are interned to
+integer indexes, so applying an event updates two array slots in place and
+the table never has to be rebuilt from Python objects. snapshot() copies the
+columns into NumPy arrays with one memcpy each; aggregations such as totals
+per location then run as vectorized NumPy operations over those arrays.
+
+NumPy is an optional dependency. The projection itself is maintained with the
+standard library array module, and only snapshot() needs NumPy installed.
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from .events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+from .ledger import StockKey, StockLedger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (on_hand delta, reserved delta) per event type.
+_DELTAS: Dict[type, Callable[[object], Tuple[int, int]]] = {
+    StockReceived: lambda event: (event.quantity, 0),
+    StockReserved: lambda event: (0, event.quantity),
+    ReservationReleased: lambda event: (0, -event.quantity),
+    StockDispatched: lambda event: (-event.quantity, -event.quantity),
+    StockAdjusted: lambda event: (event.quantity_change, 0),
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Columnar stock snapshots require numpy (pip install numpy)")
+
+
+@dataclass(frozen=True, slots=True)
+class StockColumns:
+    """
+    Point-in-time stock positions as parallel NumPy arrays, one row per key.
+
+    Expected Fields:
+        product_index: int64 index into product_ids for each row
+        location_index: int64 index into location_ids for each row
+        on_hand: int64 on-hand quantity for each row
+        reserved: int64 reserved quantity for each row
+        available: int64 on_hand - reserved for each row
+        product_ids: Product identifier for each product index
+        location_ids: Location identifier for each location index
+    """
+
+    product_index: "np.ndarray"
+    location_index: "np.ndarray"
+    on_hand: "np.ndarray"
+    reserved: "np.ndarray"
+    available: "np.ndarray"
+    product_ids: Tuple[str, ...]
+    location_ids: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.product_index)
+
+    def totals_by_location(self, column: str = "available") -> "np.ndarray":
+        """Sum a quantity column per location, indexed like location_ids."""
+        return self._totals(self.location_index, len(self.location_ids), column)
+
+    def totals_by_product(self, column: str = "available") -> "np.ndarray":
+        """Sum a quantity column per product, indexed like product_ids."""
+        return self._totals(self.product_index, len(self.product_ids), column)
+
+    def _totals(self, index: "np.ndarray", size: int, column: str) -> "np.ndarray":
+        # bincount sums in float64, which is exact for totals below 2**53.
+        return np.bincount(index, weights=getattr(self, column), minlength=size).astype(np.int64)
+
+
+class ColumnarStockProjection:
+    """
+    Read model of on-hand and reserved stock per key, stored column-wise.
+
+    Register it as a command handler listener, or seed it from a recovered
+    ledger with from_ledger() and register it afterwards. Updates and
+    snapshots are serialized by a lock. Rows are never removed, so a key
+    that sells out keeps its row with zero quantities.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[StockKey, int] = {}
+        self._products: Dict[str, int] = {}
+        self._locations: Dict[str, int] = {}
+        self._product_ids: List[str] = []
+        self._location_ids: List[str] = []
+        self._product_index = array("q")
+        self._location_index = array("q")
+        self._on_hand = array("q")
+        self._reserved = array("q")
+
+    @classmethod
+    def from_ledger(cls, ledger: StockLedger) -> "ColumnarStockProjection":
+        """Build a projection matching the ledger's current stock levels."""
+        projection = cls()
+        for key, level in ledger.levels():
+            row = projection._row(key)
+            projection._on_hand[row] = level.on_hand
+            projection._reserved[row] = level.reserved
+        return projection
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __call__(self, events: Sequence[object]) -> None:
+        rows = self._rows
+        on_hand = self._on_hand
+        reserved = self._reserved
+        with self._lock:
+            for event in events:
+                on_hand_delta, reserved_delta = _DELTAS[type(event)](event)
+                key = (event.product_id, event.location_id)
+                row = rows.get(key)
+                if row is None:
+                    row = self._row(key)
+                if on_hand_delta:
+                    on_hand[row] += on_hand_delta
+                if reserved_delta:
+                    reserved[row] += reserved_delta
+
+    def snapshot(self) -> StockColumns:
+        """Copy the current positions into NumPy arrays (requires numpy)."""
+        _require_numpy()
+        with self._lock:
+            product_index = np.frombuffer(self._product_index, dtype=np.int64).copy()
+            location_index = np.frombuffer(self._location_index, dtype=np.int64).copy()
+            on_hand = np.frombuffer(self._on_hand, dtype=np.int64).copy()
+            reserved = np.frombuffer(self._reserved, dtype=np.int64).copy()
+            product_ids = tuple(self._product_ids)
+            location_ids = tuple(self._location_ids)
+        return StockColumns(
+            product_index,
+            location_index,
+            on_hand,
+            reserved,
+            on_hand - reserved,
+            product_ids,
+            location_ids,
+        )
+
+    def _row(self, key: StockKey) -> int:
+        product_id, location_id = key
+        product = self._products.get(product_id)
+        if product is None:
+            product = self._products[product_id] = len(self._product_ids)
+            self._product_ids.append(product_id)
+        location = self._locations.get(location_id)
+        if location is None:
+            location = self._locations[location_id] = len(self._location_ids)
+            self._location_ids.append(location_id)
+        row = self._rows[key] = len(self._rows)
+        self._product_index.append(product)
+        self._location_index.append(location)
+        self._on_hand.append(0)
+        self._reserved.append(0)
+        return row
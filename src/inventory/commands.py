@@ -3,64 +3,187 @@ Inventory Commands
 
 This module defines commands for inventory operations.
 Commands represent intentions to perform actions on inventory state.
+
+Commands are immutable, slotted value types. Constructors validate field
+types and ranges, so a handler can rely on any command it receives being
+well formed and only has to check it against ledger state.
 """
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional, Tuple
 
+from ._validation import (
+    require_id,
+    require_non_zero,
+    require_optional_id,
+    require_optional_time,
+    require_positive,
+)
 
+
+@dataclass(frozen=True, slots=True)
 class AddStockCommand:
     """
     Command to add stock to inventory.
-    
+
     Expected Fields:
         product_id: Identifier for the product
         quantity: Amount of stock to add
         location_id: Storage location identifier
         batch_id: (optional) Batch identifier for tracking
+        expiration_time: (optional) POSIX timestamp the batch expires at
+        idempotency_key: (optional) Caller-chosen key; retries with the same
+            key return the original event instead of adding stock again
         metadata: (optional) Additional metadata
     """
-    pass
 
+    product_id: str
+    quantity: int
+    location_id: str
+    batch_id: Optional[str] = None
+    expiration_time: Optional[float] = None
+    idempotency_key: Optional[str] = None
+    metadata: Optional[Mapping[str, Any]] = field(default=None, compare=False)
 
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_positive("quantity", self.quantity)
+        require_id("location_id", self.location_id)
+        require_optional_id("batch_id", self.batch_id)
+        require_optional_time("expiration_time", self.expiration_time)
+        require_optional_id("idempotency_key", self.idempotency_key)
+
+
+@dataclass(frozen=True, slots=True)
 class ReserveStockCommand:
     """
     Command to reserve stock for an order.
-    
+
     Expected Fields:
         product_id: Identifier for the product
         quantity: Amount of stock to reserve
         reservation_id: Unique identifier for this reservation
-        expiration_time: (optional) When the reservation expires
+        location_id: Storage location the stock is reserved at
+        expiration_time: (optional) POSIX timestamp the reservation expires at
+        idempotency_key: (optional) Caller-chosen key; retries with the same
+            key return the original event instead of failing as duplicates
     """
-    pass
 
+    product_id: str
+    quantity: int
+    reservation_id: str
+    location_id: str
+    expiration_time: Optional[float] = None
+    idempotency_key: Optional[str] = None
+
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_positive("quantity", self.quantity)
+        require_id("reservation_id", self.reservation_id)
+        require_id("location_id", self.location_id)
+        require_optional_time("expiration_time", self.expiration_time)
+        require_optional_id("idempotency_key", self.idempotency_key)
 
+
+@dataclass(frozen=True, slots=True)
 class ReleaseReservationCommand:
     """
     Command to release a reservation and return stock to available inventory.
-    
+
     Expected Fields:
         reservation_id: Identifier of the reservation to release
     """
-    pass
+
+    reservation_id: str
+
+    def __post_init__(self):
+        require_id("reservation_id", self.reservation_id)
 
 
+@dataclass(frozen=True, slots=True)
 class DispatchStockCommand:
     """
     Command to dispatch reserved stock.
-    
+
     Expected Fields:
         reservation_id: Reservation identifier tag
         destination: Final destination field for the dispatch
     """
-    pass
+
+    reservation_id: str
+    destination: str
+
+    def __post_init__(self):
+        require_id("reservation_id", self.reservation_id)
+        require_id("destination", self.destination)
 
 
+@dataclass(frozen=True, slots=True)
 class AdjustStockCommand:
     """
     Command to adjust stock levels manually or automatically.
-    
+
     Expected Fields:
-        stock_id: Identifier for the stock being adjusted
+        stock_id: Identifier for the stock being adjusted, i.e. the
+            (product_id, location_id) pair
         quantity_change: Amount to change (positive or negative)
         reason_code: Code indicating the reason for adjustment
     """
-    pass
+
+    stock_id: Tuple[str, str]
+    quantity_change: int
+    reason_code: str
+
+    def __post_init__(self):
+        if not isinstance(self.stock_id, tuple) or len(self.stock_id) != 2:
+            raise ValueError(
+                f"stock_id must be a (product_id, location_id) tuple, got {self.stock_id!r}"
+            )
+        require_id("stock_id.product_id", self.stock_id[0])
+        require_id("stock_id.location_id", self.stock_id[1])
+        require_non_zero("quantity_change", self.quantity_change)
+        require_id("reason_code", self.reason_code)
+
+
+@dataclass(frozen=True, slots=True)
+class AllocateStockCommand:
+    """
+    Command to reserve stock from whichever candidate locations cost least.
+
+    Handled by a ReservationAllocator rather than the command handler itself:
+    it turns the command into one ReserveStockCommand per location used.
+
+    Expected Fields:
+        product_id: Identifier for the product
+        quantity: Amount of stock to reserve
+        reservation_id: Unique identifier for this reservation; a split
+            reservation is recorded as one reservation per location, named
+            "<reservation_id>@<location_id>"
+        location_costs: (location_id, cost) pairs naming the candidate
+            locations, e.g. by distance to the customer; lower costs win
+        split: (optional) Whether the quantity may be spread over several
+            locations when no single candidate holds all of it
+        expiration_time: (optional) POSIX timestamp the reservation expires at
+    """
+
+    product_id: str
+    quantity: int
+    reservation_id: str
+    location_costs: Tuple[Tuple[str, float], ...]
+    split: bool = False
+    expiration_time: Optional[float] = None
+
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_positive("quantity", self.quantity)
+        require_id("reservation_id", self.reservation_id)
+        if not self.location_costs:
+            raise ValueError("location_costs must name at least one location")
+        for location_id, cost in self.location_costs:
+            require_id("location_costs.location_id", location_id)
+            if not isinstance(cost, (int, float)) or isinstance(cost, bool):
+                raise TypeError(f"location cost must be a number, got {cost!r}")
+        if len({location_id for location_id, _ in self.location_costs}) != len(self.location_costs):
+            raise ValueError("location_costs names a location more than once")
+        require_optional_time("expiration_time", self.expiration_time)
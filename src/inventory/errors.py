@@ -0,0 +1,38 @@
+"""
+Inventory Errors
+
+This module defines the exceptions raised when a command cannot be
+applied to inventory state, or a query cannot be answered.
+"""
+
+
+class InventoryError(Exception):
+    """Base class for inventory command failures."""
+
+
+class UnsupportedCommandError(InventoryError, TypeError):
+    """Raised when a handler receives an object it has no route for."""
+
+
+class UnsupportedQueryError(InventoryError, TypeError):
+    """Raised when a query handler receives an object it has no route for."""
+
+
+class ConcurrencyConflictError(InventoryError):
+    """Raised when a command keeps losing the race for the stock it validated against."""
+
+
+class InsufficientStockError(InventoryError):
+    """Raised when a command would take stock below what is available."""
+
+
+class UnknownReservationError(InventoryError):
+    """Raised when a command references a reservation that is not open."""
+
+
+class DuplicateReservationError(InventoryError):
+    """Raised when a reservation identifier is already in use."""
+
+
+class IdempotencyKeyReuseError(InventoryError):
+    """Raised when an idempotency key is reused for a different command."""
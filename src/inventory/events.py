@@ -3,61 +3,217 @@ Inventory Domain Events
 
 This module defines domain events that are fired when significant
 state changes occur in the inventory domain.
+
+Events carry the stock coordinates (product and location) they touch so
+that the ledger and any projection can apply them without looking up
+other state. They are immutable, slotted value types: replay keeps millions
+of them in memory, so instances carry no per-object __dict__.
 """
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
 
+from ._validation import (
+    require_id,
+    require_int,
+    require_non_zero,
+    require_optional_id,
+    require_optional_time,
+    require_positive,
+)
 
+
+@dataclass(frozen=True, slots=True)
 class StockReceived:
     """
     Fires when new stock is received.
-    
+
     Expected Fields:
         product_id: Identifier for the product
         quantity: Amount of stock received
         location_id: Storage location identifier
+        batch_id: (optional) Batch the stock was received under
+        expiration_time: (optional) POSIX timestamp the batch expires at
+        idempotency_key: (optional) Key of the command that received the stock
+        occurred_at: POSIX timestamp of the state change
     """
-    pass
 
+    product_id: str
+    quantity: int
+    location_id: str
+    batch_id: Optional[str] = None
+    expiration_time: Optional[float] = None
+    idempotency_key: Optional[str] = None
+    occurred_at: float = field(default_factory=time.time)
 
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_positive("quantity", self.quantity)
+        require_id("location_id", self.location_id)
+        require_optional_id("batch_id", self.batch_id)
+        require_optional_time("expiration_time", self.expiration_time)
+        require_optional_id("idempotency_key", self.idempotency_key)
+
+
+@dataclass(frozen=True, slots=True)
 class StockReserved:
     """
     Fires when stock is reserved for an order.
-    
+
     Expected Fields:
         product_id: Identifier for the product
         quantity: Amount of stock reserved
         reservation_id: Unique identifier for this reservation
+        location_id: Storage location the stock is held at
+        expiration_time: (optional) POSIX timestamp the reservation lapses at
+        idempotency_key: (optional) Key of the command that made the reservation
+        occurred_at: POSIX timestamp of the state change
     """
-    pass
 
+    product_id: str
+    quantity: int
+    reservation_id: str
+    location_id: str
+    expiration_time: Optional[float] = None
+    idempotency_key: Optional[str] = None
+    occurred_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_positive("quantity", self.quantity)
+        require_id("reservation_id", self.reservation_id)
+        require_id("location_id", self.location_id)
+        require_optional_time("expiration_time", self.expiration_time)
+        require_optional_id("idempotency_key", self.idempotency_key)
 
+
+@dataclass(frozen=True, slots=True)
 class ReservationReleased:
     """
     Fires when a reservation is canceled, making stock available.
-    
+
     Expected Fields:
         reservation_id: Identifier of the reservation being released
+        product_id: Product the reservation held
+        location_id: Location the reservation held stock at
+        quantity: Amount of stock returned to available inventory
+        occurred_at: POSIX timestamp of the state change
     """
-    pass
+
+    reservation_id: str
+    product_id: str
+    location_id: str
+    quantity: int
+    occurred_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        require_id("reservation_id", self.reservation_id)
+        require_id("product_id", self.product_id)
+        require_id("location_id", self.location_id)
+        require_positive("quantity", self.quantity)
 
 
+@dataclass(frozen=True, slots=True)
 class StockDispatched:
     """
     Fires when reserved stock is dispatched for use/delivery.
-    
+
     Expected Fields:
         dispatch_id: Unique identifier for this dispatch
         reservation_id: Associated reservation identifier
+        product_id: Product that left the location
+        location_id: Location the stock was dispatched from
+        quantity: Amount of stock dispatched
+        destination: Final destination of the dispatch
+        occurred_at: POSIX timestamp of the state change
     """
-    pass
+
+    dispatch_id: str
+    reservation_id: str
+    product_id: str
+    location_id: str
+    quantity: int
+    destination: str
+    occurred_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        require_id("dispatch_id", self.dispatch_id)
+        require_id("reservation_id", self.reservation_id)
+        require_id("product_id", self.product_id)
+        require_id("location_id", self.location_id)
+        require_positive("quantity", self.quantity)
+        require_id("destination", self.destination)
 
 
+@dataclass(frozen=True, slots=True)
 class StockAdjusted:
     """
     Fires when manual/automated stock correction occurs.
-    
+
     Expected Fields:
         adjustment_id: Unique identifier for this adjustment
         quantity_change: Amount of stock change (positive or negative)
         reason: Explanation for the adjustment
+        product_id: Product that was adjusted
+        location_id: Location that was adjusted
+        occurred_at: POSIX timestamp of the state change
+    """
+
+    adjustment_id: str
+    quantity_change: int
+    reason: str
+    product_id: str
+    location_id: str
+    occurred_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        require_id("adjustment_id", self.adjustment_id)
+        require_non_zero("quantity_change", self.quantity_change)
+        require_id("reason", self.reason)
+        require_id("product_id", self.product_id)
+        require_id("location_id", self.location_id)
+
+
+# Change in available stock (on hand minus reserved) per stock event type,
+# shared by the projections that track availability from the event stream.
+AVAILABLE_DELTAS: Dict[type, Callable[[object], int]] = {
+    StockReceived: lambda event: event.quantity,
+    StockReserved: lambda event: -event.quantity,
+    ReservationReleased: lambda event: event.quantity,
+    # Dispatch takes stock that was already reserved, so available stock is
+    # unchanged.
+    StockDispatched: lambda event: 0,
+    StockAdjusted: lambda event: event.quantity_change,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class LowStockWarning:
     """
-    pass
+    Fires when available stock falls to or below its reorder point.
+
+    This is an outbound signal for other subsystems, derived from the stock
+    events above; the ledger never applies it and it is not stored in the
+    event log.
+
+    Expected Fields:
+        product_id: Product that is running low
+        location_id: Location the stock is held at
+        available: Available quantity after the event that crossed the threshold
+        reorder_point: Threshold that was crossed
+        occurred_at: POSIX timestamp of the crossing
+    """
+
+    product_id: str
+    location_id: str
+    available: int
+    reorder_point: int
+    occurred_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_id("location_id", self.location_id)
+        require_int("available", self.available)
+        require_int("reorder_point", self.reorder_point)
@@ -0,0 +1,586 @@
+"""
+Inventory Event Store
+
+This module provides a durable, append-only log of inventory domain events.
+
+Events are written as length-prefixed binary records into segment files that
+are only ever appended to. A segment is named after the offset (sequence
+number) of its first event and is rolled over once it reaches a size limit.
+Replay maps each segment with mmap and decodes records straight out of the
+mapping, so reading the log costs no file syscalls per record.
+
+Record layout (little endian):
+    u32 length    size of tag + body
+    u32 crc32     checksum of tag + body
+    u8  tag       event type, or 0 for a symbol definition
+    fixed         every field in declaration order: int64/float64 values,
+                  u16 byte lengths for inline strings and u32 symbol indexes
+    strings       UTF-8 bytes of the inline string fields, in order
+
+Low-cardinality strings (product, location, reason, destination, batch) are
+stored once per segment as symbol definition records and referenced by index
+afterwards. Replay therefore resolves them with a list lookup instead of a
+UTF-8 decode, and replayed events share one string object per symbol.
+
+A record whose length or checksum does not match (a torn write at the tail of
+the last segment) marks the end of the log; it is truncated on open. A small
+JSON index written next to the active segment on close/flush lets open resume
+that check from the last known-good position instead of walking the segment.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import (
+    Collection,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+
+SEGMENT_MAGIC = b"INVEVT5\n"
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+_HEADER = struct.Struct("<II")
+_SYMBOL_TAG = 0
+_SYMBOL_TAG_BYTE = bytes((_SYMBOL_TAG,))
+_NONE_STR = 0xFFFF
+_NONE_SYMBOL = 0xFFFFFFFF
+_TAIL_VERIFY_BYTES = 1024 * 1024
+_CHECKPOINT_EVENTS = 1024
+
+# Field kinds. "str" is stored inline; "sym" goes through the segment symbol
+# table. The "opt_" variants allow None; an absent float is stored as NaN.
+_INLINE_KINDS = ("str", "opt_str")
+_SYMBOL_KINDS = ("sym", "opt_sym")
+_FIXED_FORMATS = {
+    "int": "q", "float": "d", "opt_float": "d",
+    "str": "H", "opt_str": "H", "sym": "I", "opt_sym": "I",
+}
+_NAN = float("nan")
+
+# Tags are part of the on-disk format: never renumber, only append.
+_EVENT_SCHEMAS: Dict[type, Tuple[int, Tuple[Tuple[str, str], ...]]] = {
+    StockReceived: (1, (
+        ("product_id", "sym"),
+        ("quantity", "int"),
+        ("location_id", "sym"),
+        ("batch_id", "opt_sym"),
+        ("expiration_time", "opt_float"),
+        ("idempotency_key", "opt_str"),
+        ("occurred_at", "float"),
+    )),
+    StockReserved: (2, (
+        ("product_id", "sym"),
+        ("quantity", "int"),
+        ("reservation_id", "str"),
+        ("location_id", "sym"),
+        ("expiration_time", "opt_float"),
+        ("idempotency_key", "opt_str"),
+        ("occurred_at", "float"),
+    )),
+    ReservationReleased: (3, (
+        ("reservation_id", "str"),
+        ("product_id", "sym"),
+        ("location_id", "sym"),
+        ("quantity", "int"),
+        ("occurred_at", "float"),
+    )),
+    StockDispatched: (4, (
+        ("dispatch_id", "str"),
+        ("reservation_id", "str"),
+        ("product_id", "sym"),
+        ("location_id", "sym"),
+        ("quantity", "int"),
+        ("destination", "sym"),
+        ("occurred_at", "float"),
+    )),
+    StockAdjusted: (5, (
+        ("adjustment_id", "str"),
+        ("quantity_change", "int"),
+        ("reason", "sym"),
+        ("product_id", "sym"),
+        ("location_id", "sym"),
+        ("occurred_at", "float"),
+    )),
+}
+
+_Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+# (events before it in the segment, byte position, symbols defined before it)
+_Checkpoint = Tuple[int, int, int]
+
+
+class CorruptRecordError(ValueError):
+    """Raised when a record in a sealed segment fails its length or checksum."""
+
+
+def _record(body: bytes) -> bytes:
+    return _HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+class _EventCodec:
+    """Binary encoder/decoder for one event type."""
+
+    __slots__ = (
+        "cls", "tag", "_tag_byte", "_names", "_setters",
+        "_table", "_inline_slots", "_symbol_slots", "_optional_float_slots",
+        "_standalone", "_standalone_slots",
+    )
+
+    def __init__(self, cls: type, tag: int, fields: Tuple[Tuple[str, str], ...]):
+        self.cls = cls
+        self.tag = tag
+        self._tag_byte = bytes((tag,))
+        self._names = tuple(name for name, _ in fields)
+        # Slot descriptors: decoded records were validated when first built,
+        # so events are rebuilt without running __init__/__post_init__ again.
+        self._setters = tuple(getattr(cls, name).__set__ for name in self._names)
+        self._table = struct.Struct("<" + "".join(_FIXED_FORMATS[kind] for _, kind in fields))
+        self._inline_slots = tuple(i for i, (_, kind) in enumerate(fields) if kind in _INLINE_KINDS)
+        self._symbol_slots = tuple(i for i, (_, kind) in enumerate(fields) if kind in _SYMBOL_KINDS)
+        self._optional_float_slots = tuple(i for i, (_, kind) in enumerate(fields) if kind == "opt_float")
+        # Standalone records carry every string inline so they decode on their own.
+        self._standalone = struct.Struct(
+            "<" + "".join("H" if kind in _SYMBOL_KINDS else _FIXED_FORMATS[kind] for _, kind in fields)
+        )
+        self._standalone_slots = tuple(sorted(self._inline_slots + self._symbol_slots))
+
+    def _build(self, values: List[object]) -> object:
+        for i in self._optional_float_slots:
+            if values[i] != values[i]:
+                values[i] = None
+        event = object.__new__(self.cls)
+        for set_value, value in zip(self._setters, values):
+            set_value(event, value)
+        return event
+
+    def encode(self, event: object, symbols: Dict[str, int], out: List[bytes]) -> None:
+        """Append the event record, preceded by any new symbol definitions, to out."""
+        values = [getattr(event, name) for name in self._names]
+        for i in self._symbol_slots:
+            value = values[i]
+            if value is None:
+                values[i] = _NONE_SYMBOL
+                continue
+            index = symbols.get(value)
+            if index is None:
+                index = symbols[value] = len(symbols)
+                out.append(_record(_SYMBOL_TAG_BYTE + value.encode("utf-8")))
+            values[i] = index
+        self._pack_optional_floats(values)
+        strings = self._pack_strings(values, self._inline_slots)
+        out.append(_record(b"".join([self._tag_byte, self._table.pack(*values), *strings])))
+
+    def decode(self, buf: _Buffer, pos: int, symbols: List[str]) -> object:
+        values = list(self._table.unpack_from(buf, pos))
+        pos += self._table.size
+        for i in self._inline_slots:
+            length = values[i]
+            if length == _NONE_STR:
+                values[i] = None
+            else:
+                end = pos + length
+                values[i] = str(buf[pos:end], "utf-8")
+                pos = end
+        for i in self._symbol_slots:
+            index = values[i]
+            values[i] = None if index == _NONE_SYMBOL else symbols[index]
+        return self._build(values)
+
+    def encode_standalone(self, event: object) -> bytes:
+        values = [getattr(event, name) for name in self._names]
+        self._pack_optional_floats(values)
+        strings = self._pack_strings(values, self._standalone_slots)
+        return b"".join([self._tag_byte, self._standalone.pack(*values), *strings])
+
+    def decode_standalone(self, buf: _Buffer, pos: int) -> object:
+        values = list(self._standalone.unpack_from(buf, pos))
+        pos += self._standalone.size
+        for i in self._standalone_slots:
+            length = values[i]
+            if length == _NONE_STR:
+                values[i] = None
+            else:
+                end = pos + length
+                values[i] = str(buf[pos:end], "utf-8")
+                pos = end
+        return self._build(values)
+
+    def _pack_optional_floats(self, values: List[object]) -> None:
+        for i in self._optional_float_slots:
+            if values[i] is None:
+                values[i] = _NAN
+
+    @staticmethod
+    def _pack_strings(values: List[object], slots: Tuple[int, ...]) -> List[bytes]:
+        strings = []
+        for i in slots:
+            value = values[i]
+            if value is None:
+                values[i] = _NONE_STR
+            else:
+                raw = value.encode("utf-8")
+                values[i] = len(raw)
+                strings.append(raw)
+        return strings
+
+
+_CODECS_BY_TYPE: Dict[type, _EventCodec] = {
+    cls: _EventCodec(cls, tag, fields) for cls, (tag, fields) in _EVENT_SCHEMAS.items()
+}
+_CODECS_BY_TAG: Dict[int, _EventCodec] = {codec.tag: codec for codec in _CODECS_BY_TYPE.values()}
+
+
+def encode_event(event: object) -> bytes:
+    """Encode an event as a self-contained record (no symbol table needed)."""
+    return _record(_CODECS_BY_TYPE[type(event)].encode_standalone(event))
+
+
+def decode_event(buf: _Buffer, pos: int = 0) -> Tuple[object, int]:
+    """Decode a record written by encode_event, returning the event and the next position."""
+    length, crc = _HEADER.unpack_from(buf, pos)
+    start = pos + _HEADER.size
+    end = start + length
+    if end > len(buf) or zlib.crc32(memoryview(buf)[start:end]) != crc:
+        raise CorruptRecordError(f"Corrupt event record at byte {pos}")
+    return _CODECS_BY_TAG[buf[start]].decode_standalone(buf, start + 1), end
+
+
+def _scan_segment(
+    buf: _Buffer,
+    count: int,
+    pos: int,
+    symbols: Dict[str, int],
+    checkpoints: List[_Checkpoint],
+) -> Tuple[int, int]:
+    """
+    Walk a segment from pos, returning (event count, end of last intact record).
+
+    symbols and checkpoints are extended in place. Record boundaries are
+    followed by length alone; checksums are verified only for records in the
+    trailing window a torn write can reach.
+    """
+    size = len(buf)
+    verify_from = size - _TAIL_VERIFY_BYTES
+    view = memoryview(buf)
+    try:
+        while pos + _HEADER.size <= size:
+            length, crc = _HEADER.unpack_from(buf, pos)
+            start = pos + _HEADER.size
+            end = start + length
+            if length == 0 or end > size:
+                break
+            if end > verify_from and zlib.crc32(view[start:end]) != crc:
+                break
+            if buf[start] == _SYMBOL_TAG:
+                symbols[str(view[start + 1:end], "utf-8")] = len(symbols)
+            else:
+                if count - checkpoints[-1][0] >= _CHECKPOINT_EVENTS:
+                    checkpoints.append((count, pos, len(symbols)))
+                count += 1
+            pos = end
+    finally:
+        view.release()
+    return count, pos
+
+
+class _Segment:
+    __slots__ = ("path", "first_offset")
+
+    def __init__(self, path: Path, first_offset: int):
+        self.path = path
+        self.first_offset = first_offset
+
+
+class EventStore:
+    """
+    Append-only, segmented event log.
+
+    append() takes a sequence of events and writes them with a single write
+    call, so it can be registered directly as an InventoryCommandHandler
+    listener. Offsets are zero-based event sequence numbers across all
+    segments.
+
+    The active segment keeps sparse in-memory checkpoints (event index, byte
+    position, symbol count), so replay from a recent offset, such as the one a
+    snapshot covers, seeks close to it instead of walking the segment.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        fsync: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = [
+            _Segment(path, int(path.stem))
+            for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        ]
+        self._next_offset = 0
+        self._file = None
+        self._file_size = 0
+        self._symbols: Dict[str, int] = {}
+        self._checkpoints: List[_Checkpoint] = []
+        if self._segments:
+            self._recover_tail()
+        else:
+            self._roll(0)
+
+    @property
+    def next_offset(self) -> int:
+        """Offset the next appended event will receive."""
+        return self._next_offset
+
+    def __len__(self) -> int:
+        return self._next_offset
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(self, events: Sequence[object]) -> int:
+        """Append events in order and return the offset of the first one."""
+        with self._lock:
+            first = self._next_offset
+            if not events:
+                return first
+            symbols_before = len(self._symbols)
+            try:
+                data = self._encode(events)
+                if (
+                    self._file_size > len(SEGMENT_MAGIC)
+                    and self._file_size + len(data) > self.segment_bytes
+                ):
+                    self._roll(first)
+                    symbols_before = 0
+                    data = self._encode(events)
+                self._file.write(data)
+                self._file.flush()
+            except BaseException:
+                # Symbols defined by a batch that never reached disk must not
+                # be referenced by later batches.
+                while len(self._symbols) > symbols_before:
+                    self._symbols.popitem()
+                raise
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            in_segment = first - self._segments[-1].first_offset
+            if in_segment - self._checkpoints[-1][0] >= _CHECKPOINT_EVENTS:
+                self._checkpoints.append((in_segment, self._file_size, symbols_before))
+            self._file_size += len(data)
+            self._next_offset = first + len(events)
+            return first
+
+    def replay(
+        self,
+        from_offset: int = 0,
+        to_offset: Optional[int] = None,
+        types: Optional[Collection[type]] = None,
+    ) -> Iterator[object]:
+        """
+        Yield events in log order from from_offset up to, not including,
+        to_offset (the end of the log if None).
+
+        With types, only events of those types are yielded; records of other
+        types are stepped over by length without being decoded or checksummed.
+        """
+        tags = None if types is None else frozenset(_CODECS_BY_TYPE[cls].tag for cls in types)
+        with self._lock:
+            segments = list(self._segments)
+            end_offset = self._next_offset if to_offset is None else min(to_offset, self._next_offset)
+            active_checkpoints = list(self._checkpoints)
+            active_symbols = list(self._symbols)
+        if from_offset >= end_offset:
+            return
+        starts = [segment.first_offset for segment in segments]
+        index = max(bisect.bisect_right(starts, from_offset) - 1, 0)
+        remaining = end_offset - from_offset
+        for segment in segments[index:]:
+            skip = max(from_offset - segment.first_offset, 0)
+            seek: _Checkpoint = (0, len(SEGMENT_MAGIC), 0)
+            symbols: List[str] = []
+            if segment is segments[-1] and skip:
+                seek = active_checkpoints[bisect.bisect_right(active_checkpoints, (skip, 1 << 62)) - 1]
+                symbols = active_symbols[:seek[2]]
+            remaining = yield from self._read_segment(segment, skip - seek[0], remaining, seek[1], symbols, tags)
+            if remaining <= 0:
+                return
+
+    def flush(self) -> None:
+        """fsync the active segment and persist its index."""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._write_index()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._write_index()
+
+    def _encode(self, events: Sequence[object]) -> bytes:
+        out: List[bytes] = []
+        symbols = self._symbols
+        codecs = _CODECS_BY_TYPE
+        for event in events:
+            codecs[type(event)].encode(event, symbols, out)
+        return b"".join(out)
+
+    def _read_segment(
+        self,
+        segment: _Segment,
+        skip: int,
+        limit: int,
+        pos: int,
+        symbols: List[str],
+        tags: Optional[FrozenSet[int]],
+    ) -> Generator[object, None, int]:
+        """Yield up to limit events from a segment; return how many of limit remain."""
+        with open(segment.path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size <= len(SEGMENT_MAGIC):
+                return limit
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                view = memoryview(buf)
+                try:
+                    return (yield from self._decode_records(buf, view, pos, skip, limit, symbols, tags))
+                finally:
+                    view.release()
+
+    @staticmethod
+    def _decode_records(
+        buf: mmap.mmap,
+        view: memoryview,
+        pos: int,
+        skip: int,
+        limit: int,
+        symbols: List[str],
+        tags: Optional[FrozenSet[int]],
+    ) -> Generator[object, None, int]:
+        header = _HEADER.unpack_from
+        header_size = _HEADER.size
+        codecs = _CODECS_BY_TAG
+        crc32 = zlib.crc32
+        size = len(buf)
+        # Records before the start offset are stepped over by length; only
+        # symbol definitions among them are read.
+        while skip and pos < size:
+            start = pos + header_size
+            pos = start + header(buf, pos)[0]
+            if buf[start] == _SYMBOL_TAG:
+                symbols.append(str(view[start + 1:pos], "utf-8"))
+            else:
+                skip -= 1
+        while limit > 0 and pos < size:
+            length, crc = header(buf, pos)
+            start = pos + header_size
+            pos = start + length
+            if pos > size:
+                raise CorruptRecordError(f"Corrupt event record at byte {start - header_size}")
+            tag = buf[start]
+            if tags is not None and tag != _SYMBOL_TAG and tag not in tags:
+                limit -= 1
+                continue
+            if crc32(view[start:pos]) != crc:
+                raise CorruptRecordError(f"Corrupt event record at byte {start - header_size}")
+            if tag == _SYMBOL_TAG:
+                symbols.append(str(view[start + 1:pos], "utf-8"))
+            else:
+                yield codecs[tag].decode(buf, start + 1, symbols)
+                limit -= 1
+        return limit
+
+    def _index_path(self, segment: _Segment) -> Path:
+        return segment.path.with_suffix(INDEX_SUFFIX)
+
+    def _write_index(self) -> None:
+        """Record how far the active segment is known to be intact."""
+        segment = self._segments[-1]
+        path = self._index_path(segment)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "events": self._next_offset - segment.first_offset,
+            "end": self._file_size,
+            "symbols": list(self._symbols),
+            "checkpoints": self._checkpoints,
+        }), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _read_index(self, segment: _Segment, size: int) -> Tuple[int, int, Dict[str, int], List[_Checkpoint]]:
+        fresh = (0, len(SEGMENT_MAGIC), {}, [(0, len(SEGMENT_MAGIC), 0)])
+        try:
+            index = json.loads(self._index_path(segment).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return fresh
+        if index.get("end", size + 1) > size:
+            return fresh
+        return (
+            index["events"],
+            index["end"],
+            {value: i for i, value in enumerate(index["symbols"])},
+            [tuple(checkpoint) for checkpoint in index["checkpoints"]],
+        )
+
+    def _recover_tail(self) -> None:
+        last = self._segments[-1]
+        with open(last.path, "rb") as handle:
+            if handle.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                raise CorruptRecordError(f"{last.path} is not an event segment")
+            size = os.fstat(handle.fileno()).st_size
+            # Resume from the index written at the last clean close/flush and
+            # only walk records appended after it.
+            count, end, symbols, checkpoints = self._read_index(last, size)
+            if size > end:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    count, end = _scan_segment(buf, count, end, symbols, checkpoints)
+        if end < size:
+            with open(last.path, "r+b") as handle:
+                handle.truncate(end)
+        self._next_offset = last.first_offset + count
+        self._symbols = symbols
+        self._checkpoints = checkpoints
+        self._file = open(last.path, "ab")
+        self._file_size = end
+
+    def _roll(self, first_offset: int) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._index_path(self._segments[-1]).unlink(missing_ok=True)
+        path = self.directory / f"{first_offset:020d}{SEGMENT_SUFFIX}"
+        self._file = open(path, "ab")
+        self._file.write(SEGMENT_MAGIC)
+        self._file.flush()
+        self._file_size = len(SEGMENT_MAGIC)
+        self._symbols = {}
+        self._checkpoints = [(0, len(SEGMENT_MAGIC), 0)]
+        self._segments.append(_Segment(path, first_offset))
@@ -0,0 +1,135 @@
+"""
+Inventory Reservation Expiry
+
+This module releases reservations once their expiration_time has passed.
+
+The scheduler keeps a min-heap of (expiration_time, reservation_id) entries
+fed from the StockReserved events the command handler emits, so finding the
+next reservation to expire is O(1) and each expiry costs O(log n). Reservations
+released or dispatched before they expire are not searched for in the heap:
+their entries are dropped lazily when they reach the top, and the heap is
+rebuilt from the live entries once stale ones outnumber them. No operation
+walks the full set of pending reservations.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .commands import ReleaseReservationCommand
+from .errors import ConcurrencyConflictError, UnknownReservationError
+from .events import ReservationReleased, StockDispatched, StockReserved
+from .handlers import InventoryCommandHandler
+
+# Stale heap entries are tolerated up to this floor before compaction is
+# considered, so small heaps are never rebuilt over and over.
+_MIN_COMPACT_STALE = 1024
+
+
+class ReservationExpiryScheduler:
+    """
+    Handler listener that expires reservations through the command handler.
+
+    The scheduler registers itself with the handler and seeds its heap from
+    the reservations already open in the handler's ledger, so it can be
+    created right after recovery. Call expire_due() from the service loop;
+    next_deadline() tells the loop how long it may sleep. The heap is guarded
+    by a lock, since the handler may publish from several threads.
+    """
+
+    def __init__(self, handler: InventoryCommandHandler):
+        self.handler = handler
+        self._lock = threading.Lock()
+        # Live expiry per reservation; heap entries that disagree are stale.
+        self._pending: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._stale = 0
+        for reservation in handler.ledger.reservations():
+            if reservation.expiration_time is not None:
+                self._pending[reservation.reservation_id] = reservation.expiration_time
+        self._heap = [(expires, rid) for rid, expires in self._pending.items()]
+        heapq.heapify(self._heap)
+        handler.add_listener(self)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __call__(self, events: Sequence[object]) -> None:
+        pending = self._pending
+        with self._lock:
+            for event in events:
+                cls = type(event)
+                if cls is StockReserved:
+                    if event.expiration_time is not None:
+                        pending[event.reservation_id] = event.expiration_time
+                        heapq.heappush(self._heap, (event.expiration_time, event.reservation_id))
+                elif cls is ReservationReleased or cls is StockDispatched:
+                    if pending.pop(event.reservation_id, None) is not None:
+                        self._stale += 1
+            if self._stale > _MIN_COMPACT_STALE and self._stale > len(pending):
+                self._compact()
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the earliest pending expiration_time, or None if nothing is pending."""
+        with self._lock:
+            self._drop_stale_head()
+            return self._heap[0][0] if self._heap else None
+
+    def expire_due(self, now: Optional[float] = None) -> List[ReservationReleased]:
+        """
+        Release every reservation whose expiration_time is at or before now.
+
+        Returns the ReservationReleased events emitted, in expiry order. A
+        reservation dispatched or released by someone else meanwhile is
+        skipped; one whose release keeps conflicting with concurrent writers
+        stays due and is tried again.
+        """
+        if now is None:
+            now = time.time()
+        released = []
+        while True:
+            with self._lock:
+                self._drop_stale_head()
+                heap = self._heap
+                if not heap or heap[0][0] > now:
+                    return released
+                entry = heap[0]
+            # Released outside the lock: the handler publishes the release back
+            # to this listener, which drops the entry from _pending.
+            try:
+                released.append(self.handler.handle(ReleaseReservationCommand(entry[1])))
+            except UnknownReservationError:
+                self._discard(entry)
+            except ConcurrencyConflictError:
+                # The entry is still at the head of the heap and still pending.
+                continue
+
+    def _drop_stale_head(self) -> None:
+        heap = self._heap
+        pending = self._pending
+        while heap:
+            expires, reservation_id = heap[0]
+            if pending.get(reservation_id) == expires:
+                return
+            heapq.heappop(heap)
+            self._stale -= 1
+
+    def _discard(self, entry: Tuple[float, str]) -> None:
+        """Drop a due entry whose reservation is no longer open."""
+        expires, reservation_id = entry
+        with self._lock:
+            if not self._heap or self._heap[0] != entry:
+                return
+            heapq.heappop(self._heap)
+            if self._pending.get(reservation_id) == expires:
+                del self._pending[reservation_id]
+            else:
+                # Already counted stale when its release or dispatch arrived.
+                self._stale -= 1
+
+    def _compact(self) -> None:
+        self._heap = [(expires, rid) for rid, expires in self._pending.items()]
+        heapq.heapify(self._heap)
+        self._stale = 0
@@ -0,0 +1,352 @@
+"""
+Inventory Command Handlers
+
+This module applies inventory commands to a StockLedger.
+
+Each handler validates a command against the current ledger state, turns it
+into the matching domain event, applies that event to the ledger and passes
+it on to the registered listeners. Routing is a single dictionary lookup on
+the command type and every handler touches only the stock level and
+reservation it names, so handling a command is O(1) regardless of ledger
+size. handle_batch() applies many commands atomically and publishes their
+events together, so a listener such as the event store sees one append.
+
+Handlers are safe to call from several threads. A command is validated
+without locks against the stock level version it read, then applied with
+the ledger's compare-and-swap under that key's stripe lock; if another
+writer changed the level in between, the command is validated again.
+
+Given an SQLiteOutbox, the handler writes each command's events to it under
+the stripe locks before the ledger keeps them, rolling the command back if
+the write fails, and waits for outbox space before taking any lock.
+
+Given an IdempotencyCache, the handler returns the recorded event for a
+command whose idempotency key was already applied, without validating or
+applying the command again.
+
+Given a MetricsRegistry, the handler times every command into a latency
+histogram per command type and counts rejected commands by error type.
+handle() and handle_batch() check once whether metrics are on, so a handler
+created without a registry pays a single attribute test per call.
+"""
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from .errors import (
+    ConcurrencyConflictError,
+    DuplicateReservationError,
+    InsufficientStockError,
+    InventoryError,
+    UnknownReservationError,
+    UnsupportedCommandError,
+)
+from .events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+from .idempotency import IdempotencyCache
+from .ledger import Reservation, StockLedger
+from .metrics import MetricsRegistry
+from .outbox import SQLiteOutbox
+
+EventListener = Callable[[Sequence[object]], None]
+# A route returns the event for a command and the stock level version it was
+# validated against, or None when the command holds regardless of state.
+_Routed = Tuple[object, Optional[int]]
+
+DEFAULT_MAX_ATTEMPTS = 16
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex
+
+
+class InventoryCommandHandler:
+    """
+    Command handler engine for the inventory domain.
+
+    Listeners receive every emitted event as a sequence while the stripe
+    locks it was applied under are still held, so events touching the same
+    stock key reach them in the order they were applied to the ledger.
+    """
+
+    def __init__(
+        self,
+        ledger: Optional[StockLedger] = None,
+        listeners: Iterable[EventListener] = (),
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        idempotency: Optional[IdempotencyCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        outbox: Optional[SQLiteOutbox] = None,
+    ):
+        self.ledger = ledger if ledger is not None else StockLedger()
+        self.max_attempts = max_attempts
+        self.idempotency = idempotency
+        self.outbox = outbox
+        self._listeners: List[EventListener] = list(listeners)
+        self._routes: Dict[type, Callable[[object], _Routed]] = {
+            AddStockCommand: self._add_stock,
+            ReserveStockCommand: self._reserve_stock,
+            ReleaseReservationCommand: self._release_reservation,
+            DispatchStockCommand: self._dispatch_stock,
+            AdjustStockCommand: self._adjust_stock,
+        }
+        self._metrics = metrics
+        if metrics is not None:
+            self._latency = {
+                command_type: metrics.histogram(
+                    "inventory_command_seconds",
+                    "Time to handle one inventory command, by command type.",
+                    {"command": command_type.__name__},
+                )
+                for command_type in self._routes
+            }
+            self._batch_latency = metrics.histogram(
+                "inventory_command_batch_seconds", "Time to handle one inventory command batch."
+            )
+            self._batched = metrics.counter(
+                "inventory_batched_commands_total", "Commands applied through handle_batch()."
+            )
+
+    def add_listener(self, listener: EventListener) -> None:
+        """Register a callable that receives emitted events."""
+        self._listeners.append(listener)
+
+    def handle(self, command: object) -> object:
+        """Apply a command and return the event it produced."""
+        if self._metrics is None:
+            return self._handle(command)
+        started = time.perf_counter()
+        try:
+            return self._handle(command)
+        except InventoryError as error:
+            self._count_error(type(command).__name__, error)
+            raise
+        finally:
+            histogram = self._latency.get(type(command))
+            if histogram is not None:
+                histogram.observe(time.perf_counter() - started)
+
+    def handle_batch(self, commands: Iterable[object]) -> List[object]:
+        """
+        Apply commands in order as one all-or-nothing unit.
+
+        Each command is validated against the ledger state left by the ones
+        before it. If any command is rejected, the ledger is rolled back to
+        its state before the batch, nothing is published and the error is
+        raised; the same happens if writing the events to the outbox fails.
+        Otherwise listeners receive all the events in a single call.
+
+        A command whose idempotency key was already applied, before or earlier
+        in this batch, is skipped: its recorded event takes its place in the
+        returned list and is not published again.
+        """
+        if self._metrics is None:
+            return self._handle_batch(commands)
+        started = time.perf_counter()
+        try:
+            results = self._handle_batch(commands)
+        except InventoryError as error:
+            self._count_error("batch", error)
+            raise
+        finally:
+            self._batch_latency.observe(time.perf_counter() - started)
+        self._batched.inc(len(results))
+        return results
+
+    def _handle(self, command: object) -> object:
+        route = self._routes.get(type(command))
+        if route is None:
+            raise UnsupportedCommandError(f"No handler for {type(command).__name__}")
+        idempotency = self.idempotency
+        if idempotency is not None:
+            recorded = idempotency.lookup(command)
+            if recorded is not None:
+                return recorded
+        ledger = self.ledger
+        outbox = self.outbox
+        if outbox is not None:
+            outbox.wait_for_space()
+        for _ in range(self.max_attempts):
+            event, version = route(command)
+            locks = ledger.stripe_locks(event)
+            for lock in locks:
+                lock.acquire()
+            try:
+                # A concurrent retry may have applied the key since the first
+                # check; its event was recorded under these locks.
+                if idempotency is not None:
+                    recorded = idempotency.lookup(command)
+                    if recorded is not None:
+                        return recorded
+                if ledger.accepts(event, version):
+                    # Written before the ledger changes, so a failed insert
+                    # leaves the command without effect.
+                    if outbox is not None:
+                        outbox.write((event,))
+                    ledger.apply(event)
+                    if idempotency is not None:
+                        idempotency.record((event,))
+                    self._publish((event,))
+                    return event
+            finally:
+                for lock in reversed(locks):
+                    lock.release()
+        raise ConcurrencyConflictError(
+            f"{type(command).__name__} conflicted with concurrent writers {self.max_attempts} times"
+        )
+
+    def _handle_batch(self, commands: Iterable[object]) -> List[object]:
+        routes = self._routes
+        idempotency = self.idempotency
+        outbox = self.outbox
+        if outbox is not None:
+            outbox.wait_for_space()
+        # A batch may touch any key, so it holds every stripe; validation then
+        # cannot race and no version checks are needed.
+        locks = self.ledger.all_locks()
+        for lock in locks:
+            lock.acquire()
+        try:
+            transaction = self.ledger.transaction()
+            events: List[object] = []
+            results: List[object] = []
+            try:
+                for command in commands:
+                    route = routes.get(type(command))
+                    if route is None:
+                        raise UnsupportedCommandError(f"No handler for {type(command).__name__}")
+                    if idempotency is not None:
+                        recorded = idempotency.lookup(command)
+                        if recorded is not None:
+                            results.append(recorded)
+                            continue
+                    event, _ = route(command)
+                    transaction.apply(event)
+                    if idempotency is not None:
+                        idempotency.record((event,))
+                    events.append(event)
+                    results.append(event)
+                if outbox is not None and events:
+                    outbox.write(events)
+            except BaseException:
+                if idempotency is not None:
+                    idempotency.forget(events)
+                transaction.rollback()
+                raise
+            if events:
+                self._publish(events)
+            return results
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _count_error(self, command: str, error: InventoryError) -> None:
+        self._metrics.counter(
+            "inventory_command_errors_total",
+            "Inventory commands and batches rejected, by command and error type.",
+            {"command": command, "error": type(error).__name__},
+        ).inc()
+
+    def _publish(self, events: Sequence[object]) -> None:
+        for listener in self._listeners:
+            listener(events)
+
+    def _open_reservation_version(self, reservation_id: str) -> Tuple[Reservation, int]:
+        """Return an open reservation and the version of its stock level."""
+        ledger = self.ledger
+        while True:
+            reservation = ledger.reservation(reservation_id)
+            if reservation is None:
+                raise UnknownReservationError(f"Reservation {reservation_id!r} is not open")
+            version = ledger.version(reservation.key)
+            # The key is only known once the reservation has been read, so read
+            # it again: if it is still the same open reservation after the
+            # version was taken, an unchanged version proves it is still open
+            # when the event is applied.
+            if ledger.reservation(reservation_id) is reservation:
+                return reservation, version
+
+    def _add_stock(self, command: AddStockCommand) -> _Routed:
+        return StockReceived(
+            command.product_id,
+            command.quantity,
+            command.location_id,
+            command.batch_id,
+            command.expiration_time,
+            command.idempotency_key,
+        ), None
+
+    def _reserve_stock(self, command: ReserveStockCommand) -> _Routed:
+        key = (command.product_id, command.location_id)
+        version = self.ledger.version(key)
+        if self.ledger.reservation(command.reservation_id) is not None:
+            raise DuplicateReservationError(
+                f"Reservation {command.reservation_id!r} already exists"
+            )
+        available = self.ledger.available(key)
+        if command.quantity > available:
+            raise InsufficientStockError(
+                f"Cannot reserve {command.quantity} of {command.product_id!r} at "
+                f"{command.location_id!r}: {available} available"
+            )
+        return StockReserved(
+            command.product_id,
+            command.quantity,
+            command.reservation_id,
+            command.location_id,
+            command.expiration_time,
+            command.idempotency_key,
+        ), version
+
+    def _release_reservation(self, command: ReleaseReservationCommand) -> _Routed:
+        reservation, version = self._open_reservation_version(command.reservation_id)
+        return ReservationReleased(
+            reservation.reservation_id,
+            reservation.product_id,
+            reservation.location_id,
+            reservation.quantity,
+        ), version
+
+    def _dispatch_stock(self, command: DispatchStockCommand) -> _Routed:
+        reservation, version = self._open_reservation_version(command.reservation_id)
+        return StockDispatched(
+            _new_id(),
+            reservation.reservation_id,
+            reservation.product_id,
+            reservation.location_id,
+            reservation.quantity,
+            command.destination,
+        ), version
+
+    def _adjust_stock(self, command: AdjustStockCommand) -> _Routed:
+        product_id, location_id = command.stock_id
+        version = None
+        if command.quantity_change < 0:
+            version = self.ledger.version(command.stock_id)
+            available = self.ledger.available(command.stock_id)
+            if -command.quantity_change > available:
+                raise InsufficientStockError(
+                    f"Cannot adjust {product_id!r} at {location_id!r} by "
+                    f"{command.quantity_change}: {available} unreserved on hand"
+                )
+        return StockAdjusted(
+            _new_id(),
+            command.quantity_change,
+            command.reason_code,
+            product_id,
+            location_id,
+        ), version
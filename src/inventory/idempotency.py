@@ -0,0 +1,127 @@
+"""
+Inventory Idempotency
+
+This module remembers the events produced by commands that carry an
+idempotency key, so a retried command gets its original event back instead
+of being applied a second time.
+
+AddStockCommand and ReserveStockCommand accept an idempotency_key, and the
+handler copies it onto the StockReceived or StockReserved event it emits.
+The cache is therefore rebuilt after a restart by feeding it the event log:
+record() keeps any keyed event that is still within its time to live. Every
+keyed event is recorded under the stripe locks it was applied with, and the
+handler checks for a recorded event again under those locks before applying
+a new one, so concurrent retries never apply a key twice.
+
+The cache is bounded both ways. An entry expires ttl seconds after its event
+occurred, and once maxsize keys are held the least recently used is evicted.
+A retry that arrives after its key has expired or been evicted is treated as
+a new command.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .commands import AddStockCommand, ReserveStockCommand
+from .errors import IdempotencyKeyReuseError
+from .events import StockReceived, StockReserved
+
+DEFAULT_MAX_KEYS = 100_000
+DEFAULT_TTL = 24 * 60 * 60
+
+# The event each keyed command produces, and the command fields the event
+# repeats; a retry must match the original on all of them.
+_KEYED_COMMANDS: Dict[type, Tuple[type, Tuple[str, ...]]] = {
+    AddStockCommand: (
+        StockReceived,
+        ("product_id", "quantity", "location_id", "batch_id", "expiration_time"),
+    ),
+    ReserveStockCommand: (
+        StockReserved,
+        ("product_id", "quantity", "reservation_id", "location_id", "expiration_time"),
+    ),
+}
+
+
+class IdempotencyCache:
+    """
+    Bounded map from idempotency key to the event the key's command produced.
+
+    clock must return POSIX time, since expiry is measured from each event's
+    occurred_at.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAX_KEYS,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires at, event), least recently used first.
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, command: object) -> Optional[object]:
+        """
+        Return the event recorded for the command's idempotency key, or None.
+
+        Raises IdempotencyKeyReuseError if the key was used by a different
+        command.
+        """
+        key = getattr(command, "idempotency_key", None)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, event = entry
+            if expires <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        event_type, compared = _KEYED_COMMANDS[type(command)]
+        if type(event) is not event_type or any(
+            getattr(event, name) != getattr(command, name) for name in compared
+        ):
+            raise IdempotencyKeyReuseError(
+                f"Idempotency key {key!r} was already used by a different command"
+            )
+        return event
+
+    def record(self, events: Iterable[object]) -> None:
+        """Remember the keyed events among events, skipping any already expired."""
+        ttl = self.ttl
+        now = self.clock()
+        entries = self._entries
+        with self._lock:
+            for event in events:
+                key = getattr(event, "idempotency_key", None)
+                if key is None:
+                    continue
+                expires = event.occurred_at + ttl
+                if expires <= now:
+                    continue
+                entries[key] = (expires, event)
+                entries.move_to_end(key)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def forget(self, events: Iterable[object]) -> None:
+        """Drop the keys of events that were recorded but then rolled back."""
+        with self._lock:
+            for event in events:
+                key = getattr(event, "idempotency_key", None)
+                if key is not None:
+                    self._entries.pop(key, None)
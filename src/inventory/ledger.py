@@ -0,0 +1,374 @@
+"""
+Inventory Ledger
+
+This module holds the in-memory stock ledger: on-hand and reserved
+quantities keyed by (product_id, location_id), plus the open reservations.
+
+The ledger only changes by applying domain events. Commands are validated
+by the handlers in inventory.handlers, which turn them into events; the
+same events can later be replayed into an empty ledger to rebuild it.
+Stock received under a batch_id is also tracked per batch in a BatchIndex,
+and reservations on that stock are allocated first-expired-first-out. The
+allocation is derived from ledger state when the reservation is applied, so
+replaying the same events reproduces it.
+Every operation is a constant number of dictionary lookups, so the cost of
+a command never depends on how many SKUs or reservations are tracked.
+
+Each stock level carries a version, drawn from one ledger-wide increasing
+sequence whenever an event changes it, so a version is never reused. Writers
+that validate without holding a lock use it for compare-and-swap: they note
+the version they read, then apply under a lock striped by stock key only if
+the version is unchanged. Writers on different stripes never wait on each
+other.
+"""
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .batches import Allocation, BatchIndex
+from .events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+
+StockKey = Tuple[str, str]
+
+LOCK_STRIPES = 64
+
+
+class StockLevel:
+    """On-hand and reserved quantity for one product at one location."""
+
+    __slots__ = ("on_hand", "reserved", "version")
+
+    def __init__(self, on_hand: int = 0, reserved: int = 0):
+        self.on_hand = on_hand
+        self.reserved = reserved
+        self.version = 0
+
+    @property
+    def available(self) -> int:
+        """Quantity that can still be promised to new reservations."""
+        return self.on_hand - self.reserved
+
+    def __repr__(self) -> str:
+        return f"StockLevel(on_hand={self.on_hand}, reserved={self.reserved})"
+
+
+class Reservation:
+    """An open hold on stock at a single location."""
+
+    __slots__ = (
+        "reservation_id", "product_id", "location_id", "quantity", "expiration_time", "allocation",
+    )
+
+    def __init__(
+        self,
+        reservation_id: str,
+        product_id: str,
+        location_id: str,
+        quantity: int,
+        expiration_time: Optional[float] = None,
+        allocation: Allocation = (),
+    ):
+        self.reservation_id = reservation_id
+        self.product_id = product_id
+        self.location_id = location_id
+        self.quantity = quantity
+        self.expiration_time = expiration_time
+        # (batch_id, quantity) pairs the reservation holds; empty when the
+        # key has no batch-tracked stock.
+        self.allocation = allocation
+
+    @property
+    def key(self) -> StockKey:
+        return (self.product_id, self.location_id)
+
+    def __repr__(self) -> str:
+        return (
+            f"Reservation({self.reservation_id!r}, product_id={self.product_id!r}, "
+            f"location_id={self.location_id!r}, quantity={self.quantity}, "
+            f"expiration_time={self.expiration_time}, allocation={self.allocation})"
+        )
+
+
+class StockLedger:
+    """
+    In-memory stock ledger.
+
+    Events are applied without re-validation: they record facts that the
+    command handlers have already checked against this ledger.
+    """
+
+    def __init__(self):
+        self._levels: Dict[StockKey, StockLevel] = {}
+        self._reservations: Dict[str, Reservation] = {}
+        self._batches: Dict[StockKey, BatchIndex] = {}
+        self._stripes = tuple(threading.RLock() for _ in range(LOCK_STRIPES))
+        self._versions = itertools.count(1)
+        self._appliers: Dict[type, Callable[[object], None]] = {
+            StockReceived: self._apply_received,
+            StockReserved: self._apply_reserved,
+            ReservationReleased: self._apply_released,
+            StockDispatched: self._apply_dispatched,
+            StockAdjusted: self._apply_adjusted,
+        }
+
+    @classmethod
+    def from_state(
+        cls,
+        levels: Iterable[Tuple[StockKey, int, int]],
+        reservations: Iterable[Reservation],
+        batches: Iterable[Tuple[StockKey, Optional[str], Optional[float], int]] = (),
+    ) -> "StockLedger":
+        """
+        Build a ledger from (key, on_hand, reserved) rows, open reservations
+        and (key, batch_id, expiration_time, unallocated quantity) batch rows.
+        """
+        ledger = cls()
+        ledger._levels = {key: StockLevel(on_hand, reserved) for key, on_hand, reserved in levels}
+        ledger._reservations = {r.reservation_id: r for r in reservations}
+        for key, batch_id, expiration_time, quantity in batches:
+            index = ledger._batches.get(key)
+            if index is None:
+                index = ledger._batches[key] = BatchIndex()
+            index.add(batch_id, quantity, expiration_time)
+        for reservation in ledger._reservations.values():
+            index = ledger._batches.get(reservation.key)
+            if index is not None:
+                index.hold(reservation.allocation)
+        return ledger
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def level(self, key: StockKey) -> Optional[StockLevel]:
+        """Return the stock level for a (product_id, location_id) key, if tracked."""
+        return self._levels.get(key)
+
+    def available(self, key: StockKey) -> int:
+        """Return the available quantity for a key (0 when untracked)."""
+        level = self._levels.get(key)
+        return level.available if level is not None else 0
+
+    def version(self, key: StockKey) -> int:
+        """Return the version of a key's stock level (0 when untracked)."""
+        level = self._levels.get(key)
+        return level.version if level is not None else 0
+
+    def reservation(self, reservation_id: str) -> Optional[Reservation]:
+        """Return an open reservation by identifier, if any."""
+        return self._reservations.get(reservation_id)
+
+    def batches(self, key: StockKey) -> Optional[BatchIndex]:
+        """Return the batch index for a key, if any of its stock is batch-tracked."""
+        return self._batches.get(key)
+
+    def batch_indexes(self) -> Iterator[Tuple[StockKey, BatchIndex]]:
+        """Iterate over the batch index of every batch-tracked key."""
+        return iter(self._batches.items())
+
+    def levels(self) -> Iterator[Tuple[StockKey, StockLevel]]:
+        """Iterate over all tracked stock levels."""
+        return iter(self._levels.items())
+
+    def reservations(self) -> Iterator[Reservation]:
+        """Iterate over all open reservations."""
+        return iter(self._reservations.values())
+
+    def apply(self, event: object) -> None:
+        """Apply a single domain event to the ledger."""
+        self._appliers[type(event)](event)
+
+    def stripe_locks(self, event: object) -> Tuple[threading.RLock, ...]:
+        """
+        Locks guarding the state an event writes, in acquisition order.
+
+        A reservation also takes the stripe of its identifier, so two writers
+        claiming the same reservation_id on different keys are serialized.
+        Likewise for an idempotency key, so a reused key is seen by the
+        handler's idempotency check whatever stock the commands name.
+        """
+        stripes = {hash((event.product_id, event.location_id)) % LOCK_STRIPES}
+        cls = type(event)
+        if cls is StockReserved:
+            stripes.add(hash(event.reservation_id) % LOCK_STRIPES)
+        if (cls is StockReserved or cls is StockReceived) and event.idempotency_key is not None:
+            stripes.add(hash(event.idempotency_key) % LOCK_STRIPES)
+        return tuple(self._stripes[i] for i in sorted(stripes))
+
+    def all_locks(self) -> Tuple[threading.RLock, ...]:
+        """Every stripe lock, in acquisition order."""
+        return self._stripes
+
+    def compare_and_apply(self, event: object, expected_version: Optional[int]) -> bool:
+        """
+        Apply an event only if its stock level is still at expected_version.
+
+        None skips the version check. A reservation is also refused if its
+        identifier has been taken meanwhile. The caller must hold the event's
+        stripe_locks(). Returns whether the event was applied.
+        """
+        if not self.accepts(event, expected_version):
+            return False
+        self._appliers[type(event)](event)
+        return True
+
+    def accepts(self, event: object, expected_version: Optional[int]) -> bool:
+        """
+        Return whether compare_and_apply() would apply the event now.
+
+        The answer only holds while the caller keeps the event's
+        stripe_locks(), which lets it do other work between the check and
+        apply(), such as recording the event in an outbox.
+        """
+        key = (event.product_id, event.location_id)
+        if expected_version is not None and self.version(key) != expected_version:
+            return False
+        return not (type(event) is StockReserved and event.reservation_id in self._reservations)
+
+    def transaction(self) -> "LedgerTransaction":
+        """Start recording applied events so they can be rolled back together."""
+        return LedgerTransaction(self)
+
+    def _level_for(self, key: StockKey) -> StockLevel:
+        level = self._levels.get(key)
+        if level is None:
+            level = self._levels[key] = StockLevel()
+        return level
+
+    def _apply_received(self, event: StockReceived) -> None:
+        key = (event.product_id, event.location_id)
+        level = self._level_for(key)
+        index = self._batches.get(key)
+        if index is None and event.batch_id is not None:
+            # Batch tracking starts with this key's first batch; stock already
+            # available becomes the unbatched pool.
+            index = self._batches[key] = BatchIndex()
+            if level.available:
+                index.add(None, level.available)
+        if index is not None:
+            index.add(event.batch_id, event.quantity, event.expiration_time)
+        level.on_hand += event.quantity
+        level.version = next(self._versions)
+
+    def _apply_reserved(self, event: StockReserved) -> None:
+        key = (event.product_id, event.location_id)
+        level = self._level_for(key)
+        index = self._batches.get(key)
+        level.reserved += event.quantity
+        level.version = next(self._versions)
+        self._reservations[event.reservation_id] = Reservation(
+            event.reservation_id,
+            event.product_id,
+            event.location_id,
+            event.quantity,
+            event.expiration_time,
+            index.allocate(event.quantity) if index is not None else (),
+        )
+
+    def _apply_released(self, event: ReservationReleased) -> None:
+        reservation = self._reservations.pop(event.reservation_id)
+        key = (event.product_id, event.location_id)
+        index = self._batches.get(key)
+        if index is not None:
+            # A reservation taken before the key's first batch arrived holds
+            # no allocation; its stock goes back to the unbatched pool.
+            if reservation.allocation:
+                index.restore(reservation.allocation)
+            else:
+                index.add(None, reservation.quantity)
+        level = self._levels[key]
+        level.reserved -= event.quantity
+        level.version = next(self._versions)
+
+    def _apply_dispatched(self, event: StockDispatched) -> None:
+        reservation = self._reservations.pop(event.reservation_id)
+        key = (event.product_id, event.location_id)
+        index = self._batches.get(key)
+        if index is not None:
+            index.dispatch(reservation.allocation)
+        level = self._levels[key]
+        level.reserved -= event.quantity
+        level.on_hand -= event.quantity
+        level.version = next(self._versions)
+
+    def _apply_adjusted(self, event: StockAdjusted) -> None:
+        key = (event.product_id, event.location_id)
+        level = self._level_for(key)
+        index = self._batches.get(key)
+        if index is not None:
+            # Found stock joins the unbatched pool; shrinkage is taken from
+            # the batches that expire first.
+            if event.quantity_change > 0:
+                index.add(None, event.quantity_change)
+            else:
+                index.remove(-event.quantity_change)
+        level.on_hand += event.quantity_change
+        level.version = next(self._versions)
+
+
+class LedgerTransaction:
+    """
+    Undo journal for a run of events applied to one ledger.
+
+    The first time an event touches a stock level (with its batch index) or a
+    reservation, its prior state is saved; rollback() restores exactly those
+    entries, so undoing a batch costs time proportional to the batch, not to
+    the ledger. Restored levels get a fresh version, never the one they had
+    before the batch.
+    """
+
+    __slots__ = ("_ledger", "_levels", "_reservations")
+
+    def __init__(self, ledger: StockLedger):
+        self._ledger = ledger
+        self._levels: Dict[StockKey, Optional[Tuple[int, int, Optional[BatchIndex]]]] = {}
+        self._reservations: Dict[str, Optional[Reservation]] = {}
+
+    def apply(self, event: object) -> None:
+        """Save the state the event touches, then apply it to the ledger."""
+        ledger = self._ledger
+        key = (event.product_id, event.location_id)
+        if key not in self._levels:
+            level = ledger._levels.get(key)
+            if level is None:
+                self._levels[key] = None
+            else:
+                index = ledger._batches.get(key)
+                self._levels[key] = (level.on_hand, level.reserved, None if index is None else index.copy())
+        reservation_id = getattr(event, "reservation_id", None)
+        if reservation_id is not None and reservation_id not in self._reservations:
+            self._reservations[reservation_id] = ledger._reservations.get(reservation_id)
+        ledger.apply(event)
+
+    def rollback(self) -> None:
+        """Restore every entry touched since the transaction started."""
+        ledger = self._ledger
+        levels = ledger._levels
+        batches = ledger._batches
+        for key, saved in self._levels.items():
+            if saved is None:
+                levels.pop(key, None)
+                batches.pop(key, None)
+                continue
+            level = levels[key]
+            level.on_hand, level.reserved, index = saved
+            level.version = next(ledger._versions)
+            if index is None:
+                batches.pop(key, None)
+            else:
+                batches[key] = index
+        reservations = ledger._reservations
+        for reservation_id, saved in self._reservations.items():
+            if saved is None:
+                reservations.pop(reservation_id, None)
+            else:
+                reservations[reservation_id] = saved
+        self._levels.clear()
+        self._reservations.clear()
@@ -0,0 +1,312 @@
+"""
+Inventory Metrics
+
+This module records latency histograms, counters and gauges for the
+inventory command handler and event bus, and exports them as an in-process
+snapshot or in the Prometheus text exposition format.
+
+Recording is built for the command path. Histograms and counters keep one
+shard of plain integers per thread, reached through threading.local, so an
+observation takes no lock and never contends with other threads; a
+histogram finds its bucket by bisecting fixed bounds. When a thread exits,
+its shard is folded into a retired total the next time a shard is created
+or the metric is read, so short-lived threads do not pile up shards.
+
+Gauges and observed counters are read rather than written: each wraps a
+callable that is only called when a snapshot is taken, such as one summing
+the bus's queue depths or its delivered events.
+
+Metrics are off unless a MetricsRegistry is passed in. Without one, the
+command handler skips timing after a single check and the event bus
+registers nothing.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+# Latency bucket upper bounds in seconds, from 1 microsecond to 10 seconds.
+DEFAULT_LATENCY_BOUNDS: Tuple[float, ...] = tuple(
+    float(f"{scale}e{exponent}") for exponent in range(-6, 1) for scale in (1, 2.5, 5)
+) + (10.0,)
+
+# Sorted (label name, label value) pairs identifying one series of a metric.
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Mapping[str, str]]) -> Labels:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    """
+    Counts of a histogram at the time it was read.
+
+    Expected Fields:
+        bounds: Upper bound of each bucket, ascending; a final bucket holds
+            everything above the last bound
+        counts: Observations per bucket, not cumulative, one more than bounds
+        total: Sum of all observed values
+    """
+
+    bounds: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    total: float
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile as the upper bound of the bucket holding it."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen and seen >= rank:
+                return bound
+        return float("inf") if self.counts[-1] else 0.0
+
+
+class _ThreadShards:
+    """
+    Per-thread shards of a metric's running values.
+
+    Subclasses reach their thread's shard through self._local.shard and call
+    _new_shard() when it is missing. Shards of exited threads are folded into
+    one retired shard whenever a shard is created or _read_shards() is called.
+    """
+
+    def __init__(self, empty: Callable[[], list]):
+        self._empty = empty
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._retired = empty()
+        self._shards: List[Tuple[threading.Thread, list]] = []
+
+    def _new_shard(self) -> list:
+        shard = self._local.shard = self._empty()
+        with self._lock:
+            self._retire_exited()
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _read_shards(self) -> List[list]:
+        """The retired totals, copied, followed by every live thread's shard."""
+        with self._lock:
+            self._retire_exited()
+            return [list(self._retired)] + [shard for _, shard in self._shards]
+
+    def _retire_exited(self) -> None:
+        retired = self._retired
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for i, value in enumerate(shard):
+                    retired[i] += value
+        self._shards = live
+
+
+class Counter(_ThreadShards):
+    """Monotonic count, kept per thread and summed when read."""
+
+    def __init__(self) -> None:
+        super().__init__(lambda: [0])
+
+    def inc(self, amount: int = 1) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[0] += amount
+
+    def value(self) -> int:
+        return sum(shard[0] for shard in self._read_shards())
+
+
+class Histogram(_ThreadShards):
+    """Distribution of observed values over fixed buckets, kept per thread."""
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_LATENCY_BOUNDS):
+        if list(bounds) != sorted(set(bounds)) or not bounds:
+            raise ValueError("bounds must be non-empty, ascending and distinct")
+        self.bounds = tuple(bounds)
+        buckets = len(self.bounds) + 1
+        # Each shard holds one count per bucket, then the sum of the values.
+        super().__init__(lambda: [0] * buckets + [0.0])
+
+    def observe(self, value: float) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect.bisect_left(self.bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        buckets = len(self.bounds) + 1
+        counts = [0] * buckets
+        total = 0.0
+        for shard in self._read_shards():
+            for i in range(buckets):
+                counts[i] += shard[i]
+            total += shard[-1]
+        return HistogramSnapshot(self.bounds, tuple(counts), total)
+
+
+class Gauge:
+    """Current value of something, read from a callable when a snapshot is taken."""
+
+    def __init__(self, read: Callable[[], float]):
+        self.read = read
+
+    def value(self) -> float:
+        return self.read()
+
+
+class ObservedCounter(Gauge):
+    """
+    Monotonic count kept elsewhere, such as a running total on another object,
+    read from a callable when a snapshot is taken and exported as a counter.
+    """
+
+
+Metric = Union[Counter, Histogram, Gauge]
+Sample = Union[int, float, HistogramSnapshot]
+
+
+class MetricsRegistry:
+    """
+    Named metrics, each with any number of labelled series.
+
+    The factory methods return the existing series when called again with
+    the same name and labels, so callers may look series up lazily, e.g.
+    on an error path. A name is bound to one kind of metric.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # name -> (kind, help text, labels -> series)
+        self._families: Dict[str, Tuple[str, str, Dict[Labels, Metric]]] = {}
+
+    def counter(self, name: str, help: str, labels: Optional[Mapping[str, str]] = None) -> Counter:
+        counter = self._series(name, "counter", help, _labels(labels), Counter)
+        if not isinstance(counter, Counter):
+            raise ValueError(f"Metric {name!r} is an observed counter, not one incremented with inc()")
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Optional[Mapping[str, str]] = None,
+        bounds: Tuple[float, ...] = DEFAULT_LATENCY_BOUNDS,
+    ) -> Histogram:
+        return self._series(name, "histogram", help, _labels(labels), lambda: Histogram(bounds))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], float],
+        labels: Optional[Mapping[str, str]] = None,
+    ) -> Gauge:
+        """Register read() as the source of a gauge, replacing any earlier one."""
+        gauge = self._series(name, "gauge", help, _labels(labels), lambda: Gauge(read))
+        gauge.read = read
+        return gauge
+
+    def observed_counter(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], int],
+        labels: Optional[Mapping[str, str]] = None,
+    ) -> ObservedCounter:
+        """
+        Register read() as the source of a counter, replacing any earlier one.
+        read() must never decrease.
+        """
+        counter = self._series(name, "counter", help, _labels(labels), lambda: ObservedCounter(read))
+        if not isinstance(counter, ObservedCounter):
+            raise ValueError(f"Metric {name!r} is a counter incremented with inc(), not an observed counter")
+        counter.read = read
+        return counter
+
+    def snapshot(self) -> Dict[Tuple[str, Labels], Sample]:
+        """Read every series, keyed by metric name and labels."""
+        return {
+            (name, labels): metric.snapshot() if isinstance(metric, Histogram) else metric.value()
+            for name, (_, _, series) in self._copy().items()
+            for labels, metric in series.items()
+        }
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, (kind, help, series) in sorted(self._copy().items()):
+            lines.append(f"# HELP {name} {_escape_help(help)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in sorted(series.items(), key=lambda item: item[0]):
+                if isinstance(metric, Histogram):
+                    snapshot = metric.snapshot()
+                    cumulative = 0
+                    for bound, count in zip(snapshot.bounds + (float("inf"),), snapshot.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {snapshot.total!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {metric.value()!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path]) -> Path:
+        """
+        Write render_prometheus() to a file, atomically replacing the old one,
+        e.g. for the node exporter's textfile collector.
+        """
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            handle.write(self.render_prometheus())
+        os.replace(tmp, path)
+        return path
+
+    def _series(self, name: str, kind: str, help: str, labels: Labels, factory: Callable[[], Metric]):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (kind, help, {})
+            elif family[0] != kind:
+                raise ValueError(f"Metric {name!r} is a {family[0]}, not a {kind}")
+            series = family[2]
+            metric = series.get(labels)
+            if metric is None:
+                metric = series[labels] = factory()
+            return metric
+
+    def _copy(self) -> Dict[str, Tuple[str, str, Dict[Labels, Metric]]]:
+        with self._lock:
+            return {name: (kind, help, dict(series)) for name, (kind, help, series) in self._families.items()}
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
@@ -0,0 +1,209 @@
+"""
+Inventory Outbox
+
+This module implements the outbox pattern for publishing inventory events
+(see docs/architecture.md): events are committed to a local store as part
+of handling a command, and a background relay publishes them afterwards.
+
+An SQLiteOutbox is passed to InventoryCommandHandler as its outbox. The
+handler writes the events of each command, or of a whole handle_batch(),
+in one SQLite transaction while it holds the stripe locks, before the
+ledger keeps the change: if the insert fails, the command is rolled back
+and the error raised, so the outbox and the ledger never disagree. The
+command path only pays for a local insert instead of a round trip to the
+broker. OutboxRelay drains the outbox in configurable batches on its own
+thread and deletes rows only after they were published, giving
+at-least-once delivery across restarts.
+
+When the relay falls behind, max_pending bounds the outbox: writers wait
+for the relay to catch up instead of letting the backlog grow without limit.
+The handler waits before it takes any lock, so a full outbox slows commands
+down without blocking writers to unrelated stock or the relay. Concurrent
+writers can each pass the check at once, so the outbox may overshoot
+max_pending by one batch per writer.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from .eventstore import decode_event, encode_event
+
+Publisher = Callable[[Sequence[object]], None]
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, event BLOB NOT NULL)"
+
+
+class SQLiteOutbox:
+    """
+    Durable queue of events awaiting publication, backed by SQLite.
+
+    Writers and the relay use separate connections; the database runs in
+    WAL mode so reading a batch never blocks inserts.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_pending: Optional[int] = None,
+    ):
+        self.path = Path(path)
+        self.max_pending = max_pending
+        self._writer = self._connect()
+        self._writer.execute(_SCHEMA)
+        self._writer.commit()
+        self._reader = self._connect()
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._arrived = threading.Event()
+        (self._pending,) = self._writer.execute("SELECT COUNT(*) FROM outbox").fetchone()
+        if self._pending:
+            self._arrived.set()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level="DEFERRED")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def wait_for_space(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until fewer than max_pending events are waiting, or the timeout
+        passes; return whether there is space.
+        """
+        if self.max_pending is None:
+            return True
+        with self._space:
+            return self._space.wait_for(lambda: self._pending < self.max_pending, timeout)
+
+    def write(self, events: Sequence[object]) -> None:
+        """Insert events in one transaction; if it raises, none of them were inserted."""
+        rows = [(encode_event(event),) for event in events]
+        with self._lock:
+            with self._writer:
+                self._writer.executemany("INSERT INTO outbox (event) VALUES (?)", rows)
+            self._pending += len(rows)
+        self._arrived.set()
+
+    def fetch(self, limit: int) -> List[Tuple[int, object]]:
+        """Return up to limit (row id, event) pairs, oldest first."""
+        rows = self._reader.execute("SELECT id, event FROM outbox ORDER BY id LIMIT ?", (limit,)).fetchall()
+        return [(row_id, decode_event(event)[0]) for row_id, event in rows]
+
+    def acknowledge(self, last_id: int) -> None:
+        """Delete every row up to and including last_id once it has been published."""
+        with self._space:
+            with self._writer:
+                deleted = self._writer.execute("DELETE FROM outbox WHERE id <= ?", (last_id,)).rowcount
+            self._pending -= deleted
+            if not self._pending:
+                self._arrived.clear()
+            self._space.notify_all()
+
+    def wait_for_events(self, timeout: Optional[float]) -> bool:
+        """Block until events are pending, wake() is called or the timeout passes."""
+        arrived = self._arrived.wait(timeout)
+        with self._lock:
+            if not self._pending:
+                self._arrived.clear()
+        return arrived
+
+    def wake(self) -> None:
+        """Wake the caller blocked in wait_for_events(), even with nothing pending."""
+        self._arrived.set()
+
+    def close(self) -> None:
+        with self._lock:
+            self._writer.close()
+            self._reader.close()
+
+
+class OutboxRelay:
+    """
+    Background thread that publishes outbox events in batches.
+
+    publish receives each batch in outbox order. If it raises, the batch
+    stays in the outbox and is retried after retry_delay, so subscribers
+    must tolerate seeing an event more than once.
+    """
+
+    def __init__(
+        self,
+        outbox: SQLiteOutbox,
+        publish: Publisher,
+        batch_size: int = 500,
+        poll_interval: float = 0.5,
+        retry_delay: float = 1.0,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.outbox = outbox
+        self.publish = publish
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.published = 0
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "OutboxRelay":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="inventory-outbox-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the relay once the outbox is drained, publishing fails, or
+        timeout seconds pass. Events left behind stay in the outbox.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (
+            len(self.outbox)
+            and self.last_error is None
+            and self._thread is not None
+            and (deadline is None or time.monotonic() < deadline)
+        ):
+            time.sleep(0.005)
+        self._stopping.set()
+        self.outbox.wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def relay_once(self) -> int:
+        """Publish one batch from the outbox; return how many events it held."""
+        rows = self.outbox.fetch(self.batch_size)
+        if not rows:
+            return 0
+        self.publish([event for _, event in rows])
+        self.outbox.acknowledge(rows[-1][0])
+        self.published += len(rows)
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if self.relay_once():
+                    self.last_error = None
+                    continue
+            except Exception as exc:
+                self.failures += 1
+                self.last_error = exc
+                self._stopping.wait(self.retry_delay)
+                continue
+            self.outbox.wait_for_events(self.poll_interval)
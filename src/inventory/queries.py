@@ -3,4 +3,238 @@ Inventory Queries
 
 This module defines queries for retrieving inventory information.
 Queries are read-only operations that don't modify state.
+
+Queries are answered from an AvailabilityProjection: available-to-promise
+quantities per (product, location), per product and per location, kept up
+to date by applying each emitted event as a delta. Every query is therefore
+a single dictionary lookup, however many locations hold a product.
+
+A BatchAvailabilityQuery checks a whole order or cart in one call. Its lines
+arrive as parallel sequences of Python strings and ints; when they share a
+location, as a checkout usually does, they are looked up with one map()
+over that location's product dictionary, so the per-line work runs inside
+the interpreter's C loops instead of as one Python-level query per line.
+It is a batched dictionary lookup, not a vectorized one: NumPy arrays must
+be converted with tolist() first, and whole-catalogue analytics belong on
+the ColumnarStockProjection.
 """
+from __future__ import annotations
+
+import operator
+import threading
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from ._validation import require_id, require_ids, require_positive_ints
+from .errors import UnsupportedQueryError
+from .events import AVAILABLE_DELTAS
+from .ledger import StockKey, StockLedger
+
+
+@dataclass(frozen=True, slots=True)
+class AvailabilityQuery:
+    """
+    Query for available-to-promise stock of one product at one location.
+
+    Expected Fields:
+        product_id: Identifier for the product
+        location_id: Storage location identifier
+    """
+
+    product_id: str
+    location_id: str
+
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+        require_id("location_id", self.location_id)
+
+
+@dataclass(frozen=True, slots=True)
+class ProductAvailabilityQuery:
+    """
+    Query for available-to-promise stock of a product across all locations.
+
+    Expected Fields:
+        product_id: Identifier for the product
+    """
+
+    product_id: str
+
+    def __post_init__(self):
+        require_id("product_id", self.product_id)
+
+
+@dataclass(frozen=True, slots=True)
+class LocationAvailabilityQuery:
+    """
+    Query for available-to-promise stock of all products at a location.
+
+    Expected Fields:
+        location_id: Storage location identifier
+    """
+
+    location_id: str
+
+    def __post_init__(self):
+        require_id("location_id", self.location_id)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchAvailabilityQuery:
+    """
+    Query whether every line of an order or cart can be promised.
+
+    Lines are given as parallel sequences: line i asks for quantities[i] of
+    product_ids[i] at location_ids[i]. Items must be str and int exactly;
+    NumPy scalars are rejected, naming the first offending line.
+
+    Expected Fields:
+        product_ids: Product identifier of each line
+        location_ids: Storage location identifier of each line
+        quantities: Quantity each line asks for
+    """
+
+    product_ids: Tuple[str, ...]
+    location_ids: Tuple[str, ...]
+    quantities: Tuple[int, ...]
+
+    def __post_init__(self):
+        if not len(self.product_ids) == len(self.location_ids) == len(self.quantities):
+            raise ValueError("product_ids, location_ids and quantities must have the same length")
+        require_ids("product_ids", self.product_ids)
+        require_ids("location_ids", self.location_ids)
+        require_positive_ints("quantities", self.quantities)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchAvailability:
+    """
+    Answer to a BatchAvailabilityQuery, one entry per line in query order.
+
+    Expected Fields:
+        available: Available quantity of each line's product at its location
+        promisable: Whether each line can be promised; lines naming the same
+            product and location are checked against their combined quantity
+    """
+
+    available: Tuple[int, ...]
+    promisable: Tuple[bool, ...]
+
+    @property
+    def all_promisable(self) -> bool:
+        return all(self.promisable)
+
+
+_NO_STOCK: Dict[str, int] = {}
+
+
+class AvailabilityProjection:
+    """
+    Read model of available quantities, maintained incrementally from events.
+
+    Register it as a command handler listener, or seed it from a recovered
+    ledger with from_ledger() and register it afterwards. Updates are
+    serialized by a lock because the per-product and per-location totals
+    are shared by writers on different stock keys; reads take no lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # location_id -> product_id -> available, so lines of one location
+        # are looked up by product id alone.
+        self._by_location_product: Dict[str, Dict[str, int]] = {}
+        self._by_product: Dict[str, int] = {}
+        self._by_location: Dict[str, int] = {}
+
+    @classmethod
+    def from_ledger(cls, ledger: StockLedger) -> "AvailabilityProjection":
+        """Build a projection matching the ledger's current stock levels."""
+        projection = cls()
+        for key, level in ledger.levels():
+            projection._add(key, level.available)
+        return projection
+
+    def __call__(self, events: Sequence[object]) -> None:
+        deltas = AVAILABLE_DELTAS
+        with self._lock:
+            for event in events:
+                delta = deltas[type(event)](event)
+                if delta:
+                    self._add((event.product_id, event.location_id), delta)
+
+    def available(self, product_id: str, location_id: str) -> int:
+        """Available quantity of a product at a location (0 when untracked)."""
+        return self._by_location_product.get(location_id, _NO_STOCK).get(product_id, 0)
+
+    def available_many(self, product_ids: Sequence[str], location_ids: Sequence[str]) -> List[int]:
+        """Available quantity of product_ids[i] at location_ids[i], for each i."""
+        stock = self._by_location_product
+        if len(set(location_ids)) == 1:
+            by_product = stock.get(location_ids[0], _NO_STOCK)
+            return list(map(by_product.get, product_ids, repeat(0, len(product_ids))))
+        return [
+            stock.get(location_id, _NO_STOCK).get(product_id, 0)
+            for product_id, location_id in zip(product_ids, location_ids)
+        ]
+
+    def available_for_product(self, product_id: str) -> int:
+        """Available quantity of a product summed over all locations."""
+        return self._by_product.get(product_id, 0)
+
+    def available_at_location(self, location_id: str) -> int:
+        """Available quantity of all products at a location."""
+        return self._by_location.get(location_id, 0)
+
+    def _add(self, key: StockKey, delta: int) -> None:
+        product_id, location_id = key
+        by_product = self._by_location_product.get(location_id)
+        if by_product is None:
+            by_product = self._by_location_product[location_id] = {}
+        by_product[product_id] = by_product.get(product_id, 0) + delta
+        self._by_product[product_id] = self._by_product.get(product_id, 0) + delta
+        self._by_location[location_id] = self._by_location.get(location_id, 0) + delta
+
+
+class InventoryQueryHandler:
+    """
+    Query handler engine for the inventory domain.
+
+    Routing is a single dictionary lookup on the query type, and each route
+    reads precomputed totals from the projection.
+    """
+
+    def __init__(self, projection: AvailabilityProjection):
+        self.projection = projection
+        self._routes: Dict[type, Callable[[object], object]] = {
+            AvailabilityQuery: lambda query: projection.available(query.product_id, query.location_id),
+            ProductAvailabilityQuery: lambda query: projection.available_for_product(query.product_id),
+            LocationAvailabilityQuery: lambda query: projection.available_at_location(query.location_id),
+            BatchAvailabilityQuery: self._batch_availability,
+        }
+
+    def handle(self, query: object) -> object:
+        """
+        Answer a query: an available quantity, or a BatchAvailability for a
+        BatchAvailabilityQuery.
+        """
+        route = self._routes.get(type(query))
+        if route is None:
+            raise UnsupportedQueryError(f"No handler for {type(query).__name__}")
+        return route(query)
+
+    def _batch_availability(self, query: BatchAvailabilityQuery) -> BatchAvailability:
+        available = self.projection.available_many(query.product_ids, query.location_ids)
+        demand = query.quantities
+        if len(set(query.location_ids)) > 1:
+            keys: Sequence[object] = list(zip(query.product_ids, query.location_ids))
+        else:
+            keys = query.product_ids
+        if len(set(keys)) != len(keys):
+            # Repeated lines draw on the same stock: compare each line's key
+            # against the quantity all of the key's lines ask for together.
+            totals: Dict[object, int] = {}
+            for key, quantity in zip(keys, demand):
+                totals[key] = totals.get(key, 0) + quantity
+            demand = list(map(totals.__getitem__, keys))
+        return BatchAvailability(tuple(available), tuple(map(operator.le, demand, available)))
@@ -0,0 +1,326 @@
+"""
+Inventory Sharding
+
+This module runs the inventory engine as several worker processes, each
+owning the ledger for one partition of the products.
+
+Products are assigned to shards by a stable hash of product_id, so every
+command touching a product is handled by the same worker and workers never
+share state. The router in the parent process groups submitted commands by
+shard and sends each group over that worker's queue as one message; a
+release or dispatch is sent to the shard its reservation was routed to.
+Each worker is an ordinary InventoryCommandHandler, optionally persisting
+its events to its own EventStore, so throughput grows with the number of
+cores available to the workers.
+
+Commands and events cross process boundaries as plain tuples of their
+field values rather than pickled dataclasses. They were validated when
+first constructed, so the receiving side rebuilds them without validating
+again; this keeps queue overhead well below the cost of handling them.
+"""
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import queue
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from .errors import DuplicateReservationError, UnsupportedCommandError
+from .events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+from .handlers import InventoryCommandHandler
+from .queries import (
+    AvailabilityProjection,
+    AvailabilityQuery,
+    InventoryQueryHandler,
+    LocationAvailabilityQuery,
+    ProductAvailabilityQuery,
+)
+
+# How often a caller waiting on the workers checks that they are all alive.
+_LIVENESS_POLL_SECONDS = 0.2
+
+# Wire tags are indexes into this tuple; both sides import the same module.
+# Types missing from it are still accepted and travel pickled.
+_WIRE_TYPES: Tuple[type, ...] = (
+    AddStockCommand,
+    ReserveStockCommand,
+    ReleaseReservationCommand,
+    DispatchStockCommand,
+    AdjustStockCommand,
+    AvailabilityQuery,
+    ProductAvailabilityQuery,
+    LocationAvailabilityQuery,
+    StockReceived,
+    StockReserved,
+    ReservationReleased,
+    StockDispatched,
+    StockAdjusted,
+)
+_WIRE_TAGS: Dict[type, int] = {cls: tag for tag, cls in enumerate(_WIRE_TYPES)}
+_WIRE_NAMES: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(f.name for f in dataclasses.fields(cls)) for cls in _WIRE_TYPES
+)
+_WIRE_SETTERS: Tuple[Tuple[Callable[[object, object], None], ...], ...] = tuple(
+    tuple(getattr(cls, name).__set__ for name in names) for cls, names in zip(_WIRE_TYPES, _WIRE_NAMES)
+)
+
+
+class ShardWorkerError(RuntimeError):
+    """Raised when a shard worker process has died, at startup or later."""
+
+
+def _to_wire(value: object) -> object:
+    tag = _WIRE_TAGS.get(type(value))
+    if tag is None:
+        return value
+    return (tag, *[getattr(value, name) for name in _WIRE_NAMES[tag]])
+
+
+def _from_wire(value: object) -> object:
+    if type(value) is not tuple:
+        return value
+    tag = value[0]
+    obj = object.__new__(_WIRE_TYPES[tag])
+    for set_value, field_value in zip(_WIRE_SETTERS[tag], value[1:]):
+        set_value(obj, field_value)
+    return obj
+
+
+def shard_for(product_id: str, shards: int) -> int:
+    """Return the shard owning a product; stable across processes and runs."""
+    return zlib.crc32(product_id.encode("utf-8")) % shards
+
+
+def _serve(
+    index: int,
+    requests: "multiprocessing.Queue",
+    replies: "multiprocessing.Queue",
+    directory: Optional[str],
+) -> None:
+    """Worker process loop: handle command batches for one shard until told to stop."""
+    store = None
+    if directory is not None:
+        from .eventstore import EventStore
+        from .snapshots import recover_ledger
+
+        store = EventStore(Path(directory) / f"shard-{index:02d}")
+        ledger, _ = recover_ledger(store)
+        handler = InventoryCommandHandler(ledger, listeners=[store.append])
+    else:
+        handler = InventoryCommandHandler()
+    projection = AvailabilityProjection.from_ledger(handler.ledger)
+    handler.add_listener(projection)
+    queries = InventoryQueryHandler(projection)
+    query_types = (AvailabilityQuery, ProductAvailabilityQuery, LocationAvailabilityQuery)
+
+    try:
+        # Request id 0 announces the reservations recovered on this shard, so
+        # the router can send their releases and dispatches here.
+        replies.put((0, index, [r.reservation_id for r in handler.ledger.reservations()]))
+        while True:
+            message = requests.get()
+            if message is None:
+                return
+            request_id, items = message
+            results: List[object] = []
+            for item in items:
+                item = _from_wire(item)
+                try:
+                    if type(item) in query_types:
+                        results.append(queries.handle(item))
+                    else:
+                        results.append(_to_wire(handler.handle(item)))
+                except Exception as exc:
+                    # Returned rather than raised, so one bad command neither
+                    # kills the worker nor fails the rest of the batch.
+                    results.append(exc)
+            replies.put((request_id, index, results))
+    finally:
+        if store is not None:
+            store.close()
+
+
+class ShardedInventoryEngine:
+    """
+    Inventory engine partitioned by product across worker processes.
+
+    handle_many() is the throughput path: it returns one result per command,
+    in submission order, where a result is either the emitted event or the
+    exception (usually an InventoryError) the owning shard raised for it.
+    Calls are serialized, so one engine may be shared by several threads of
+    the parent process. If a worker process dies, at startup or later, calls
+    raise ShardWorkerError instead of waiting for its reply.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        directory: Union[str, Path, None] = None,
+        context: Optional[multiprocessing.context.BaseContext] = None,
+    ):
+        if shards < 1:
+            raise ValueError(f"shards must be positive, got {shards}")
+        context = context if context is not None else multiprocessing.get_context()
+        self.shards = shards
+        self._lock = threading.Lock()
+        self._request_id = 0
+        self._reservation_shards: Dict[str, int] = {}
+        self._replies = context.Queue()
+        self._requests = [context.Queue() for _ in range(shards)]
+        self._workers = [
+            context.Process(
+                target=_serve,
+                args=(index, self._requests[index], self._replies, None if directory is None else str(directory)),
+                name=f"inventory-shard-{index:02d}",
+                daemon=True,
+            )
+            for index in range(shards)
+        ]
+        for worker in self._workers:
+            worker.start()
+        try:
+            for _ in range(shards):
+                _, shard, reservation_ids = self._receive()
+                self._reservation_shards.update(dict.fromkeys(reservation_ids, shard))
+        except ShardWorkerError:
+            for worker in self._workers:
+                worker.terminate()
+                worker.join()
+            raise
+
+    def __enter__(self) -> "ShardedInventoryEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def shard_of(self, command: object) -> int:
+        """Return the shard a command or product query is routed to."""
+        cls = type(command)
+        if cls is ReserveStockCommand or cls is AddStockCommand:
+            return shard_for(command.product_id, self.shards)
+        if cls is ReleaseReservationCommand or cls is DispatchStockCommand:
+            shard = self._reservation_shards.get(command.reservation_id)
+            # An unknown reservation is sent to shard 0, which reports it as not open.
+            return 0 if shard is None else shard
+        if cls is AdjustStockCommand:
+            return shard_for(command.stock_id[0], self.shards)
+        if cls is AvailabilityQuery or cls is ProductAvailabilityQuery:
+            return shard_for(command.product_id, self.shards)
+        raise UnsupportedCommandError(f"No shard route for {cls.__name__}")
+
+    def handle(self, command: object) -> object:
+        """Handle one command, raising the error its shard reported."""
+        (result,) = self.handle_many((command,))
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def handle_many(self, commands: Sequence[object]) -> List[object]:
+        """Handle commands on their owning shards, one message per shard."""
+        with self._lock:
+            ordered: List[object] = [None] * len(commands)
+            routed: List[Optional[int]] = [None] * len(commands)
+            groups: Dict[int, List[int]] = {}
+            reservation_shards = self._reservation_shards
+            # Reservations opened (shard) or closed (None) earlier in this call.
+            # The routing table itself only changes once the shards confirm.
+            claimed: Dict[str, Optional[int]] = {}
+            for position, command in enumerate(commands):
+                cls = type(command)
+                if cls is ReserveStockCommand or cls is ReleaseReservationCommand or cls is DispatchStockCommand:
+                    reservation_id = command.reservation_id
+                    if reservation_id in claimed:
+                        owner = claimed[reservation_id]
+                    else:
+                        owner = reservation_shards.get(reservation_id)
+                    if cls is ReserveStockCommand:
+                        # Shards only see their own reservations, so identifiers
+                        # are kept unique across shards here.
+                        if owner is not None:
+                            ordered[position] = DuplicateReservationError(
+                                f"Reservation {reservation_id!r} already exists"
+                            )
+                            continue
+                        shard = claimed[reservation_id] = shard_for(command.product_id, self.shards)
+                    else:
+                        # An unknown reservation is sent to shard 0, which reports it as not open.
+                        shard = 0 if owner is None else owner
+                        claimed[reservation_id] = None
+                else:
+                    shard = self.shard_of(command)
+                routed[position] = shard
+                groups.setdefault(shard, []).append(position)
+            results = self._exchange({
+                shard: [_to_wire(commands[position]) for position in positions]
+                for shard, positions in groups.items()
+            })
+            for shard, positions in groups.items():
+                for position, result in zip(positions, results[shard]):
+                    ordered[position] = _from_wire(result)
+            # Applied in submission order, so a reservation closed and opened
+            # again within one call ends up routed by the last success.
+            for position, command in enumerate(commands):
+                shard = routed[position]
+                if shard is None or isinstance(ordered[position], Exception):
+                    continue
+                cls = type(command)
+                if cls is ReserveStockCommand:
+                    reservation_shards[command.reservation_id] = shard
+                elif cls is ReleaseReservationCommand or cls is DispatchStockCommand:
+                    reservation_shards.pop(command.reservation_id, None)
+            return ordered
+
+    def available_at_location(self, location_id: str) -> int:
+        """Available quantity of all products at a location, summed over every shard."""
+        query = _to_wire(LocationAvailabilityQuery(location_id))
+        with self._lock:
+            results = self._exchange({shard: [query] for shard in range(self.shards)})
+        return sum(result for (result,) in results.values())
+
+    def close(self) -> None:
+        """Stop the workers after they finish the messages already queued."""
+        for requests in self._requests:
+            requests.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _exchange(self, batches: Dict[int, List[object]]) -> Dict[int, List[object]]:
+        self._request_id += 1
+        request_id = self._request_id
+        for shard, items in batches.items():
+            self._requests[shard].put((request_id, items))
+        results: Dict[int, List[object]] = {}
+        while len(results) < len(batches):
+            reply_id, shard, items = self._receive()
+            if reply_id == request_id:
+                results[shard] = items
+        return results
+
+    def _receive(self) -> Tuple[int, int, object]:
+        """Wait for the next worker reply, raising ShardWorkerError if a worker has died."""
+        while True:
+            try:
+                return self._replies.get(timeout=_LIVENESS_POLL_SECONDS)
+            except queue.Empty:
+                dead = [worker for worker in self._workers if not worker.is_alive()]
+                if dead:
+                    raise ShardWorkerError(", ".join(
+                        f"{worker.name} exited with code {worker.exitcode}" for worker in dead
+                    )) from None
@@ -0,0 +1,314 @@
+"""
+Inventory Snapshots
+
+This module persists compact snapshots of the StockLedger so that startup
+does not have to replay the whole event log.
+
+Each snapshot records the ledger state together with the event store offset
+it covers: every event before that offset is folded into the snapshot. On
+startup, recover_ledger() loads the newest readable snapshot and replays only
+the events appended after it.
+
+Snapshot layout (little endian):
+    magic         b"INVSNP3\\n"
+    header        u64 offset, u32 symbols, u32 levels, u32 reservations,
+                  u32 batches
+    symbols       u16 length + UTF-8 bytes, per product/location/batch
+                  identifier
+    levels        u32 product, u32 location, i64 on_hand, i64 reserved
+    reservations  u32 product, u32 location, i64 quantity, f64 expiration
+                  time, u16 id length, u16 allocations, then the id and
+                  u32 batch + i64 quantity per allocation
+    batches       u32 product, u32 location, u32 batch, f64 expiration time,
+                  i64 unallocated quantity
+    trailer       u32 crc32 of everything before it
+
+Absent expiration times are stored as NaN and the unbatched pool as batch
+0xFFFFFFFF. Batch rows also cover exhausted batches that open reservations
+were allocated from, so releasing those reservations keeps their expiry.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from .eventstore import EventStore
+from .ledger import Reservation, StockKey, StockLedger
+
+SNAPSHOT_MAGIC = b"INVSNP3\n"
+SNAPSHOT_SUFFIX = ".snap"
+
+_HEADER = struct.Struct("<QIIII")
+_STR_LEN = struct.Struct("<H")
+_LEVEL = struct.Struct("<IIqq")
+_RESERVATION = struct.Struct("<IIqdHH")
+_ALLOCATION = struct.Struct("<Iq")
+_BATCH = struct.Struct("<IIIdq")
+_CRC = struct.Struct("<I")
+_NAN = float("nan")
+_NO_BATCH = 0xFFFFFFFF
+
+
+class CorruptSnapshotError(ValueError):
+    """Raised when a snapshot file fails its magic or checksum."""
+
+
+def _optional_time(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+def encode_snapshot(ledger: StockLedger, offset: int) -> bytes:
+    """Serialize a ledger and the event offset it covers."""
+    symbols: Dict[str, int] = {}
+
+    def symbol(value: str) -> int:
+        index = symbols.get(value)
+        if index is None:
+            index = symbols[value] = len(symbols)
+        return index
+
+    levels = [
+        _LEVEL.pack(symbol(product_id), symbol(location_id), level.on_hand, level.reserved)
+        for (product_id, location_id), level in ledger.levels()
+    ]
+    def batch_symbol(batch_id: Optional[str]) -> int:
+        return _NO_BATCH if batch_id is None else symbol(batch_id)
+
+    reservations = []
+    reservation_count = 0
+    # Batches open reservations were allocated from, per key.
+    allocated: Dict[StockKey, Set[Optional[str]]] = {}
+    for reservation in ledger.reservations():
+        raw_id = reservation.reservation_id.encode("utf-8")
+        reservations.append(_RESERVATION.pack(
+            symbol(reservation.product_id),
+            symbol(reservation.location_id),
+            reservation.quantity,
+            _optional_time(reservation.expiration_time),
+            len(raw_id),
+            len(reservation.allocation),
+        ))
+        reservations.append(raw_id)
+        if reservation.allocation:
+            held = allocated.setdefault(reservation.key, set())
+            for batch_id, quantity in reservation.allocation:
+                reservations.append(_ALLOCATION.pack(batch_symbol(batch_id), quantity))
+                held.add(batch_id)
+        reservation_count += 1
+    batches = []
+    for key, index in ledger.batch_indexes():
+        product, location = symbol(key[0]), symbol(key[1])
+        rows = {batch_id: (expiration_time, quantity) for batch_id, expiration_time, quantity in index.batches()}
+        for batch_id in allocated.get(key, ()):
+            if batch_id not in rows:
+                rows[batch_id] = (index.expiration_time(batch_id), 0)
+        for batch_id, (expiration_time, quantity) in rows.items():
+            batches.append(_BATCH.pack(
+                product, location, batch_symbol(batch_id), _optional_time(expiration_time), quantity,
+            ))
+    strings = []
+    for value in symbols:
+        raw = value.encode("utf-8")
+        strings.append(_STR_LEN.pack(len(raw)))
+        strings.append(raw)
+    body = b"".join([
+        SNAPSHOT_MAGIC,
+        _HEADER.pack(offset, len(symbols), len(levels), reservation_count, len(batches)),
+        *strings,
+        *levels,
+        *reservations,
+        *batches,
+    ])
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def decode_snapshot(data: bytes) -> Tuple[StockLedger, int]:
+    """Rebuild a ledger from snapshot bytes, returning it with the offset it covers."""
+    if len(data) < len(SNAPSHOT_MAGIC) + _HEADER.size + _CRC.size or not data.startswith(SNAPSHOT_MAGIC):
+        raise CorruptSnapshotError("Not an inventory snapshot")
+    (crc,) = _CRC.unpack_from(data, len(data) - _CRC.size)
+    body = memoryview(data)[:len(data) - _CRC.size]
+    if zlib.crc32(body) != crc:
+        raise CorruptSnapshotError("Snapshot checksum mismatch")
+
+    pos = len(SNAPSHOT_MAGIC)
+    offset, symbol_count, level_count, reservation_count, batch_count = _HEADER.unpack_from(data, pos)
+    pos += _HEADER.size
+    symbols: List[str] = []
+    for _ in range(symbol_count):
+        (length,) = _STR_LEN.unpack_from(data, pos)
+        pos += _STR_LEN.size
+        symbols.append(str(body[pos:pos + length], "utf-8"))
+        pos += length
+    end = pos + level_count * _LEVEL.size
+    levels = [
+        ((symbols[product], symbols[location]), on_hand, reserved)
+        for product, location, on_hand, reserved in _LEVEL.iter_unpack(body[pos:end])
+    ]
+    pos = end
+    reservations = []
+    for _ in range(reservation_count):
+        product, location, quantity, expiration_time, length, allocations = _RESERVATION.unpack_from(data, pos)
+        pos += _RESERVATION.size
+        reservation_id = str(body[pos:pos + length], "utf-8")
+        pos += length
+        allocation = []
+        for _ in range(allocations):
+            batch, allocated = _ALLOCATION.unpack_from(data, pos)
+            pos += _ALLOCATION.size
+            allocation.append((None if batch == _NO_BATCH else symbols[batch], allocated))
+        reservations.append(Reservation(
+            reservation_id,
+            symbols[product],
+            symbols[location],
+            quantity,
+            None if expiration_time != expiration_time else expiration_time,
+            tuple(allocation),
+        ))
+    end = pos + batch_count * _BATCH.size
+    batches = [
+        (
+            (symbols[product], symbols[location]),
+            None if batch == _NO_BATCH else symbols[batch],
+            None if expiration_time != expiration_time else expiration_time,
+            quantity,
+        )
+        for product, location, batch, expiration_time, quantity in _BATCH.iter_unpack(body[pos:end])
+    ]
+    body.release()
+    return StockLedger.from_state(levels, reservations, batches), offset
+
+
+class SnapshotStore:
+    """
+    Directory of ledger snapshots named after the offset they cover.
+
+    Snapshots are written to a temporary file and renamed into place, so a
+    crash mid-write never leaves a partial snapshot behind. Only the newest
+    `keep` snapshots are retained.
+    """
+
+    def __init__(self, directory: Union[str, Path], keep: int = 2):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = max(keep, 1)
+
+    def paths(self) -> List[Path]:
+        """Snapshot files, oldest first."""
+        return sorted(self.directory.glob(f"*{SNAPSHOT_SUFFIX}"))
+
+    def save(self, ledger: StockLedger, offset: int) -> Path:
+        """Write a snapshot of the ledger covering events before offset."""
+        return self.save_encoded(encode_snapshot(ledger, offset), offset)
+
+    def save_encoded(self, data: bytes, offset: int) -> Path:
+        """Write snapshot bytes from encode_snapshot() covering events before offset."""
+        path = self.directory / f"{offset:020d}{SNAPSHOT_SUFFIX}"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+        for stale in self.paths()[:-self.keep]:
+            stale.unlink()
+        return path
+
+    def load_latest(self) -> Optional[Tuple[StockLedger, int]]:
+        """Load the newest readable snapshot, skipping corrupt ones."""
+        for path in reversed(self.paths()):
+            try:
+                return decode_snapshot(path.read_bytes())
+            except CorruptSnapshotError:
+                continue
+        return None
+
+
+def recover_ledger(
+    event_store: EventStore,
+    snapshot_store: Optional[SnapshotStore] = None,
+) -> Tuple[StockLedger, int]:
+    """
+    Rebuild the ledger from the latest snapshot plus the events after it.
+
+    Returns the ledger and the number of events replayed from the log.
+    """
+    loaded = snapshot_store.load_latest() if snapshot_store is not None else None
+    if loaded is None or loaded[1] > event_store.next_offset:
+        ledger, offset = StockLedger(), 0
+    else:
+        ledger, offset = loaded
+    apply = ledger.apply
+    replayed = 0
+    for event in event_store.replay(offset):
+        apply(event)
+        replayed += 1
+    return ledger, replayed
+
+
+class Snapshotter:
+    """
+    Handler listener that snapshots the ledger every `every_events` events.
+
+    Register it after the event store so the offset it records already
+    includes the batch that triggered the snapshot.
+
+    A snapshot is taken holding every stripe lock of the ledger, like
+    handle_batch(), so no writer is between applying its events and
+    appending them to the store while the state and offset are read. The
+    listener runs with the triggering events' stripes already held, and
+    waiting there for the others could deadlock against a writer holding
+    one of them, so it only snapshots when every lock is free at once;
+    otherwise the snapshot stays due and is tried again on the next events.
+    """
+
+    def __init__(
+        self,
+        ledger: StockLedger,
+        event_store: EventStore,
+        snapshot_store: SnapshotStore,
+        every_events: int = 1_000_000,
+    ):
+        self.ledger = ledger
+        self.event_store = event_store
+        self.snapshot_store = snapshot_store
+        self.every_events = every_events
+        self._since_snapshot = 0
+        self._saving = threading.Lock()
+
+    def __call__(self, events: Sequence[object]) -> None:
+        self._since_snapshot += len(events)
+        if self._since_snapshot >= self.every_events:
+            self._save(blocking=False)
+
+    def snapshot(self) -> Path:
+        """
+        Snapshot the ledger now, waiting for writers in flight to finish.
+
+        Call it from outside the command path, never from a listener.
+        """
+        return self._save(blocking=True)
+
+    def _save(self, blocking: bool) -> Optional[Path]:
+        if not self._saving.acquire(blocking):
+            return None
+        try:
+            held: List[threading.RLock] = []
+            try:
+                for lock in self.ledger.all_locks():
+                    if not lock.acquire(blocking):
+                        return None
+                    held.append(lock)
+                offset = self.event_store.next_offset
+                data = encode_snapshot(self.ledger, offset)
+            finally:
+                for lock in reversed(held):
+                    lock.release()
+            self._since_snapshot = 0
+            return self.snapshot_store.save_encoded(data, offset)
+        finally:
+            self._saving.release()
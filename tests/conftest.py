@@ -0,0 +1,7 @@
+"""Put the inventory package and the planning scripts on sys.path for the test suite."""
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "planning"))
@@ -0,0 +1,18 @@
+import pytest
+
+
+def _ledger_state(ledger):
+    """Everything a ledger holds, as plain values that compare by content."""
+    return (
+        {key: (level.on_hand, level.reserved) for key, level in ledger.levels()},
+        {
+            r.reservation_id: (r.product_id, r.location_id, r.quantity, r.expiration_time, r.allocation)
+            for r in ledger.reservations()
+        },
+        {key: list(index.batches()) for key, index in ledger.batch_indexes()},
+    )
+
+
+@pytest.fixture
+def ledger_state():
+    return _ledger_state
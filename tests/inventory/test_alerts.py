@@ -0,0 +1,123 @@
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.alerts import LowStockDetector
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+
+KEY = ("milk", "store-1")
+
+
+def detector(handler, **options):
+    published = []
+    return LowStockDetector(handler, published.extend, **options), published
+
+
+def test_warns_once_when_available_stock_crosses_the_reorder_point():
+    handler = InventoryCommandHandler()
+    watcher, warnings = detector(handler, reorder_points={KEY: 5})
+    handler.handle(AddStockCommand("milk", 10, "store-1"))
+
+    handler.handle(ReserveStockCommand("milk", 4, "r1", "store-1"))
+    assert warnings == []
+    handler.handle(ReserveStockCommand("milk", 1, "r2", "store-1"))
+    handler.handle(AdjustStockCommand(KEY, -2, "spoiled"))
+    handler.handle(DispatchStockCommand("r1", "customer-1"))
+
+    assert [(w.product_id, w.location_id, w.available, w.reorder_point) for w in warnings] == [
+        ("milk", "store-1", 5, 5)
+    ]
+    assert watcher.is_low("milk", "store-1")
+
+
+def test_hysteresis_rearms_only_above_the_band():
+    handler = InventoryCommandHandler()
+    watcher, warnings = detector(handler, default_reorder_point=5, hysteresis=3)
+    handler.handle(AddStockCommand("milk", 5, "store-1"))
+    assert len(warnings) == 1
+
+    handler.handle(AddStockCommand("milk", 3, "store-1"))
+    handler.handle(AdjustStockCommand(KEY, -1, "damaged"))
+    assert len(warnings) == 1 and watcher.is_low(*KEY)
+
+    handler.handle(AddStockCommand("milk", 2, "store-1"))
+    assert not watcher.is_low(*KEY)
+    handler.handle(ReserveStockCommand("milk", 4, "r1", "store-1"))
+    handler.handle(ReleaseReservationCommand("r1"))
+    handler.handle(ReserveStockCommand("milk", 5, "r2", "store-1"))
+    assert [w.available for w in warnings] == [5, 5, 4]
+
+
+def test_unwatched_keys_never_warn():
+    handler = InventoryCommandHandler()
+    watcher, warnings = detector(handler, reorder_points={KEY: 5})
+    handler.handle(AddStockCommand("eggs", 1, "store-1"))
+    assert warnings == [] and watcher.reorder_point("eggs", "store-1") is None
+
+
+def test_seeds_from_the_ledger_without_publishing():
+    handler = InventoryCommandHandler()
+    handler.handle(AddStockCommand("milk", 3, "store-1"))
+    handler.handle(AddStockCommand("eggs", 30, "store-1"))
+    watcher, warnings = detector(handler, default_reorder_point=5)
+
+    assert watcher.is_low("milk", "store-1") and not watcher.is_low("eggs", "store-1")
+    handler.handle(ReserveStockCommand("milk", 1, "r1", "store-1"))
+    handler.handle(ReserveStockCommand("eggs", 25, "r2", "store-1"))
+    assert [(w.product_id, w.available) for w in warnings] == [("eggs", 5)]
+
+
+def test_batches_publish_their_warnings_together():
+    handler = InventoryCommandHandler()
+    published = []
+    LowStockDetector(handler, published.append, default_reorder_point=2)
+    handler.handle_batch([
+        AddStockCommand("milk", 5, "store-1"),
+        AddStockCommand("eggs", 5, "store-1"),
+        ReserveStockCommand("milk", 4, "r1", "store-1"),
+        ReserveStockCommand("eggs", 3, "r2", "store-1"),
+    ])
+    assert len(published) == 1
+    assert [(w.product_id, w.available) for w in published[0]] == [("milk", 1), ("eggs", 2)]
+
+
+def test_changing_the_reorder_point_updates_the_warned_state():
+    handler = InventoryCommandHandler()
+    watcher, warnings = detector(handler, default_reorder_point=2, hysteresis=1)
+    handler.handle(AddStockCommand("milk", 5, "store-1"))
+
+    watcher.set_reorder_point("milk", "store-1", 6)
+    assert watcher.is_low(*KEY) and warnings == []
+    watcher.set_reorder_point("milk", "store-1", 3)
+    assert not watcher.is_low(*KEY)
+    handler.handle(ReserveStockCommand("milk", 2, "r1", "store-1"))
+    assert [w.reorder_point for w in warnings] == [3]
+
+
+def test_rejects_negative_hysteresis():
+    with pytest.raises(ValueError):
+        LowStockDetector(InventoryCommandHandler(), print, hysteresis=-1)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"hysteresis": 1.5}, {"hysteresis": True}, {"default_reorder_point": "5"}, {"reorder_points": {KEY: 2.0}}],
+)
+def test_rejects_non_int_thresholds(options):
+    with pytest.raises(TypeError):
+        LowStockDetector(InventoryCommandHandler(), print, **options)
+
+
+def test_negative_reorder_point_for_an_unseen_key_is_not_low():
+    watcher, warnings = detector(InventoryCommandHandler())
+
+    watcher.set_reorder_point("milk", "store-9", -1)
+
+    assert not watcher.is_low("milk", "store-9") and warnings == []
+    with pytest.raises(TypeError):
+        watcher.set_reorder_point("milk", "store-9", None)
@@ -0,0 +1,104 @@
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.allocation import ReservationAllocator
+from inventory.commands import (
+    AddStockCommand,
+    AllocateStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import ConcurrencyConflictError, InsufficientStockError
+
+COSTS = (("near", 1.0), ("mid", 2.5), ("far", 9.0))
+
+
+def stocked(**quantities):
+    handler = InventoryCommandHandler()
+    for location_id, quantity in quantities.items():
+        handler.handle(AddStockCommand("milk", quantity, location_id))
+    return handler, ReservationAllocator(handler)
+
+
+def reserved(handler):
+    return {key[1]: level.reserved for key, level in handler.ledger.levels() if level.reserved}
+
+
+def test_reserves_from_the_cheapest_location_holding_enough():
+    handler, allocator = stocked(near=2, mid=5, far=10)
+
+    events = allocator.handle(AllocateStockCommand("milk", 4, "order-1", COSTS))
+
+    assert [(event.reservation_id, event.location_id, event.quantity) for event in events] == [
+        ("order-1", "mid", 4)
+    ]
+    assert allocator.plan(AllocateStockCommand("milk", 2, "order-2", COSTS)) == [("near", 2)]
+    assert reserved(handler) == {"mid": 4}
+
+
+def test_split_takes_the_cheapest_candidates_in_turn():
+    handler, allocator = stocked(near=2, mid=3, far=10, other=50)
+
+    events = allocator.handle(AllocateStockCommand("milk", 12, "order-1", COSTS, split=True))
+
+    assert [(event.reservation_id, event.quantity) for event in events] == [
+        ("order-1@near", 2), ("order-1@mid", 3), ("order-1@far", 7),
+    ]
+    assert reserved(handler) == {"near": 2, "mid": 3, "far": 7}
+
+
+def test_unsplittable_or_uncoverable_quantities_are_rejected():
+    handler, allocator = stocked(near=2, mid=3)
+
+    with pytest.raises(InsufficientStockError, match="without splitting"):
+        allocator.handle(AllocateStockCommand("milk", 4, "order-1", COSTS))
+    with pytest.raises(InsufficientStockError):
+        allocator.handle(AllocateStockCommand("milk", 6, "order-1", COSTS, split=True))
+    with pytest.raises(InsufficientStockError):
+        allocator.handle(AllocateStockCommand("eggs", 1, "order-1", COSTS))
+    assert reserved(handler) == {}
+
+
+def test_index_follows_reservations_and_releases():
+    handler, allocator = stocked(near=3, mid=3)
+    handler.handle(ReserveStockCommand("milk", 3, "walk-in", "near"))
+    assert allocator.plan(AllocateStockCommand("milk", 1, "order-1", COSTS)) == [("mid", 1)]
+
+    handler.handle(ReleaseReservationCommand("walk-in"))
+    assert allocator.plan(AllocateStockCommand("milk", 1, "order-1", COSTS)) == [("near", 1)]
+
+
+def test_stale_plans_are_replanned():
+    handler, allocator = stocked(near=3, mid=3)
+    plan = allocator.plan
+
+    def plan_then_lose_the_race(command):
+        parts = plan(command)
+        if not handler.ledger.reservation("rival"):
+            handler.handle(ReserveStockCommand("milk", 2, "rival", parts[0][0]))
+        return parts
+
+    allocator.plan = plan_then_lose_the_race
+    events = allocator.handle(AllocateStockCommand("milk", 3, "order-1", COSTS))
+
+    assert [(event.location_id, event.quantity) for event in events] == [("mid", 3)]
+    assert reserved(handler) == {"near": 2, "mid": 3}
+
+
+def test_gives_up_after_max_attempts():
+    handler = InventoryCommandHandler(max_attempts=3)
+    handler.handle(AddStockCommand("milk", 100, "near"))
+    allocator = ReservationAllocator(handler)
+    allocator.plan = lambda command: [("near", 101)]
+
+    with pytest.raises(ConcurrencyConflictError):
+        allocator.handle(AllocateStockCommand("milk", 1, "order-1", COSTS))
+
+
+@pytest.mark.parametrize(
+    "location_costs, error",
+    [((), ValueError), ((("near", 1.0), ("near", 2.0)), ValueError), ((("near", "1"),), TypeError)],
+)
+def test_command_validates_its_candidates(location_costs, error):
+    with pytest.raises(error):
+        AllocateStockCommand("milk", 1, "order-1", location_costs)
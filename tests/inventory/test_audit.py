@@ -0,0 +1,134 @@
+import pytest
+
+from inventory.audit import AUDIT_MAGIC, AdjustmentAuditIndex, AdjustmentAuditQuery
+from inventory.eventstore import EventStore
+from inventory.events import StockAdjusted, StockReceived
+
+HOUR = 3600.0
+
+
+def adjustment(i, reason, location_id, at, change=-1):
+    return StockAdjusted(f"a{i}", change, reason, f"sku-{i % 4}", location_id, at)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(tmp_path / "events")
+    yield store
+    store.close()
+
+
+def populate(store, count=60):
+    events = []
+    for i in range(count):
+        events.append(StockReceived(f"sku-{i % 4}", 5, "store-1"))
+        reason = ("shrink", "damage", "found")[i % 3]
+        events.append(adjustment(i, reason, f"store-{i % 2}", i * 1000.0, 1 if reason == "found" else -1))
+    store.append(events)
+    return [event for event in events if type(event) is StockAdjusted]
+
+
+def expected(adjustments, reason=None, location_id=None, start=None, end=None):
+    return sorted(
+        (
+            event
+            for event in adjustments
+            if (reason is None or event.reason == reason)
+            and (location_id is None or event.location_id == location_id)
+            and (start is None or event.occurred_at >= start)
+            and (end is None or event.occurred_at < end)
+        ),
+        key=lambda event: event.occurred_at,
+    )
+
+
+@pytest.mark.parametrize("reason", [None, "shrink", "found", "missing"])
+@pytest.mark.parametrize("location_id", [None, "store-0", "store-1"])
+@pytest.mark.parametrize(
+    "start, end",
+    [(None, None), (5_500.0, 40_000.0), (3_600.0, 7_200.0), (None, 9_999.0), (70_000.0, None)],
+)
+def test_queries_match_a_scan_of_the_log(store, reason, location_id, start, end):
+    adjustments = populate(store)
+    index = AdjustmentAuditIndex(store, bucket_seconds=HOUR)
+
+    result = index.query(AdjustmentAuditQuery(reason, location_id, start, end))
+
+    assert result == expected(adjustments, reason, location_id, start, end)
+
+
+def test_queries_see_events_appended_since_the_last_refresh(store):
+    adjustments = populate(store, 6)
+    index = AdjustmentAuditIndex(store)
+    late = adjustment(99, "shrink", "store-0", 2 * HOUR)
+    store.append([late, StockReceived("sku-0", 1, "store-0")])
+
+    result = index.query(AdjustmentAuditQuery("shrink", "store-0"))
+    assert result == expected(adjustments + [late], "shrink", "store-0")
+    assert index.offset == store.next_offset
+    assert index.refresh() == 0
+
+
+def test_sidecar_round_trip_replays_only_newer_events(store, tmp_path, monkeypatch):
+    adjustments = populate(store)
+    path = tmp_path / "audit.idx"
+    AdjustmentAuditIndex(store, path, bucket_seconds=HOUR).save()
+    assert path.read_bytes().startswith(AUDIT_MAGIC)
+    saved_offset = store.next_offset
+    late = adjustment(99, "damage", "störe-ü", 1e6)
+    store.append([late])
+    replayed = []
+    replay = store.replay
+
+    def recording_replay(start, *args, **kwargs):
+        replayed.append(start)
+        return replay(start, *args, **kwargs)
+
+    monkeypatch.setattr(store, "replay", recording_replay)
+
+    reloaded = AdjustmentAuditIndex(store, path, bucket_seconds=HOUR)
+
+    assert replayed == [saved_offset]
+    assert reloaded.query(AdjustmentAuditQuery()) == expected(adjustments + [late])
+    first = reloaded.query(AdjustmentAuditQuery(reason="shrink"))[0]
+    assert first == adjustments[0] and first.product_id == "sku-0"
+
+
+@pytest.mark.parametrize("damage", ["truncate", "flip", "magic"])
+def test_damaged_sidecar_is_ignored_and_the_index_rebuilt(store, tmp_path, damage):
+    adjustments = populate(store, 12)
+    path = tmp_path / "audit.idx"
+    AdjustmentAuditIndex(store, path).save()
+    data = bytearray(path.read_bytes())
+    if damage == "truncate":
+        data = data[: len(data) // 2]
+    elif damage == "flip":
+        data[len(data) // 2] ^= 0xFF
+    else:
+        data[:4] = b"XXXX"
+    path.write_bytes(bytes(data))
+
+    assert AdjustmentAuditIndex(store, path).query(AdjustmentAuditQuery()) == expected(adjustments)
+
+
+def test_sidecar_with_another_bucket_size_or_a_newer_log_is_ignored(store, tmp_path):
+    adjustments = populate(store, 12)
+    path = tmp_path / "audit.idx"
+    AdjustmentAuditIndex(store, path, bucket_seconds=HOUR).save()
+
+    rebucketed = AdjustmentAuditIndex(store, path, bucket_seconds=60)
+    assert rebucketed.query(AdjustmentAuditQuery()) == expected(adjustments)
+    other = EventStore(tmp_path / "other")
+    assert AdjustmentAuditIndex(other, path, bucket_seconds=HOUR).query(AdjustmentAuditQuery()) == []
+    other.close()
+
+
+def test_invalid_arguments_are_rejected(store):
+    with pytest.raises(ValueError):
+        AdjustmentAuditIndex(store, bucket_seconds=0)
+    with pytest.raises(ValueError):
+        AdjustmentAuditIndex(store).save()
+    with pytest.raises(ValueError):
+        AdjustmentAuditQuery(reason="")
+    with pytest.raises(TypeError):
+        AdjustmentAuditQuery(start="yesterday")
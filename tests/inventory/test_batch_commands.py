@@ -0,0 +1,109 @@
+import pytest
+
+from inventory import InventoryCommandHandler, StockLedger
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import InsufficientStockError, UnknownReservationError, UnsupportedCommandError
+from inventory.events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+from inventory.idempotency import IdempotencyCache
+
+
+@pytest.fixture
+def stocked():
+    published = []
+    handler = InventoryCommandHandler(listeners=[published.append], idempotency=IdempotencyCache())
+    handler.handle(AddStockCommand("sku-1", 10, "store-1", "lot-a", 100.0))
+    handler.handle(AddStockCommand("sku-1", 5, "store-1", "lot-b", 50.0))
+    handler.handle(ReserveStockCommand("sku-1", 6, "r1", "store-1"))
+    published.clear()
+    return handler, published
+
+
+def test_batch_applies_in_order_and_publishes_once(stocked):
+    handler, published = stocked
+
+    events = handler.handle_batch([
+        AddStockCommand("sku-2", 4, "store-1"),
+        ReserveStockCommand("sku-2", 4, "r2", "store-1"),
+        DispatchStockCommand("r2", "customer-7"),
+        ReleaseReservationCommand("r1"),
+    ])
+
+    assert [type(event) for event in events] == [StockReceived, StockReserved, StockDispatched, ReservationReleased]
+    assert published == [events]
+    assert handler.ledger.level(("sku-2", "store-1")).on_hand == 0
+    assert handler.ledger.available(("sku-1", "store-1")) == 15
+
+
+@pytest.mark.parametrize("failing, error", [
+    (ReserveStockCommand("sku-1", 99, "r9", "store-1"), InsufficientStockError),
+    (ReleaseReservationCommand("missing"), UnknownReservationError),
+    (object(), UnsupportedCommandError),
+])
+def test_rejected_batch_rolls_back_everything(stocked, ledger_state, failing, error):
+    handler, published = stocked
+    before = ledger_state(handler.ledger)
+    versions = {key: level.version for key, level in handler.ledger.levels()}
+
+    with pytest.raises(error):
+        handler.handle_batch([
+            AddStockCommand("sku-1", 3, "store-1", "lot-c", 10.0, idempotency_key="k1"),
+            AddStockCommand("sku-new", 3, "store-9"),
+            ReserveStockCommand("sku-1", 8, "r2", "store-1"),
+            DispatchStockCommand("r1", "customer-7"),
+            AdjustStockCommand(("sku-1", "store-1"), -1, "shrink"),
+            failing,
+        ])
+
+    assert ledger_state(handler.ledger) == before
+    assert handler.ledger.level(("sku-new", "store-9")) is None
+    assert published == []
+    # Restored levels never reuse a version a validated writer may hold.
+    for key, level in handler.ledger.levels():
+        assert level.version > versions[key]
+    # The rolled-back key is free for a new command.
+    assert handler.handle(AddStockCommand("sku-1", 3, "store-1", idempotency_key="k1")).batch_id is None
+
+
+def test_batch_skips_commands_already_applied_by_idempotency_key(stocked):
+    handler, published = stocked
+    first = handler.handle(AddStockCommand("sku-1", 1, "store-1", idempotency_key="k1"))
+    published.clear()
+
+    events = handler.handle_batch([
+        AddStockCommand("sku-1", 1, "store-1", idempotency_key="k1"),
+        AdjustStockCommand(("sku-1", "store-1"), 2, "count"),
+    ])
+
+    assert events[0] is first
+    assert published == [[events[1]]]
+
+
+def test_ledger_transaction_rollback_restores_touched_entries(ledger_state):
+    ledger = StockLedger()
+    ledger.apply(StockReceived("sku-1", 10, "store-1", "lot-a", 100.0))
+    ledger.apply(StockReserved("sku-1", 4, "r1", "store-1"))
+    before = ledger_state(ledger)
+
+    transaction = ledger.transaction()
+    transaction.apply(StockReceived("sku-1", 7, "store-1", "lot-b", 10.0))
+    transaction.apply(StockReserved("sku-1", 9, "r2", "store-1"))
+    transaction.apply(ReservationReleased("r1", "sku-1", "store-1", 4))
+    transaction.apply(StockAdjusted("a1", -2, "shrink", "sku-1", "store-1"))
+    transaction.apply(StockReceived("sku-2", 1, "store-2"))
+    assert ledger_state(ledger) != before
+    transaction.rollback()
+
+    assert ledger_state(ledger) == before
+    assert ledger.reservation("r1").allocation == (("lot-a", 4),)
@@ -0,0 +1,120 @@
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.batches import BatchIndex
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.events import StockDispatched
+from inventory.snapshots import decode_snapshot, encode_snapshot
+
+KEY = ("milk", "store-1")
+
+
+def dispatched(reservation_id, quantity):
+    return StockDispatched(f"d-{reservation_id}", reservation_id, "milk", "store-1", quantity, "customer-7")
+
+
+def test_allocates_earliest_expiring_batches_first():
+    index = BatchIndex()
+    index.add("late", 5, 300.0)
+    index.add(None, 4)
+    index.add("early", 2, 100.0)
+    index.add("undated", 3)
+    index.add("mid", 3, 200.0)
+
+    assert index.allocate(6) == (("early", 2), ("mid", 3), ("late", 1))
+    assert index.allocate(5) == (("late", 4), ("undated", 1))
+    # The unbatched pool sorts after undated batches.
+    assert index.allocate(4) == (("undated", 2), (None, 2))
+    assert list(index.batches()) == [(None, None, 2)]
+    with pytest.raises(ValueError):
+        index.allocate(3)
+
+
+def test_restore_returns_stock_to_exhausted_batches_with_their_expiry():
+    index = BatchIndex()
+    index.add("a", 2, 100.0)
+    index.add("b", 2, 200.0)
+    taken = index.allocate(3)
+    copy = index.copy()
+
+    index.restore(taken)
+
+    assert list(index.batches()) == [("a", 100.0, 2), ("b", 200.0, 2)]
+    assert list(copy.batches()) == [("b", 200.0, 1)]
+    assert index.expiration_time("a") == 100.0 and index.expiration_time(None) is None
+
+
+def test_reservations_draw_fefo_and_release_restores_the_same_batches():
+    handler = InventoryCommandHandler()
+    handler.handle(AddStockCommand("milk", 4, "store-1"))
+    handler.handle(AddStockCommand("milk", 5, "store-1", "lot-b", 200.0))
+    handler.handle(AddStockCommand("milk", 5, "store-1", "lot-a", 100.0))
+
+    handler.handle(ReserveStockCommand("milk", 7, "r1", "store-1"))
+    handler.handle(ReserveStockCommand("milk", 5, "r2", "store-1"))
+
+    assert handler.ledger.reservation("r1").allocation == (("lot-a", 5), ("lot-b", 2))
+    assert handler.ledger.reservation("r2").allocation == (("lot-b", 3), (None, 2))
+    handler.handle(ReleaseReservationCommand("r1"))
+    handler.handle(DispatchStockCommand("r2", "customer-7"))
+    assert list(handler.ledger.batches(KEY).batches()) == [
+        ("lot-a", 100.0, 5), ("lot-b", 200.0, 2), (None, None, 2),
+    ]
+
+
+def test_stock_present_before_the_first_batch_becomes_the_unbatched_pool():
+    handler = InventoryCommandHandler()
+    handler.handle(AddStockCommand("milk", 3, "store-1"))
+    handler.handle(ReserveStockCommand("milk", 2, "r0", "store-1"))
+    handler.handle(AddStockCommand("milk", 4, "store-1", "lot-a", 100.0))
+
+    assert list(handler.ledger.batches(KEY).batches()) == [("lot-a", 100.0, 4), (None, None, 1)]
+    handler.handle(ReleaseReservationCommand("r0"))
+    assert handler.ledger.batches(KEY).quantity(None) == 3
+
+
+def test_adjustments_shrink_fefo_and_add_found_stock_to_the_pool():
+    handler = InventoryCommandHandler()
+    handler.handle(AddStockCommand("milk", 3, "store-1", "lot-a", 100.0))
+    handler.handle(AddStockCommand("milk", 3, "store-1", "lot-b", 200.0))
+
+    handler.handle(AdjustStockCommand(KEY, -4, "spoiled"))
+    handler.handle(AdjustStockCommand(KEY, 2, "found"))
+
+    assert list(handler.ledger.batches(KEY).batches()) == [("lot-b", 200.0, 2), (None, None, 2)]
+    assert handler.ledger.level(KEY).on_hand == 4
+
+
+def test_spent_batches_are_forgotten_once_no_reservation_holds_them():
+    handler = InventoryCommandHandler()
+    for day in range(50):
+        handler.handle(AddStockCommand("milk", 2, "store-1", f"lot-{day}", 100.0 + day))
+        handler.handle(ReserveStockCommand("milk", 2, f"r{day}", "store-1"))
+        handler.handle(DispatchStockCommand(f"r{day}", "customer-7"))
+    index = handler.ledger.batches(KEY)
+
+    assert len(index) == 0 and index._expiry == {} and index._held == {}
+
+
+def test_batches_held_by_open_reservations_survive_until_closed():
+    handler = InventoryCommandHandler()
+    handler.handle(AddStockCommand("milk", 3, "store-1", "lot-a", 100.0))
+    handler.handle(AddStockCommand("milk", 3, "store-1", "lot-b", 200.0))
+    handler.handle(ReserveStockCommand("milk", 3, "r1", "store-1"))
+    handler.handle(ReserveStockCommand("milk", 1, "r2", "store-1"))
+    handler.handle(AdjustStockCommand(KEY, -2, "spoiled"))
+    assert set(handler.ledger.batches(KEY)._expiry) == {"lot-a", "lot-b"}
+
+    ledger, _ = decode_snapshot(encode_snapshot(handler.ledger, 0))
+    index = ledger.batches(KEY)
+    assert index.expiration_time("lot-a") == 100.0 and len(index) == 0
+    ledger.apply(dispatched("r1", 3))
+    assert set(index._expiry) == {"lot-b"}
+    ledger.apply(dispatched("r2", 1))
+    assert index._expiry == {} and index._held == {}
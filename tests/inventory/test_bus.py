@@ -0,0 +1,178 @@
+import asyncio
+import threading
+
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.bus import EventBus
+from inventory.commands import AddStockCommand, ReleaseReservationCommand, ReserveStockCommand
+from inventory.events import ReservationReleased, StockReceived, StockReserved
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_subscribers_receive_only_their_event_types_in_order():
+    async def scenario():
+        bus = EventBus()
+        reserved, everything, handled = [], [], []
+
+        async def handle_async(event):
+            await asyncio.sleep(0)
+            handled.append(event)
+
+        bus.subscribe(reserved.append, StockReserved)
+        bus.subscribe(everything.append)
+        bus.subscribe(handle_async, StockReserved, ReservationReleased)
+        events = [
+            StockReceived("milk", 5, "store-1"),
+            StockReserved("milk", 1, "r1", "store-1"),
+            ReservationReleased("r1", "milk", "store-1", 1),
+            StockReserved("milk", 2, "r2", "store-1"),
+        ]
+        bus.publish_nowait(events[:2])
+        await bus.publish(events[2:])
+        await bus.close()
+        assert reserved == [events[1], events[3]]
+        assert everything == events
+        assert handled == events[1:]
+        assert bus.subscriptions == ()
+
+    run(scenario())
+
+
+def test_full_queue_drops_the_surplus_without_blocking():
+    async def scenario():
+        bus = EventBus()
+        received = []
+        subscription = bus.subscribe(received.append, maxsize=3)
+        events = [StockReceived("milk", i + 1, "store-1") for i in range(5)]
+        bus.publish_nowait(events[:2])
+        bus.publish_nowait(events[2:])
+        bus.publish_nowait(events[:1])
+        assert subscription.pending == 3 and subscription.dropped == 3
+        await bus.drain()
+        assert received == events[:3]
+        assert subscription.delivered == 3 and subscription.pending == 0
+        await bus.close()
+
+    run(scenario())
+
+
+def test_blocking_subscription_makes_publish_wait_for_room():
+    async def scenario():
+        bus = EventBus()
+        gate = asyncio.Event()
+        received = []
+
+        async def slow(event):
+            await gate.wait()
+            received.append(event)
+
+        subscription = bus.subscribe(slow, maxsize=2, block=True)
+        events = [StockReceived("milk", i + 1, "store-1") for i in range(4)]
+        await bus.publish(events[:2])
+        publishing = asyncio.ensure_future(bus.publish(events[2:]))
+        await asyncio.sleep(0.01)
+        assert not publishing.done() and subscription.pending == 2
+        gate.set()
+        await publishing
+        await bus.close()
+        assert received == events and subscription.dropped == 0
+
+    run(scenario())
+
+
+def test_one_failing_subscriber_does_not_stop_delivery():
+    async def scenario():
+        bus = EventBus()
+        received = []
+
+        def flaky(event):
+            if event.quantity == 2:
+                raise RuntimeError("projection down")
+            received.append(event.quantity)
+
+        subscription = bus.subscribe(flaky)
+        bus.publish_nowait([StockReceived("milk", i, "store-1") for i in (1, 2, 3)])
+        await bus.close()
+        assert received == [1, 3]
+        assert subscription.errors == 1 and subscription.delivered == 3
+        assert isinstance(subscription.last_error, RuntimeError)
+
+    run(scenario())
+
+
+def test_unsubscribed_handlers_stop_receiving():
+    async def scenario():
+        bus = EventBus()
+        kept, removed = [], []
+        bus.subscribe(kept.append, StockReceived)
+        subscription = bus.subscribe(removed.append, StockReceived)
+        bus.unsubscribe(subscription)
+        bus.publish_nowait([StockReceived("milk", 1, "store-1")])
+        await bus.close()
+        assert len(kept) == 1 and removed == []
+
+    run(scenario())
+
+
+def test_listener_publishes_handler_events_from_other_threads():
+    async def scenario():
+        bus = EventBus()
+        received = []
+        bus.subscribe(received.append)
+        handler = InventoryCommandHandler(listeners=[bus.listener()])
+        handler.handle(AddStockCommand("milk", 5, "store-1"))
+
+        def worker():
+            handler.handle(ReserveStockCommand("milk", 2, "r1", "store-1"))
+            handler.handle(ReleaseReservationCommand("r1"))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        await asyncio.sleep(0)
+        await bus.close()
+        assert [type(event) for event in received] == [StockReceived, StockReserved, ReservationReleased]
+
+    run(scenario())
+
+
+def test_listener_created_off_the_loop_thread_publishes_through_the_loop():
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever)
+    loop_thread.start()
+    delivered = threading.Event()
+    received = []
+
+    def record(event):
+        received.append(event)
+        delivered.set()
+
+    async def subscribe():
+        bus = EventBus()
+        return bus, bus.subscribe(record)
+
+    try:
+        bus, subscription = asyncio.run_coroutine_threadsafe(subscribe(), loop).result()
+        # The listener is wired up on this thread while the loop runs on another.
+        handler = InventoryCommandHandler(listeners=[bus.listener()])
+        handler.handle(AddStockCommand("milk", 5, "store-1"))
+        assert delivered.wait(timeout=2)
+        assert [type(event) for event in received] == [StockReceived]
+        asyncio.run_coroutine_threadsafe(bus.close(), loop).result(timeout=2)
+        assert subscription.delivered == 1 and subscription.pending == 0
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
+
+
+def test_subscription_rejects_an_empty_queue():
+    async def scenario():
+        with pytest.raises(ValueError):
+            EventBus().subscribe(print, maxsize=0)
+
+    run(scenario())
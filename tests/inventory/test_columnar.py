@@ -0,0 +1,93 @@
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.columnar import ColumnarStockProjection
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.events import AVAILABLE_DELTAS
+
+
+def stock_movements(handler):
+    handler.handle(AddStockCommand("milk", 10, "store-1"))
+    handler.handle(AddStockCommand("milk", 4, "store-2"))
+    handler.handle(AddStockCommand("eggs", 6, "store-1"))
+    handler.handle_batch([
+        ReserveStockCommand("milk", 3, "r1", "store-1"),
+        ReserveStockCommand("eggs", 2, "r2", "store-1"),
+        ReserveStockCommand("milk", 4, "r3", "store-2"),
+    ])
+    handler.handle(DispatchStockCommand("r1", "customer-1"))
+    handler.handle(ReleaseReservationCommand("r2"))
+    handler.handle(AdjustStockCommand(("eggs", "store-1"), -1, "broken"))
+
+
+def rows(columns):
+    return {
+        (columns.product_ids[p], columns.location_ids[l]): (int(on_hand), int(reserved), int(available))
+        for p, l, on_hand, reserved, available in zip(
+            columns.product_index, columns.location_index, columns.on_hand, columns.reserved, columns.available
+        )
+    }
+
+
+def test_snapshot_matches_the_ledger():
+    np = pytest.importorskip("numpy")
+    handler = InventoryCommandHandler()
+    projection = ColumnarStockProjection()
+    handler.add_listener(projection)
+    stock_movements(handler)
+
+    columns = projection.snapshot()
+
+    assert len(projection) == len(columns) == 3
+    assert columns.on_hand.dtype == np.int64
+    assert rows(columns) == {
+        key: (level.on_hand, level.reserved, level.available) for key, level in handler.ledger.levels()
+    }
+    assert rows(ColumnarStockProjection.from_ledger(handler.ledger).snapshot()) == rows(columns)
+
+
+def test_totals_by_location_and_product():
+    pytest.importorskip("numpy")
+    handler = InventoryCommandHandler()
+    projection = ColumnarStockProjection()
+    handler.add_listener(projection)
+    stock_movements(handler)
+
+    columns = projection.snapshot()
+    by_location = dict(zip(columns.location_ids, columns.totals_by_location().tolist()))
+    on_hand_by_product = dict(zip(columns.product_ids, columns.totals_by_product("on_hand").tolist()))
+
+    assert by_location == {"store-1": 12, "store-2": 0}
+    assert on_hand_by_product == {"milk": 11, "eggs": 5}
+
+
+def test_snapshot_is_a_copy():
+    pytest.importorskip("numpy")
+    projection = ColumnarStockProjection()
+    handler = InventoryCommandHandler(listeners=[projection])
+    handler.handle(AddStockCommand("milk", 10, "store-1"))
+    columns = projection.snapshot()
+    handler.handle(AddStockCommand("milk", 5, "store-1"))
+    assert columns.on_hand.tolist() == [10]
+    assert projection.snapshot().on_hand.tolist() == [15]
+
+
+def test_columns_agree_with_the_shared_available_deltas():
+    pytest.importorskip("numpy")
+    handler = InventoryCommandHandler()
+    events = []
+    handler.add_listener(events.extend)
+    stock_movements(handler)
+    projection = ColumnarStockProjection()
+
+    for event in events:
+        key = (event.product_id, event.location_id)
+        before = rows(projection.snapshot()).get(key, (0, 0, 0))[2]
+        projection([event])
+        assert rows(projection.snapshot())[key][2] - before == AVAILABLE_DELTAS[type(event)](event)
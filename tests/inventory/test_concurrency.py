@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from inventory import InventoryCommandHandler, StockLedger
+from inventory.commands import AddStockCommand, ReleaseReservationCommand, ReserveStockCommand
+from inventory.errors import ConcurrencyConflictError, DuplicateReservationError, InsufficientStockError
+from inventory.events import StockReceived, StockReserved
+from inventory.ledger import LOCK_STRIPES
+
+
+def test_compare_and_apply_refuses_a_stale_version_or_taken_reservation():
+    ledger = StockLedger()
+    ledger.apply(StockReceived("sku-1", 10, "store-1"))
+    version = ledger.version(("sku-1", "store-1"))
+
+    assert ledger.compare_and_apply(StockReserved("sku-1", 1, "r1", "store-1"), version)
+    assert ledger.version(("sku-1", "store-1")) > version
+    assert not ledger.compare_and_apply(StockReserved("sku-1", 1, "r2", "store-1"), version)
+    assert not ledger.compare_and_apply(StockReserved("sku-1", 1, "r1", "store-1"), None)
+    assert ledger.available(("sku-1", "store-1")) == 9
+
+
+def test_stripe_locks_cover_key_reservation_and_idempotency_key_in_order():
+    ledger = StockLedger()
+    event = StockReserved("sku-1", 1, "r1", "store-1", idempotency_key="k1")
+    stripes = {
+        hash(("sku-1", "store-1")) % LOCK_STRIPES,
+        hash("r1") % LOCK_STRIPES,
+        hash("k1") % LOCK_STRIPES,
+    }
+
+    assert ledger.stripe_locks(event) == tuple(ledger.all_locks()[i] for i in sorted(stripes))
+    assert len(ledger.all_locks()) == LOCK_STRIPES
+
+
+def test_a_command_that_keeps_losing_the_race_gives_up():
+    handler = InventoryCommandHandler(max_attempts=3)
+    handler.handle(AddStockCommand("sku-1", 10, "store-1"))
+    reserve = handler._routes[ReserveStockCommand]
+
+    def racing_route(command):
+        routed = reserve(command)
+        # Another writer changes the level between validation and apply.
+        handler.ledger.apply(StockReceived("sku-1", 1, "store-1"))
+        return routed
+
+    handler._routes[ReserveStockCommand] = racing_route
+    with pytest.raises(ConcurrencyConflictError):
+        handler.handle(ReserveStockCommand("sku-1", 1, "r1", "store-1"))
+    assert handler.ledger.reservation("r1") is None
+
+
+def test_concurrent_reservations_never_oversell():
+    handler = InventoryCommandHandler()
+    handler.handle(AddStockCommand("sku-1", 1000, "store-1"))
+    outcomes = {"reserved": 0, "insufficient": 0, "duplicate": 0}
+    lock = threading.Lock()
+
+    def work(worker):
+        for i in range(400):
+            # Every worker also races the others for the same reservation ids.
+            reservation_id = f"r{i}" if i % 4 == 0 else f"w{worker}-{i}"
+            try:
+                handler.handle(ReserveStockCommand("sku-1", 1, reservation_id, "store-1"))
+                outcome = "reserved"
+            except InsufficientStockError:
+                outcome = "insufficient"
+            except DuplicateReservationError:
+                outcome = "duplicate"
+            with lock:
+                outcomes[outcome] += 1
+            if i % 10 == 9 and outcome == "reserved":
+                handler.handle(ReleaseReservationCommand(reservation_id))
+
+    workers = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    level = handler.ledger.level(("sku-1", "store-1"))
+    open_reservations = list(handler.ledger.reservations())
+    assert 0 <= level.available and level.on_hand == 1000
+    assert level.reserved == sum(r.quantity for r in open_reservations)
+    assert sum(outcomes.values()) == 8 * 400
+    assert outcomes["insufficient"] > 0
+    assert outcomes["duplicate"] > 0
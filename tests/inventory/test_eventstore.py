@@ -0,0 +1,123 @@
+import pytest
+
+from inventory.eventstore import (
+    SEGMENT_SUFFIX,
+    CorruptRecordError,
+    EventStore,
+    decode_event,
+    encode_event,
+)
+from inventory.events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+
+
+def sample_events(n=5):
+    events = []
+    for i in range(n):
+        events += [
+            StockReceived(f"sku-{i % 3}", 10 + i, "store-1", f"lot-{i}", 1_700_000_000.5 + i, f"key-{i}"),
+            StockReceived(f"sku-{i % 3}", 1, "störe-ü"),
+            StockReserved(f"sku-{i % 3}", 2, f"r{i}", "store-1", None, None),
+            ReservationReleased(f"r{i}", f"sku-{i % 3}", "store-1", 2),
+            StockDispatched(f"d{i}", f"r{i}", f"sku-{i % 3}", "store-1", 1, "customer-7"),
+            StockAdjusted(f"a{i}", -3, "shrink", f"sku-{i % 3}", "störe-ü"),
+        ]
+    return events
+
+
+def test_encode_event_round_trips_every_type():
+    for event in sample_events(1):
+        record = encode_event(event)
+        decoded, end = decode_event(record)
+        assert decoded == event
+        assert end == len(record)
+
+
+def test_decode_event_rejects_a_damaged_record():
+    record = bytearray(encode_event(sample_events(1)[0]))
+    record[-1] ^= 0xFF
+    with pytest.raises(CorruptRecordError):
+        decode_event(bytes(record))
+
+
+def test_append_and_replay_round_trip(tmp_path):
+    events = sample_events(20)
+    with EventStore(tmp_path) as store:
+        assert store.append(events[:7]) == 0
+        assert store.append(events[7:]) == 7
+        assert store.next_offset == len(events)
+        assert list(store.replay()) == events
+        assert list(store.replay(10, 25)) == events[10:25]
+        assert list(store.replay(len(events))) == []
+
+
+def test_replay_filters_by_type(tmp_path):
+    events = sample_events(10)
+    with EventStore(tmp_path) as store:
+        store.append(events)
+        adjusted = list(store.replay(3, types=(StockAdjusted,)))
+    assert adjusted == [event for event in events[3:] if type(event) is StockAdjusted]
+
+
+def test_segments_roll_over_and_replay_across_them(tmp_path):
+    events = sample_events(50)
+    with EventStore(tmp_path, segment_bytes=2048) as store:
+        for event in events:
+            store.append([event])
+    assert len(list(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))) > 2
+
+    with EventStore(tmp_path, segment_bytes=2048) as store:
+        assert store.next_offset == len(events)
+        assert list(store.replay()) == events
+        assert list(store.replay(123, 200)) == events[123:200]
+
+
+def test_reopen_resumes_after_clean_close_and_keeps_appending(tmp_path):
+    events = sample_events(10)
+    with EventStore(tmp_path) as store:
+        store.append(events[:30])
+    with EventStore(tmp_path) as store:
+        assert store.next_offset == 30
+        store.append(events[30:])
+    with EventStore(tmp_path) as store:
+        assert list(store.replay()) == events
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    events = sample_events(4)
+    store = EventStore(tmp_path)
+    store.append(events)
+    store.flush()
+    store.append([StockReceived("sku-9", 1, "store-9")])
+    # Simulate a crash: the last record is only partly on disk and the
+    # index written by flush() predates it.
+    store._file.close()
+    (segment,) = tmp_path.glob(f"*{SEGMENT_SUFFIX}")
+    with open(segment, "r+b") as handle:
+        handle.truncate(segment.stat().st_size - 3)
+
+    with EventStore(tmp_path) as reopened:
+        assert reopened.next_offset == len(events)
+        assert list(reopened.replay()) == events
+        reopened.append([StockReceived("sku-9", 2, "store-9")])
+    with EventStore(tmp_path) as reopened:
+        assert list(reopened.replay())[-1].quantity == 2
+
+
+def test_corrupt_record_inside_the_log_raises_on_replay(tmp_path):
+    events = sample_events(4)
+    with EventStore(tmp_path) as store:
+        store.append(events)
+    (segment,) = tmp_path.glob(f"*{SEGMENT_SUFFIX}")
+    data = bytearray(segment.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    segment.write_bytes(bytes(data))
+
+    with EventStore(tmp_path) as store:
+        with pytest.raises(CorruptRecordError):
+            list(store.replay())
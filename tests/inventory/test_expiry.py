@@ -0,0 +1,136 @@
+import random
+import threading
+
+from inventory import InventoryCommandHandler
+from inventory.commands import (
+    AddStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import ConcurrencyConflictError, UnknownReservationError
+from inventory.expiry import ReservationExpiryScheduler
+
+
+def reserve(handler, count, expires=lambda i: 100.0 + i):
+    handler.handle(AddStockCommand("sku-1", 10 * count, "store-1"))
+    for i in range(count):
+        handler.handle(ReserveStockCommand("sku-1", 1, f"r{i}", "store-1", expires(i)))
+
+
+def test_expires_due_reservations_in_order():
+    handler = InventoryCommandHandler()
+    scheduler = ReservationExpiryScheduler(handler)
+    reserve(handler, 5, expires=lambda i: 104.0 - i)
+    handler.handle(ReserveStockCommand("sku-1", 1, "forever", "store-1"))
+
+    assert scheduler.next_deadline() == 100.0
+    released = scheduler.expire_due(now=102.0)
+
+    assert [event.reservation_id for event in released] == ["r4", "r3", "r2"]
+    assert scheduler.next_deadline() == 103.0
+    assert len(scheduler) == 2
+    assert handler.ledger.reservation("r4") is None
+    assert handler.ledger.reservation("forever") is not None
+
+
+def test_reservations_closed_before_expiry_are_not_released():
+    handler = InventoryCommandHandler()
+    scheduler = ReservationExpiryScheduler(handler)
+    reserve(handler, 3)
+    handler.handle(DispatchStockCommand("r0", "customer-7"))
+    handler.handle(ReleaseReservationCommand("r1"))
+
+    assert [event.reservation_id for event in scheduler.expire_due(now=1e9)] == ["r2"]
+    assert scheduler.next_deadline() is None
+
+
+def test_seeds_from_recovered_ledger():
+    handler = InventoryCommandHandler()
+    reserve(handler, 3)
+
+    scheduler = ReservationExpiryScheduler(handler)
+
+    assert len(scheduler) == 3
+    assert len(scheduler.expire_due(now=1e9)) == 3
+
+
+def test_reservation_closed_during_the_sweep_is_skipped():
+    handler = InventoryCommandHandler()
+    scheduler = ReservationExpiryScheduler(handler)
+    reserve(handler, 4)
+    # Another handler on the same ledger closes r2 without telling the scheduler.
+    InventoryCommandHandler(handler.ledger).handle(DispatchStockCommand("r2", "customer-7"))
+    handle = handler.handle
+
+    def racing_handle(command):
+        if command == ReleaseReservationCommand("r1"):
+            # A dispatch lands between the scheduler picking r1 and releasing it.
+            handle(DispatchStockCommand("r1", "customer-7"))
+        return handle(command)
+
+    handler.handle = racing_handle
+    released = scheduler.expire_due(now=1e9)
+
+    assert [event.reservation_id for event in released] == ["r0", "r3"]
+    assert len(scheduler) == 0
+    assert scheduler.next_deadline() is None
+
+
+def test_conflicting_release_is_retried_until_it_applies():
+    handler = InventoryCommandHandler()
+    scheduler = ReservationExpiryScheduler(handler)
+    reserve(handler, 3)
+    handle = handler.handle
+    conflicts = [2]
+
+    def conflicting_handle(command):
+        if command == ReleaseReservationCommand("r1") and conflicts[0]:
+            conflicts[0] -= 1
+            raise ConcurrencyConflictError("lost the race")
+        return handle(command)
+
+    handler.handle = conflicting_handle
+    released = scheduler.expire_due(now=1e9)
+
+    assert [event.reservation_id for event in released] == ["r0", "r1", "r2"]
+    assert len(scheduler) == 0
+
+
+def test_sweep_races_concurrent_dispatches_and_releases():
+    handler = InventoryCommandHandler()
+    scheduler = ReservationExpiryScheduler(handler)
+    count = 2000
+    reserve(handler, count, expires=lambda i: 100.0 + i % 50)
+    closed = []
+    errors = []
+
+    def close(ids):
+        for reservation_id in ids:
+            try:
+                if random.random() < 0.5:
+                    handler.handle(DispatchStockCommand(reservation_id, "customer-7"))
+                else:
+                    handler.handle(ReleaseReservationCommand(reservation_id))
+                closed.append(reservation_id)
+            except UnknownReservationError:
+                pass  # the scheduler got there first
+            except Exception as exc:
+                errors.append(exc)
+
+    ids = [f"r{i}" for i in range(count)]
+    random.shuffle(ids)
+    writers = [threading.Thread(target=close, args=(ids[i::4],)) for i in range(4)]
+    for writer in writers:
+        writer.start()
+    released = []
+    while any(writer.is_alive() for writer in writers) or len(scheduler):
+        released += scheduler.expire_due(now=1e9)
+    for writer in writers:
+        writer.join()
+
+    assert not errors
+    released_ids = [event.reservation_id for event in released]
+    assert sorted(released_ids + closed) == sorted(ids)
+    assert next(handler.ledger.reservations(), None) is None
+    assert scheduler.next_deadline() is None
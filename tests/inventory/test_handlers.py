@@ -0,0 +1,119 @@
+import pytest
+
+from inventory import InventoryCommandHandler, StockLedger
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import (
+    DuplicateReservationError,
+    InsufficientStockError,
+    UnknownReservationError,
+    UnsupportedCommandError,
+)
+from inventory.events import (
+    ReservationReleased,
+    StockAdjusted,
+    StockDispatched,
+    StockReceived,
+    StockReserved,
+)
+
+KEY = ("sku-1", "store-1")
+
+
+@pytest.fixture
+def handler():
+    return InventoryCommandHandler()
+
+
+def test_add_stock_emits_received_and_updates_level(handler):
+    event = handler.handle(AddStockCommand("sku-1", 10, "store-1"))
+
+    assert type(event) is StockReceived
+    assert (event.product_id, event.quantity, event.location_id) == ("sku-1", 10, "store-1")
+    level = handler.ledger.level(KEY)
+    assert (level.on_hand, level.reserved, level.available) == (10, 0, 10)
+
+
+def test_reserve_release_and_dispatch(handler):
+    handler.handle(AddStockCommand("sku-1", 10, "store-1"))
+
+    reserved = handler.handle(ReserveStockCommand("sku-1", 4, "r1", "store-1"))
+    assert type(reserved) is StockReserved
+    assert handler.ledger.available(KEY) == 6
+    assert handler.ledger.reservation("r1").quantity == 4
+
+    released = handler.handle(ReleaseReservationCommand("r1"))
+    assert released == ReservationReleased("r1", "sku-1", "store-1", 4, released.occurred_at)
+    assert handler.ledger.available(KEY) == 10
+    assert handler.ledger.reservation("r1") is None
+
+    handler.handle(ReserveStockCommand("sku-1", 3, "r2", "store-1"))
+    dispatched = handler.handle(DispatchStockCommand("r2", "customer-7"))
+    assert type(dispatched) is StockDispatched
+    assert (dispatched.quantity, dispatched.destination) == (3, "customer-7")
+    level = handler.ledger.level(KEY)
+    assert (level.on_hand, level.reserved) == (7, 0)
+
+
+def test_adjust_stock_both_ways(handler):
+    handler.handle(AddStockCommand("sku-1", 5, "store-1"))
+
+    found = handler.handle(AdjustStockCommand(KEY, 2, "count"))
+    shrink = handler.handle(AdjustStockCommand(KEY, -6, "shrink"))
+
+    assert type(found) is StockAdjusted and type(shrink) is StockAdjusted
+    assert handler.ledger.level(KEY).on_hand == 1
+
+
+def test_rejected_commands_leave_the_ledger_unchanged(handler, ledger_state):
+    handler.handle(AddStockCommand("sku-1", 5, "store-1"))
+    handler.handle(ReserveStockCommand("sku-1", 4, "r1", "store-1"))
+    before = ledger_state(handler.ledger)
+
+    with pytest.raises(InsufficientStockError):
+        handler.handle(ReserveStockCommand("sku-1", 2, "r2", "store-1"))
+    with pytest.raises(InsufficientStockError):
+        handler.handle(AdjustStockCommand(KEY, -2, "shrink"))
+    with pytest.raises(DuplicateReservationError):
+        handler.handle(ReserveStockCommand("sku-1", 1, "r1", "store-1"))
+    with pytest.raises(UnknownReservationError):
+        handler.handle(ReleaseReservationCommand("missing"))
+    with pytest.raises(UnknownReservationError):
+        handler.handle(DispatchStockCommand("missing", "customer-7"))
+    with pytest.raises(UnsupportedCommandError):
+        handler.handle(object())
+
+    assert ledger_state(handler.ledger) == before
+
+
+def test_listeners_receive_each_event(handler):
+    seen = []
+    handler.add_listener(seen.append)
+
+    event = handler.handle(AddStockCommand("sku-1", 5, "store-1"))
+    with pytest.raises(InsufficientStockError):
+        handler.handle(ReserveStockCommand("sku-1", 9, "r1", "store-1"))
+
+    assert seen == [(event,)]
+
+
+def test_replaying_events_rebuilds_the_ledger(ledger_state):
+    events = []
+    handler = InventoryCommandHandler(listeners=[events.extend])
+    handler.handle(AddStockCommand("sku-1", 10, "store-1"))
+    handler.handle(AddStockCommand("sku-2", 4, "store-2"))
+    handler.handle(ReserveStockCommand("sku-1", 3, "r1", "store-1", expiration_time=100.0))
+    handler.handle(ReserveStockCommand("sku-2", 4, "r2", "store-2"))
+    handler.handle(DispatchStockCommand("r2", "customer-7"))
+    handler.handle(AdjustStockCommand(KEY, -2, "shrink"))
+
+    replayed = StockLedger()
+    for event in events:
+        replayed.apply(event)
+
+    assert ledger_state(replayed) == ledger_state(handler.ledger)
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.commands import AddStockCommand, ReserveStockCommand
+from inventory.errors import IdempotencyKeyReuseError
+from inventory.events import StockReceived
+from inventory.idempotency import IdempotencyCache
+
+
+class Clock:
+    """POSIX time shifted by a controllable offset."""
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def __call__(self):
+        return time.time() + self.offset
+
+
+def test_retries_return_the_original_event_without_applying_again():
+    handler = InventoryCommandHandler(idempotency=IdempotencyCache())
+    published = []
+    handler.add_listener(published.extend)
+    add = AddStockCommand("milk", 5, "store-1", idempotency_key="k-add")
+    reserve = ReserveStockCommand("milk", 2, "r1", "store-1", idempotency_key="k-res")
+
+    first = [handler.handle(add), handler.handle(reserve)]
+    retried = [handler.handle(add), handler.handle(reserve)]
+    batched = handler.handle_batch([add, reserve])
+
+    assert retried == batched == first
+    assert retried[0] is first[0] and published == first
+    assert first[0].idempotency_key == "k-add"
+    level = handler.ledger.level(("milk", "store-1"))
+    assert (level.on_hand, level.reserved) == (5, 2)
+
+
+def test_a_key_reused_by_a_different_command_is_rejected():
+    handler = InventoryCommandHandler(idempotency=IdempotencyCache())
+    handler.handle(AddStockCommand("milk", 5, "store-1", idempotency_key="k"))
+    with pytest.raises(IdempotencyKeyReuseError):
+        handler.handle(AddStockCommand("milk", 6, "store-1", idempotency_key="k"))
+    with pytest.raises(IdempotencyKeyReuseError):
+        handler.handle(ReserveStockCommand("milk", 5, "r1", "store-1", idempotency_key="k"))
+
+
+def test_entries_expire_after_the_ttl():
+    clock = Clock()
+    cache = IdempotencyCache(ttl=60, clock=clock)
+    handler = InventoryCommandHandler(idempotency=cache)
+    add = AddStockCommand("milk", 5, "store-1", idempotency_key="k")
+    handler.handle(add)
+
+    clock.offset = 59
+    assert cache.lookup(add) is not None
+    clock.offset = 61
+    assert cache.lookup(add) is None and len(cache) == 0
+    handler.handle(add)
+    assert handler.ledger.level(("milk", "store-1")).on_hand == 10
+
+
+def test_least_recently_used_keys_are_evicted_first():
+    cache = IdempotencyCache(maxsize=2)
+    events = [StockReceived("milk", 1, "store-1", idempotency_key=f"k{i}") for i in range(3)]
+    commands = [AddStockCommand("milk", 1, "store-1", idempotency_key=f"k{i}") for i in range(3)]
+    cache.record(events[:2])
+    assert cache.lookup(commands[0]) is events[0]
+
+    cache.record(events[2:])
+
+    assert len(cache) == 2
+    assert cache.lookup(commands[1]) is None
+    assert cache.lookup(commands[0]) is events[0] and cache.lookup(commands[2]) is events[2]
+
+
+def test_rebuilding_from_events_skips_expired_and_unkeyed_ones():
+    cache = IdempotencyCache(ttl=60)
+    old = StockReceived("milk", 1, "store-1", idempotency_key="old", occurred_at=time.time() - 120)
+    fresh = StockReceived("milk", 1, "store-1", idempotency_key="fresh")
+    cache.record([old, StockReceived("milk", 1, "store-1"), fresh])
+
+    assert len(cache) == 1
+    assert cache.lookup(AddStockCommand("milk", 1, "store-1", idempotency_key="fresh")) is fresh
+
+
+def test_forget_drops_rolled_back_keys():
+    cache = IdempotencyCache()
+    event = StockReceived("milk", 1, "store-1", idempotency_key="k")
+    cache.record([event])
+    cache.forget([event, StockReceived("milk", 1, "store-1")])
+    assert len(cache) == 0
+
+
+def test_concurrent_retries_apply_a_key_once():
+    handler = InventoryCommandHandler(idempotency=IdempotencyCache())
+    handler.handle(AddStockCommand("milk", 100, "store-1"))
+    commands = [ReserveStockCommand("milk", 1, f"r{i}", "store-1", idempotency_key=f"k{i}") for i in range(50)]
+    results = [[] for _ in range(4)]
+    start = threading.Barrier(4)
+
+    def retry(out):
+        start.wait()
+        out.extend(handler.handle(command) for command in commands)
+
+    threads = [threading.Thread(target=retry, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results[0] == results[1] == results[2] == results[3]
+    assert handler.ledger.level(("milk", "store-1")).reserved == 50
+
+
+def test_rejects_an_empty_cache():
+    with pytest.raises(ValueError):
+        IdempotencyCache(maxsize=0)
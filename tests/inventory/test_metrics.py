@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.bus import EventBus
+from inventory.commands import AddStockCommand, ReserveStockCommand
+from inventory.errors import InsufficientStockError
+from inventory.events import StockReceived
+from inventory.metrics import Counter, Histogram, MetricsRegistry
+
+
+def run_in_threads(fn, count):
+    threads = [threading.Thread(target=fn) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_handler_times_commands_and_counts_rejections():
+    metrics = MetricsRegistry()
+    handler = InventoryCommandHandler(metrics=metrics)
+    handler.handle(AddStockCommand("milk", 2, "store-1"))
+    with pytest.raises(InsufficientStockError):
+        handler.handle(ReserveStockCommand("milk", 3, "r1", "store-1"))
+    handler.handle_batch([AddStockCommand("milk", 1, "store-1"), ReserveStockCommand("milk", 3, "r1", "store-1")])
+    with pytest.raises(InsufficientStockError):
+        handler.handle_batch([ReserveStockCommand("milk", 1, "r2", "store-1")])
+
+    snapshot = metrics.snapshot()
+    assert snapshot[("inventory_command_seconds", (("command", "AddStockCommand"),))].count == 1
+    assert snapshot[("inventory_command_seconds", (("command", "ReserveStockCommand"),))].count == 1
+    assert snapshot[("inventory_command_batch_seconds", ())].count == 2
+    assert snapshot[("inventory_batched_commands_total", ())] == 2
+    errors = "inventory_command_errors_total"
+    assert snapshot[(errors, (("command", "ReserveStockCommand"), ("error", "InsufficientStockError")))] == 1
+    assert snapshot[(errors, (("command", "batch"), ("error", "InsufficientStockError")))] == 1
+    # Timing lives in the methods themselves, not in wrappers set on the instance.
+    assert "handle" not in vars(handler) and "handle_batch" not in vars(handler)
+
+
+def test_bus_counters_are_cumulative_across_unsubscribes():
+    metrics = MetricsRegistry()
+
+    async def scenario():
+        bus = EventBus(metrics)
+        events = [StockReceived("milk", i + 1, "store-1") for i in range(3)]
+        first = bus.subscribe(lambda event: None, maxsize=2)
+        bus.subscribe(lambda event: 1 / 0)
+        bus.publish_nowait(events)
+        await bus.drain()
+        bus.unsubscribe(first)
+        assert bus.total("delivered") == 5 and bus.total("dropped") == 1 and bus.total("errors") == 3
+        await bus.close()
+        return bus
+
+    bus = asyncio.run(scenario())
+    snapshot = metrics.snapshot()
+    assert snapshot[("inventory_bus_delivered_events_total", ())] == 5
+    assert snapshot[("inventory_bus_dropped_events_total", ())] == 1
+    assert snapshot[("inventory_bus_handler_errors_total", ())] == 3
+    assert snapshot[("inventory_bus_subscriptions", ())] == 0 and bus.subscriptions == ()
+    text = metrics.render_prometheus()
+    assert "# TYPE inventory_bus_delivered_events_total counter\ninventory_bus_delivered_events_total 5\n" in text
+    assert "# TYPE inventory_bus_pending_events gauge\n" in text
+
+
+def test_shards_of_exited_threads_are_folded_into_the_total():
+    counter = Counter()
+    histogram = Histogram((1.0, 2.0))
+
+    def record():
+        for value in (0.5, 1.5, 3.0):
+            counter.inc(2)
+            histogram.observe(value)
+
+    run_in_threads(record, 8)
+    assert counter.value() == 48
+    snapshot = histogram.snapshot()
+    assert snapshot.counts == (8, 8, 8) and snapshot.total == pytest.approx(40.0)
+    assert counter._shards == [] and histogram._shards == []
+
+    run_in_threads(record, 3)
+    counter.inc()
+    assert counter.value() == 67 and len(counter._shards) == 1
+    assert histogram.snapshot().count == 33
+
+
+def test_registry_reuses_series_and_keeps_kinds_apart():
+    metrics = MetricsRegistry()
+    counter = metrics.counter("jobs_total", "Jobs.", {"queue": "a"})
+    assert metrics.counter("jobs_total", "Jobs.", {"queue": "a"}) is counter
+    assert metrics.counter("jobs_total", "Jobs.", {"queue": "b"}) is not counter
+    with pytest.raises(ValueError):
+        metrics.histogram("jobs_total", "Jobs.")
+    with pytest.raises(ValueError):
+        metrics.observed_counter("jobs_total", "Jobs.", lambda: 1, {"queue": "a"})
+    metrics.observed_counter("seen_total", "Seen.", lambda: 7)
+    with pytest.raises(ValueError):
+        metrics.counter("seen_total", "Seen.")
+
+    counter.inc(3)
+    metrics.histogram("wait_seconds", 'Wait "time".\nSeconds.', {"queue": 'a"b'}, bounds=(0.1, 1.0)).observe(0.5)
+    text = metrics.render_prometheus()
+
+    assert 'jobs_total{queue="a"} 3\n' in text and "seen_total 7\n" in text
+    assert '# HELP wait_seconds Wait "time".\\nSeconds.\n' in text
+    assert 'wait_seconds_bucket{queue="a\\"b",le="0.1"} 0\n' in text
+    assert 'wait_seconds_bucket{queue="a\\"b",le="+Inf"} 1\n' in text
+    assert 'wait_seconds_count{queue="a\\"b"} 1\n' in text
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0, 9.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot.quantile(0.5) == 2.0 and snapshot.quantile(0.8) == 4.0
+    assert snapshot.quantile(1.0) == float("inf")
+    assert Histogram().snapshot().quantile(0.99) == 0.0
+    with pytest.raises(ValueError):
+        Histogram((2.0, 1.0))
@@ -0,0 +1,161 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from inventory import InventoryCommandHandler
+from inventory.commands import AddStockCommand, ReleaseReservationCommand, ReserveStockCommand
+from inventory.errors import InsufficientStockError
+from inventory.outbox import OutboxRelay, SQLiteOutbox
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = SQLiteOutbox(tmp_path / "outbox.db")
+    yield outbox
+    outbox.close()
+
+
+def fail_writes(outbox, monkeypatch):
+    def write(events):
+        raise sqlite3.OperationalError("disk I/O error")
+    monkeypatch.setattr(outbox, "write", write)
+
+
+def test_events_are_recorded_in_command_order(outbox):
+    handler = InventoryCommandHandler(outbox=outbox)
+    added = handler.handle(AddStockCommand("milk", 5, "store-1"))
+    batch = handler.handle_batch([
+        ReserveStockCommand("milk", 2, "r1", "store-1"),
+        ReleaseReservationCommand("r1"),
+    ])
+
+    assert len(outbox) == 3
+    assert [event for _, event in outbox.fetch(10)] == [added, *batch]
+
+
+def test_rejected_commands_record_nothing(outbox):
+    handler = InventoryCommandHandler(outbox=outbox)
+    with pytest.raises(InsufficientStockError):
+        handler.handle(ReserveStockCommand("milk", 1, "r1", "store-1"))
+    with pytest.raises(InsufficientStockError):
+        handler.handle_batch([
+            AddStockCommand("milk", 1, "store-1"),
+            ReserveStockCommand("milk", 2, "r1", "store-1"),
+        ])
+    assert len(outbox) == 0 and outbox.fetch(10) == []
+
+
+def test_failed_write_leaves_the_ledger_unchanged(outbox, monkeypatch, ledger_state):
+    published = []
+    handler = InventoryCommandHandler(listeners=[published.extend], outbox=outbox)
+    handler.handle(AddStockCommand("milk", 5, "store-1"))
+    before = ledger_state(handler.ledger)
+    fail_writes(outbox, monkeypatch)
+
+    with pytest.raises(sqlite3.OperationalError):
+        handler.handle(ReserveStockCommand("milk", 2, "r1", "store-1"))
+    with pytest.raises(sqlite3.OperationalError):
+        handler.handle_batch([
+            AddStockCommand("milk", 1, "store-1"),
+            ReserveStockCommand("milk", 2, "r2", "store-1"),
+        ])
+
+    assert ledger_state(handler.ledger) == before
+    assert len(published) == 1 and len(outbox) == 1
+
+
+def test_full_outbox_blocks_writers_before_they_take_locks(tmp_path):
+    outbox = SQLiteOutbox(tmp_path / "outbox.db", max_pending=2)
+    handler = InventoryCommandHandler(outbox=outbox)
+    handler.handle(AddStockCommand("milk", 1, "store-1"))
+    handler.handle(AddStockCommand("milk", 1, "store-1"))
+    assert not outbox.wait_for_space(timeout=0.01)
+
+    writer = threading.Thread(target=handler.handle, args=(AddStockCommand("milk", 1, "store-1"),))
+    writer.start()
+    time.sleep(0.05)
+    assert writer.is_alive()
+    # The blocked writer holds no stripe lock, so the relay and readers never wait on it.
+    for lock in handler.ledger.all_locks():
+        assert lock.acquire(blocking=False)
+        lock.release()
+
+    outbox.acknowledge(outbox.fetch(1)[0][0])
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert handler.ledger.level(("milk", "store-1")).on_hand == 3
+    outbox.close()
+
+
+def test_relay_publishes_everything_in_order(outbox):
+    batches = []
+    handler = InventoryCommandHandler(outbox=outbox)
+    events = [handler.handle(AddStockCommand("milk", 1, "store-1")) for _ in range(7)]
+
+    with OutboxRelay(outbox, batches.append, batch_size=3, poll_interval=0.01):
+        events += [handler.handle(AddStockCommand("milk", 1, "store-1")) for _ in range(5)]
+
+    assert [len(batch) for batch in batches][:2] == [3, 3]
+    assert [event for batch in batches for event in batch] == events
+    assert len(outbox) == 0
+
+
+def test_failed_publish_is_retried_with_the_same_batch(outbox):
+    attempts = []
+
+    def publish(events):
+        attempts.append(list(events))
+        if len(attempts) < 3:
+            raise ConnectionError("broker unavailable")
+
+    handler = InventoryCommandHandler(outbox=outbox)
+    events = [handler.handle(AddStockCommand("milk", 1, "store-1")) for _ in range(3)]
+    relay = OutboxRelay(outbox, publish, poll_interval=0.01, retry_delay=0.01)
+    relay.start()
+    deadline = time.monotonic() + 5
+    while len(outbox) and time.monotonic() < deadline:
+        time.sleep(0.005)
+    relay.stop()
+
+    assert attempts == [events] * 3
+    assert relay.failures == 2 and relay.published == 3
+    assert len(outbox) == 0
+
+
+def test_stop_leaves_unpublished_events_for_the_next_relay(tmp_path):
+    path = tmp_path / "outbox.db"
+    outbox = SQLiteOutbox(path)
+    handler = InventoryCommandHandler(outbox=outbox)
+    events = [handler.handle(AddStockCommand("milk", 1, "store-1")) for _ in range(4)]
+
+    def broker_down(batch):
+        raise ConnectionError("broker unavailable")
+
+    relay = OutboxRelay(outbox, broker_down, poll_interval=0.01, retry_delay=10)
+    relay.start()
+    started = time.monotonic()
+    relay.stop()
+    assert time.monotonic() - started < 5
+    assert isinstance(relay.last_error, ConnectionError)
+    outbox.close()
+
+    reopened = SQLiteOutbox(path)
+    published = []
+    assert len(reopened) == 4
+    assert reopened.wait_for_events(timeout=0)
+    with OutboxRelay(reopened, published.extend, poll_interval=0.01):
+        pass
+    assert published == events
+    reopened.close()
+
+
+def test_stop_wakes_an_idle_relay(outbox):
+    relay = OutboxRelay(outbox, lambda events: None, poll_interval=60)
+    relay.start()
+    time.sleep(0.02)
+    started = time.monotonic()
+    relay.stop()
+    assert time.monotonic() - started < 5
+    assert not outbox.wait_for_events(timeout=0)
@@ -0,0 +1,122 @@
+import pytest
+
+from inventory import AvailabilityProjection, InventoryCommandHandler, InventoryQueryHandler
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import UnsupportedQueryError
+from inventory.queries import (
+    AvailabilityQuery,
+    BatchAvailability,
+    BatchAvailabilityQuery,
+    LocationAvailabilityQuery,
+    ProductAvailabilityQuery,
+)
+
+
+def run_commands(handler):
+    handler.handle(AddStockCommand("sku-1", 10, "store-1"))
+    handler.handle(AddStockCommand("sku-1", 5, "store-2"))
+    handler.handle(AddStockCommand("sku-2", 7, "store-1"))
+    handler.handle(ReserveStockCommand("sku-1", 4, "r1", "store-1"))
+    handler.handle(ReserveStockCommand("sku-2", 2, "r2", "store-1"))
+    handler.handle(ReserveStockCommand("sku-1", 1, "r3", "store-2"))
+    handler.handle(DispatchStockCommand("r2", "customer-7"))
+    handler.handle(ReleaseReservationCommand("r3"))
+    handler.handle(AdjustStockCommand(("sku-1", "store-2"), -2, "shrink"))
+
+
+def expected_from_ledger(ledger):
+    by_key = {key: level.available for key, level in ledger.levels()}
+    by_product, by_location = {}, {}
+    for (product_id, location_id), available in by_key.items():
+        by_product[product_id] = by_product.get(product_id, 0) + available
+        by_location[location_id] = by_location.get(location_id, 0) + available
+    return by_key, by_product, by_location
+
+
+def answers(queries, ledger):
+    by_key, by_product, by_location = expected_from_ledger(ledger)
+    for (product_id, location_id), available in by_key.items():
+        assert queries.handle(AvailabilityQuery(product_id, location_id)) == available
+    for product_id, available in by_product.items():
+        assert queries.handle(ProductAvailabilityQuery(product_id)) == available
+    for location_id, available in by_location.items():
+        assert queries.handle(LocationAvailabilityQuery(location_id)) == available
+
+
+def test_projection_tracks_the_ledger_through_every_event_type():
+    projection = AvailabilityProjection()
+    handler = InventoryCommandHandler(listeners=[projection])
+    run_commands(handler)
+
+    answers(InventoryQueryHandler(projection), handler.ledger)
+    assert projection.available("sku-1", "store-1") == 6
+    assert projection.available_for_product("sku-1") == 9
+
+
+def test_projection_seeded_from_a_ledger_matches_one_fed_by_events():
+    handler = InventoryCommandHandler()
+    run_commands(handler)
+
+    answers(InventoryQueryHandler(AvailabilityProjection.from_ledger(handler.ledger)), handler.ledger)
+
+
+def test_untracked_stock_is_zero_and_unknown_queries_are_rejected():
+    queries = InventoryQueryHandler(AvailabilityProjection())
+
+    assert queries.handle(AvailabilityQuery("sku-x", "store-x")) == 0
+    assert queries.handle(ProductAvailabilityQuery("sku-x")) == 0
+    assert queries.handle(LocationAvailabilityQuery("store-x")) == 0
+    with pytest.raises(UnsupportedQueryError):
+        queries.handle(object())
+
+
+def test_batch_query_checks_every_line_against_combined_demand():
+    projection = AvailabilityProjection()
+    handler = InventoryCommandHandler(listeners=[projection])
+    run_commands(handler)
+    queries = InventoryQueryHandler(projection)
+
+    one_store = queries.handle(
+        BatchAvailabilityQuery(("sku-1", "sku-2", "sku-1"), ("store-1",) * 3, (3, 5, 3))
+    )
+    mixed = queries.handle(
+        BatchAvailabilityQuery(("sku-1", "sku-1", "sku-x"), ("store-1", "store-2", "store-1"), (6, 4, 1))
+    )
+
+    # sku-1 at store-1 has 6 available, so the two lines of 3 together fit.
+    assert one_store == BatchAvailability((6, 5, 6), (True, True, True))
+    assert mixed == BatchAvailability((6, 3, 0), (True, False, False))
+    assert one_store.all_promisable and not mixed.all_promisable
+    assert queries.handle(BatchAvailabilityQuery((), (), ())).all_promisable
+
+
+@pytest.mark.parametrize(
+    "product_ids, location_ids, quantities, error, message",
+    [
+        (("sku-1", ""), ("s", "s"), (1, 1), ValueError, r"product_ids\[1\] must be a non-empty string, got ''"),
+        (("sku-1",), (7,), (1,), ValueError, r"location_ids\[0\] must be a non-empty string, got 7"),
+        (("sku-1", "sku-2"), ("s", "s"), (1, 0), ValueError, r"quantities\[1\] must be positive, got 0"),
+        (("sku-1",), ("s",), (True,), TypeError, r"quantities\[0\] must be an int, got bool$"),
+        (("sku-1",), ("s", "s"), (1,), ValueError, "same length"),
+    ],
+)
+def test_batch_query_names_the_invalid_line(product_ids, location_ids, quantities, error, message):
+    with pytest.raises(error, match=message):
+        BatchAvailabilityQuery(product_ids, location_ids, quantities)
+
+
+def test_batch_query_rejects_numpy_input_with_a_conversion_hint():
+    np = pytest.importorskip("numpy")
+    hint = r" \(convert NumPy arrays with .tolist\(\) first\)"
+    with pytest.raises(ValueError, match=r"product_ids\[0\] .*got np.str_\('sku-1'\)" + hint):
+        BatchAvailabilityQuery(np.array(["sku-1"]), ("s",), (1,))
+    with pytest.raises(TypeError, match=r"quantities\[0\] must be an int, got int64" + hint):
+        BatchAvailabilityQuery(("sku-1",), ("s",), np.array([1]))
+    quantities = np.array([2, 1])
+    assert BatchAvailabilityQuery(("sku-1", "sku-2"), ("s", "s"), tuple(quantities.tolist())).quantities == (2, 1)
@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReleaseReservationCommand,
+    ReserveStockCommand,
+)
+from inventory.errors import DuplicateReservationError, InsufficientStockError, UnknownReservationError
+from inventory.events import ReservationReleased, StockDispatched, StockReserved
+from inventory.queries import AvailabilityQuery
+from inventory.sharding import ShardedInventoryEngine, ShardWorkerError, shard_for
+
+SKUS = [f"sku-{i}" for i in range(8)]
+
+
+@pytest.fixture
+def engine():
+    with ShardedInventoryEngine(3) as engine:
+        engine.handle_many([AddStockCommand(sku, 10, "store-1") for sku in SKUS])
+        yield engine
+
+
+def test_commands_are_routed_to_the_owning_shard(engine):
+    results = engine.handle_many([
+        ReserveStockCommand(sku, 3, f"r-{sku}", "store-1") for sku in SKUS
+    ] + [AdjustStockCommand(("sku-0", "store-1"), -2, "shrink")])
+
+    assert [type(result) for result in results[:-1]] == [StockReserved] * len(SKUS)
+    assert engine.handle(AvailabilityQuery("sku-0", "store-1")) == 5
+    assert engine.available_at_location("store-1") == 8 * 7 - 2
+    assert {engine.shard_of(ReleaseReservationCommand(f"r-{sku}")) for sku in SKUS} == {
+        shard_for(sku, 3) for sku in SKUS
+    }
+
+    results = engine.handle_many([
+        DispatchStockCommand("r-sku-1", "customer-7"),
+        ReleaseReservationCommand("r-sku-2"),
+        ReleaseReservationCommand("r-sku-2"),
+    ])
+    assert type(results[0]) is StockDispatched
+    assert type(results[1]) is ReservationReleased
+    assert type(results[2]) is UnknownReservationError
+
+
+def test_errors_are_returned_per_command_and_raised_by_handle(engine):
+    results = engine.handle_many([
+        ReserveStockCommand("sku-0", 99, "r1", "store-1"),
+        ReserveStockCommand("sku-1", 1, "r2", "store-1"),
+        ReserveStockCommand("sku-2", 1, "r2", "store-1"),
+    ])
+
+    assert type(results[0]) is InsufficientStockError
+    assert type(results[1]) is StockReserved
+    assert type(results[2]) is DuplicateReservationError
+    # The rejected reservation id is free again.
+    assert engine.handle(ReserveStockCommand("sku-3", 1, "r1", "store-1")).product_id == "sku-3"
+    with pytest.raises(UnknownReservationError):
+        engine.handle(ReleaseReservationCommand("missing"))
+
+
+def test_reservation_closed_and_reopened_in_one_call(engine):
+    engine.handle(ReserveStockCommand("sku-0", 1, "r1", "store-1"))
+
+    results = engine.handle_many([
+        ReleaseReservationCommand("r1"),
+        ReserveStockCommand("sku-5", 2, "r1", "store-1"),
+    ])
+
+    assert [type(result) for result in results] == [ReservationReleased, StockReserved]
+    assert engine.handle(ReleaseReservationCommand("r1")).product_id == "sku-5"
+
+
+def test_failed_release_keeps_the_reservation_routed(engine):
+    engine.handle(ReserveStockCommand("sku-4", 1, "r1", "store-1"))
+    exchange = engine._exchange
+
+    def failing_exchange(batches):
+        # The owning shard reports a failure, e.g. its event store could not append.
+        return {shard: [OSError("disk full")] * len(items) for shard, items in batches.items()}
+
+    engine._exchange = failing_exchange
+    assert type(engine.handle_many([ReleaseReservationCommand("r1")])[0]) is OSError
+    assert type(engine.handle_many([DispatchStockCommand("r1", "customer-7")])[0]) is OSError
+    engine._exchange = exchange
+
+    assert engine.shard_of(ReleaseReservationCommand("r1")) == shard_for("sku-4", 3)
+    assert type(engine.handle(ReleaseReservationCommand("r1"))) is ReservationReleased
+
+
+def test_worker_failing_at_startup_raises_instead_of_hanging(tmp_path):
+    not_a_directory = tmp_path / "events"
+    not_a_directory.write_text("")
+
+    started = time.monotonic()
+    with pytest.raises(ShardWorkerError, match="exited with code"):
+        ShardedInventoryEngine(2, directory=not_a_directory)
+    assert time.monotonic() - started < 10
+
+
+def test_worker_dying_later_fails_calls_instead_of_hanging(engine):
+    engine._workers[shard_for("sku-0", 3)].kill()
+
+    started = time.monotonic()
+    with pytest.raises(ShardWorkerError):
+        engine.handle(ReserveStockCommand("sku-0", 1, "r1", "store-1"))
+    assert time.monotonic() - started < 10
+
+
+def test_recovered_shards_announce_their_open_reservations(tmp_path):
+    with ShardedInventoryEngine(2, directory=tmp_path) as engine:
+        engine.handle_many([AddStockCommand(sku, 10, "store-1") for sku in SKUS])
+        engine.handle_many([ReserveStockCommand(sku, 1, f"r-{sku}", "store-1") for sku in SKUS])
+
+    with ShardedInventoryEngine(2, directory=tmp_path) as engine:
+        assert engine.handle(AvailabilityQuery("sku-3", "store-1")) == 9
+        released = engine.handle_many([ReleaseReservationCommand(f"r-{sku}") for sku in SKUS])
+        assert [type(result) for result in released] == [ReservationReleased] * len(SKUS)
@@ -0,0 +1,168 @@
+import threading
+
+import pytest
+
+from inventory import InventoryCommandHandler, StockLedger
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    DispatchStockCommand,
+    ReserveStockCommand,
+)
+from inventory.eventstore import EventStore
+from inventory.snapshots import (
+    CorruptSnapshotError,
+    Snapshotter,
+    SnapshotStore,
+    decode_snapshot,
+    encode_snapshot,
+    recover_ledger,
+)
+
+
+def populate(handler, start=0, count=20):
+    for i in range(start, start + count):
+        sku = f"sku-{i % 7}"
+        handler.handle(AddStockCommand(sku, 10, "störe-1", f"lot-{i}", 1_700_000_000.0 + i % 5))
+        handler.handle(AddStockCommand(sku, 3, "store-2"))
+        handler.handle(ReserveStockCommand(sku, 4, f"r{i}", "störe-1", 1_800_000_000.0 if i % 2 else None))
+        handler.handle(ReserveStockCommand(sku, 1, f"s{i}", "store-2"))
+        if i % 3 == 0:
+            handler.handle(DispatchStockCommand(f"s{i}", "customer-7"))
+        if i % 4 == 0:
+            handler.handle(AdjustStockCommand((sku, "störe-1"), -1, "shrink"))
+
+
+def test_snapshot_round_trips_levels_reservations_and_batches(ledger_state):
+    handler = InventoryCommandHandler()
+    populate(handler)
+
+    ledger, offset = decode_snapshot(encode_snapshot(handler.ledger, 1234))
+
+    assert offset == 1234
+    assert ledger_state(ledger) == ledger_state(handler.ledger)
+    assert any(r.allocation for r in ledger.reservations())
+
+
+def test_decode_rejects_damaged_snapshots():
+    handler = InventoryCommandHandler()
+    populate(handler, count=3)
+    data = bytearray(encode_snapshot(handler.ledger, 7))
+    data[20] ^= 0xFF
+
+    with pytest.raises(CorruptSnapshotError):
+        decode_snapshot(bytes(data))
+    with pytest.raises(CorruptSnapshotError):
+        decode_snapshot(b"not a snapshot")
+
+
+def test_recover_replays_only_events_after_the_snapshot(tmp_path, ledger_state):
+    store = EventStore(tmp_path / "events")
+    snapshots = SnapshotStore(tmp_path / "snapshots")
+    handler = InventoryCommandHandler(listeners=[store.append])
+    populate(handler)
+    snapshots.save(handler.ledger, store.next_offset)
+    covered = store.next_offset
+    populate(handler, start=20, count=5)
+
+    ledger, replayed = recover_ledger(store, snapshots)
+
+    assert replayed == store.next_offset - covered
+    assert ledger_state(ledger) == ledger_state(handler.ledger)
+    store.close()
+
+
+def test_recover_skips_a_corrupt_newest_snapshot(tmp_path, ledger_state):
+    store = EventStore(tmp_path / "events")
+    snapshots = SnapshotStore(tmp_path / "snapshots", keep=3)
+    handler = InventoryCommandHandler(listeners=[store.append])
+    populate(handler, count=5)
+    snapshots.save(handler.ledger, store.next_offset)
+    populate(handler, start=5, count=5)
+    newest = snapshots.save(handler.ledger, store.next_offset)
+    newest.write_bytes(newest.read_bytes()[:-1])
+
+    ledger, replayed = recover_ledger(store, snapshots)
+
+    assert replayed > 0
+    assert ledger_state(ledger) == ledger_state(handler.ledger)
+    store.close()
+
+
+def test_snapshot_store_keeps_only_the_newest(tmp_path):
+    handler = InventoryCommandHandler()
+    snapshots = SnapshotStore(tmp_path, keep=2)
+    for offset in (10, 20, 30):
+        snapshots.save(handler.ledger, offset)
+
+    assert [path.name for path in snapshots.paths()] == [f"{20:020d}.snap", f"{30:020d}.snap"]
+    assert snapshots.load_latest()[1] == 30
+
+
+def write_concurrently(handler, threads=4, rounds=300):
+    errors = []
+
+    def work(worker):
+        try:
+            for i in range(rounds):
+                sku = f"sku-{(worker * 7 + i) % 23}"
+                location = f"store-{i % 3}"
+                reservation_id = f"w{worker}-{i}"
+                handler.handle(AddStockCommand(sku, 5, location, f"lot-{i % 4}", 100.0 + i % 4))
+                handler.handle(ReserveStockCommand(sku, 2, reservation_id, location))
+                if i % 2:
+                    handler.handle(DispatchStockCommand(reservation_id, "customer-7"))
+                handler.handle(AdjustStockCommand((sku, location), -1, "shrink"))
+        except Exception as exc:
+            errors.append(exc)
+
+    workers = [threading.Thread(target=work, args=(worker,)) for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    return workers, errors
+
+
+def assert_snapshots_match_the_log(store, snapshots, ledger_state):
+    for path in snapshots.paths():
+        ledger, offset = decode_snapshot(path.read_bytes())
+        replayed = StockLedger()
+        for event in store.replay(0, offset):
+            replayed.apply(event)
+        assert ledger_state(ledger) == ledger_state(replayed), path.name
+
+
+def test_snapshots_taken_by_listener_under_concurrent_writers_are_consistent(tmp_path, ledger_state):
+    store = EventStore(tmp_path / "events")
+    snapshots = SnapshotStore(tmp_path / "snapshots", keep=1_000_000)
+    handler = InventoryCommandHandler(listeners=[store.append])
+    handler.add_listener(Snapshotter(handler.ledger, store, snapshots, every_events=7))
+
+    workers, errors = write_concurrently(handler)
+    for worker in workers:
+        worker.join()
+
+    assert not errors
+    assert snapshots.paths()
+    assert_snapshots_match_the_log(store, snapshots, ledger_state)
+    ledger, _ = recover_ledger(store, snapshots)
+    assert ledger_state(ledger) == ledger_state(handler.ledger)
+    store.close()
+
+
+def test_snapshot_called_while_writers_run_is_consistent(tmp_path, ledger_state):
+    store = EventStore(tmp_path / "events")
+    snapshots = SnapshotStore(tmp_path / "snapshots", keep=1_000_000)
+    handler = InventoryCommandHandler(listeners=[store.append])
+    snapshotter = Snapshotter(handler.ledger, store, snapshots)
+
+    workers, errors = write_concurrently(handler)
+    while any(worker.is_alive() for worker in workers):
+        snapshotter.snapshot()
+    for worker in workers:
+        worker.join()
+
+    assert not errors
+    assert_snapshots_match_the_log(store, snapshots, ledger_state)
+    ledger, _ = recover_ledger(store, snapshots)
+    assert ledger_state(ledger) == ledger_state(handler.ledger)
+    store.close()
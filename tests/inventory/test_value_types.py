@@ -0,0 +1,50 @@
+import dataclasses
+
+import pytest
+
+from inventory.commands import (
+    AddStockCommand,
+    AdjustStockCommand,
+    AllocateStockCommand,
+    ReserveStockCommand,
+)
+from inventory.events import StockAdjusted, StockReceived, StockReserved
+
+
+@pytest.mark.parametrize("value", [
+    AddStockCommand("sku-1", 1, "store-1"),
+    ReserveStockCommand("sku-1", 1, "r1", "store-1"),
+    StockReceived("sku-1", 1, "store-1"),
+    StockAdjusted("adj-1", -1, "shrink", "sku-1", "store-1"),
+])
+def test_value_types_are_frozen_and_slotted(value):
+    assert not hasattr(value, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        value.product_id = "sku-2"
+
+
+def test_equal_values_compare_and_hash_alike():
+    event = StockReserved("sku-1", 2, "r1", "store-1", occurred_at=1.0)
+
+    assert event == StockReserved("sku-1", 2, "r1", "store-1", occurred_at=1.0)
+    assert len({event, StockReserved("sku-1", 2, "r1", "store-1", occurred_at=1.0)}) == 1
+    # metadata is carried but not compared.
+    assert AddStockCommand("sku-1", 1, "store-1", metadata={"po": "7"}) == AddStockCommand("sku-1", 1, "store-1")
+
+
+@pytest.mark.parametrize("build, error", [
+    (lambda: AddStockCommand("", 1, "store-1"), ValueError),
+    (lambda: AddStockCommand("sku-1", 0, "store-1"), ValueError),
+    (lambda: AddStockCommand("sku-1", 1.5, "store-1"), TypeError),
+    (lambda: AddStockCommand("sku-1", True, "store-1"), TypeError),
+    (lambda: AddStockCommand("sku-1", 1, "store-1", expiration_time="soon"), TypeError),
+    (lambda: ReserveStockCommand("sku-1", 1, "", "store-1"), ValueError),
+    (lambda: AdjustStockCommand(("sku-1",), 1, "count"), ValueError),
+    (lambda: AdjustStockCommand(("sku-1", "store-1"), 0, "count"), ValueError),
+    (lambda: AllocateStockCommand("sku-1", 1, "r1", ()), ValueError),
+    (lambda: AllocateStockCommand("sku-1", 1, "r1", (("a", 1.0), ("a", 2.0))), ValueError),
+    (lambda: StockAdjusted("adj-1", 0, "shrink", "sku-1", "store-1"), ValueError),
+])
+def test_constructors_reject_malformed_fields(build, error):
+    with pytest.raises(error):
+        build()
@@ -0,0 +1,295 @@
+import json
+import time
+from email.utils import format_datetime
+from datetime import datetime, timezone
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+import bootstrap_github as bootstrap  # noqa: E402
+
+NOW = 1_700_000_000.0
+
+
+class FakeTime:
+    """Monotonic and wall clocks that only move when sleep() is called."""
+
+    def __init__(self):
+        self.monotonic = 0.0
+        self.slept = []
+
+    def clock(self):
+        return self.monotonic
+
+    def wall_clock(self):
+        return NOW + self.monotonic
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.monotonic += seconds
+
+
+def limiter(fake, **options):
+    return bootstrap.RateLimiter(clock=fake.clock, wall_clock=fake.wall_clock, sleep=fake.sleep, **options)
+
+
+def response(status=200, headers=None, body=None):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    result._content = json.dumps(body if body is not None else {}).encode()
+    return result
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    later = datetime.fromtimestamp(NOW + 42, timezone.utc)
+
+    assert bootstrap.parse_retry_after("7", NOW) == 7.0
+    assert bootstrap.parse_retry_after(format_datetime(later, usegmt=True), NOW) == pytest.approx(42.0)
+    assert bootstrap.parse_retry_after(later.strftime("%a, %d %b %Y %H:%M:%S"), NOW) == pytest.approx(42.0)
+    for invalid in (None, "", "soon", "nan", "inf"):
+        assert bootstrap.parse_retry_after(invalid, NOW) is None
+
+
+def test_rate_limited_response_pauses_until_the_retry_after_date():
+    fake = FakeTime()
+    rate_limiter = limiter(fake)
+    date = format_datetime(datetime.fromtimestamp(NOW + 30, timezone.utc), usegmt=True)
+
+    pause = rate_limiter.observe("core", response(429, {"Retry-After": date}))
+
+    assert 30.0 <= pause <= 30.0 * 1.25
+    rate_limiter.acquire("core")
+    assert sum(fake.slept) == pytest.approx(pause)
+
+
+def test_unparsable_retry_after_falls_back_to_exponential_backoff():
+    rate_limiter = limiter(FakeTime(), max_backoff=8)
+    pauses = [rate_limiter.observe("core", response(429, {"Retry-After": "later"})) for _ in range(5)]
+    for pause, backoff in zip(pauses, (1, 2, 4, 8, 8)):
+        assert backoff <= pause <= backoff * 1.25
+
+
+def test_send_retries_and_resets_the_backoff_after_success():
+    rate_limiter = limiter(FakeTime())
+    replies = iter([response(429), response(429), response(200)])
+
+    result = rate_limiter.send("core", 1, lambda: next(replies))
+
+    assert result.status_code == 200
+    assert rate_limiter._backoff == 0.0
+
+
+class FakeSession:
+    def __init__(self, cost):
+        self.cost = cost
+        self.posts = 0
+
+    def post(self, url, headers, json, timeout):
+        self.posts += 1
+        return response(body={"data": {
+            "rateLimit": {"cost": self.cost, "remaining": 4900, "resetAt": "2030-01-01T00:00:00Z"},
+            "viewer": {"login": "octocat"},
+        }})
+
+
+def test_graphql_quota_is_charged_the_reported_query_cost():
+    fake = FakeTime()
+    rate_limiter = limiter(fake, max_rate=10.0, reserve=0)
+    client = bootstrap.GitHubGraphQLClient("token", session=FakeSession(cost=4), limiter=rate_limiter)
+    query = "query { rateLimit { cost remaining resetAt } viewer { login } }"
+
+    assert client.query(query) == {"viewer": {"login": "octocat"}}
+    tokens_before = rate_limiter._buckets["graphql"][2]
+    client.query(query)
+    assert rate_limiter._buckets["graphql"][2] == pytest.approx(tokens_before - 4)
+    client.query("query { viewer { login } }")
+    assert rate_limiter._buckets["graphql"][2] == pytest.approx(tokens_before - 5)
+
+
+def test_primary_quota_pauses_once_the_reserve_is_reached():
+    fake = FakeTime()
+    rate_limiter = limiter(fake, reserve=100)
+    rate_limiter.observe("core", response(200, {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(NOW + 120)}))
+
+    rate_limiter.acquire("core")
+
+    assert sum(fake.slept) >= 120
+
+
+class IssuePagesSession:
+    """Serves the repository's issues two per GraphQL page."""
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.variables = []
+
+    def post(self, url, headers, json, timeout):
+        variables = json["variables"]
+        self.variables.append(variables)
+        start = int(variables["after"] or 0)
+        end = start + variables["first"]
+        return response(body={"data": {"repository": {"issues": {
+            "pageInfo": {"hasNextPage": end < len(self.issues), "endCursor": str(end)},
+            "nodes": self.issues[start:end],
+        }}}})
+
+
+def test_repository_issues_are_paged_in_the_rest_issue_shape():
+    issues = [
+        {"node_id": f"I_{n}", "number": n, "title": f"Issue {n}", "body": "text",
+         "labels": {"nodes": [{"name": "phase-0"}]}, "milestone": {"number": 1} if n % 2 else None}
+        for n in range(5, 0, -1)
+    ]
+    session = IssuePagesSession(issues)
+    client = bootstrap.GitHubGraphQLClient("token", session=session, limiter=limiter(FakeTime()))
+
+    pages = list(bootstrap.get_repository_issues(client, "owner", "repo", page_size=2))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [variables["after"] for variables in session.variables] == [None, "2", "4"]
+    first = pages[0][0]
+    assert first == {"node_id": "I_5", "number": 5, "title": "Issue 5", "body": "text",
+                     "labels": [{"name": "phase-0"}], "milestone": {"number": 1}}
+    # An issue read this way compares equal to its unchanged definition.
+    issue_def = {"title": "Issue 5", "body": "text", "labels": ["phase-0"]}
+    assert bootstrap.upsert_issue(None, issue_def, first, 1) == ("skipped", 5, "I_5")
+
+
+class RecordingRESTClient:
+    def __init__(self):
+        self.updates = []
+
+    def update_issue(self, number, body, labels, milestone):
+        self.updates.append((number, body, labels, milestone))
+
+
+def test_forced_upsert_updates_an_issue_known_only_by_number():
+    rest_client = RecordingRESTClient()
+    issue_def = {"title": "Issue 5", "body": "text", "labels": ["phase-0"]}
+
+    result = bootstrap.upsert_issue(rest_client, issue_def, {"number": 5, "node_id": "I_5"}, 1, force=True)
+
+    assert result == ("updated", 5, "I_5")
+    assert rest_client.updates == [(5, "text", ["phase-0"], 1)]
+
+
+def test_forced_titles_are_updated_without_comparing():
+    rest_client = RecordingRESTClient()
+    issue_def = {"title": "Issue 5", "body": "text", "labels": []}
+    unchanged = {"number": 5, "node_id": "I_5", "body": "text", "labels": [], "milestone": None}
+
+    (plain,) = bootstrap.upsert_issues(rest_client, [issue_def], {"Issue 5": unchanged}, {}, workers=1)
+    (forced,) = bootstrap.upsert_issues(
+        rest_client, [issue_def], {"Issue 5": unchanged}, {}, workers=1, force={"Issue 5"}
+    )
+
+    assert plain[2][0] == "skipped" and forced[2][0] == "updated"
+    assert len(rest_client.updates) == 1
+
+
+class ProjectSession:
+    """Answers the project and field lookups of saved_project_is_current()."""
+
+    def __init__(self, project):
+        self.project = project
+
+    def post(self, url, headers, json, timeout):
+        if self.project is None:
+            return response(body={"data": {"node": None}, "errors": [
+                {"type": "NOT_FOUND", "message": "Could not resolve to a node with the global id of 'PVT_1'"}
+            ]})
+        return response(body={"data": {"node": self.project}})
+
+
+SAVED_PROJECT = {
+    "id": "PVT_1",
+    "title": "Roadmap",
+    "field_ids": {"Phase": "F_phase", "Notion Reference": "F_notion"},
+    "option_ids": {"Phase": {"PHASE 0": "O_0"}},
+}
+
+
+def project(phase_options):
+    return {"title": "Roadmap", "fields": {"nodes": [
+        {"id": "F_phase", "name": "Phase", "dataType": "SINGLE_SELECT", "options": phase_options},
+        {"id": "F_notion", "name": "Notion Reference", "dataType": "TEXT"},
+    ]}}
+
+
+@pytest.mark.parametrize(
+    "node, current",
+    [
+        (project([{"id": "O_0", "name": "PHASE 0"}, {"id": "O_1", "name": "PHASE 1"}]), True),
+        (project([{"id": "O_new", "name": "PHASE 0"}]), False),
+        ({**project([{"id": "O_0", "name": "PHASE 0"}]), "title": "Renamed"}, False),
+        ({"title": "Roadmap", "fields": {"nodes": []}}, False),
+        (None, False),
+    ],
+)
+def test_saved_project_ids_are_checked_against_github(node, current):
+    client = bootstrap.GitHubGraphQLClient("token", session=ProjectSession(node), limiter=limiter(FakeTime()))
+
+    assert bootstrap.saved_project_is_current(client, SAVED_PROJECT) is current
+
+
+def test_session_keeps_a_pool_of_compressed_keep_alive_connections():
+    session = bootstrap.create_session(pool_size=4)
+
+    adapter = session.get_adapter("https://api.github.com/graphql")
+    assert adapter._pool_connections == adapter._pool_maxsize == 4
+    assert session.get_adapter("http://localhost") is adapter
+    assert session.headers["Accept-Encoding"] == "gzip"
+
+
+class SlowRESTClient:
+    """Creates issues, finishing the earlier ones last; issue 'bad' fails."""
+
+    def create_issue(self, title, body, labels, milestone):
+        if title == "bad":
+            raise RuntimeError("boom")
+        time.sleep(0.01 * (5 - int(title)))
+        return {"number": int(title), "node_id": f"I_{title}"}
+
+
+def test_parallel_upserts_are_reported_in_definition_order():
+    issues = [{"title": title, "body": "", "labels": [], "milestone": "M1"} for title in ("1", "2", "bad", "4")]
+
+    results = list(bootstrap.upsert_issues(SlowRESTClient(), issues, {}, {}, workers=4))
+
+    assert [issue_def["title"] for issue_def, _, _, _ in results] == ["1", "2", "bad", "4"]
+    assert [result for _, _, result, _ in results] == [
+        ("created", 1, "I_1"), ("created", 2, "I_2"), None, ("created", 4, "I_4")
+    ]
+    assert isinstance(results[2][3], RuntimeError)
+    assert results[0][1] == "Milestone not found: M1 for issue '1'"
+
+
+@pytest.mark.parametrize("workers", ["0", "-2", "many"])
+def test_worker_count_below_one_is_rejected_by_the_parser(workers, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        bootstrap.main(["--workers", workers])
+
+    assert exit_info.value.code == 2
+    assert "--workers" in capsys.readouterr().err
+
+
+def test_session_pool_is_sized_for_the_workers(monkeypatch):
+    sizes = []
+
+    class Stop(Exception):
+        pass
+
+    def create_session(pool_size):
+        sizes.append(pool_size)
+        raise Stop
+
+    monkeypatch.setattr(bootstrap, "check_dependencies", lambda: None)
+    monkeypatch.setattr(bootstrap, "get_github_token", lambda: "token")
+    monkeypatch.setattr(bootstrap, "create_session", create_session)
+    for workers in ("4", "16"):
+        with pytest.raises(Stop):
+            bootstrap.main(["--workers", workers])
+
+    assert sizes == [bootstrap.DEFAULT_POOL_SIZE, 16]